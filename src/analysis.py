@@ -0,0 +1,713 @@
+"""Word frequency analysis and adjustment of paper corpora.
+
+These functions are the importable core of `analyze_word_frequency.py` and
+`adjust_frequency_analysis_result.py`, so that batch drivers can run many
+files in one process without paying the interpreter and import cost for
+each of them.
+
+"""
+
+import csv
+import itertools
+import math
+import pathlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Final, Iterable, Sequence
+
+import nltk
+
+from src.corpus_store import CorpusStore
+from src.frequencies import (
+    NgramFilter,
+    Normalizer,
+    count_ngrams,
+    count_ngrams_packed,
+    get_default_normalizer,
+    iter_ngrams,
+    sort_frequency_dict,
+    top_k_frequency_dict,
+)
+from src.heavy_hitters import HeavyHitterCounter
+from src.lemmatization import CachedLemmatizer
+from src.paper_io import get_paper_format, get_stem, load_papers
+from src.utils import PartialPaper
+
+RAW_FREQUENCY_DIR: Final = pathlib.Path("./outputs/raw_frequency/")
+ADJUSTED_FREQUENCY_DIR: Final = pathlib.Path("./outputs/adjusted_frequency/")
+EXACT_MATCH_STOPWORDS_PATH: Final = pathlib.Path("./data/exact_match_stopwords.txt")
+PARTIAL_MATCH_STOPWORDS_PATH: Final = pathlib.Path("./data/partial_match_stopwords.txt")
+
+
+def download_nltk_data() -> None:
+    """Download the NLTK data used by the analysis if not downloaded yet."""
+    nltk.download("wordnet")
+    nltk.download("punkt")
+
+
+def get_raw_frequency_path(
+    input_path: pathlib.Path,
+    use_abstract: bool = False,
+    until_ngram: int = 3,
+    output_root_dir: pathlib.Path = RAW_FREQUENCY_DIR,
+) -> pathlib.Path:
+    """Return the path of the raw frequency CSV of a paper file.
+
+    Args:
+        input_path (pathlib.Path): Path to a paper file.
+        use_abstract (bool): Whether abstracts are used in addition to titles.
+        until_ngram (int): The maximum n of the n-grams.
+        output_root_dir (pathlib.Path): Root directory of the raw frequencies.
+
+    Returns:
+        pathlib.Path: The path like
+            `<output_root_dir>/title_only/cvpr2023_papers_title_only_3gram.csv`.
+
+    """
+    input_stem: Final = get_stem(input_path)
+    source: Final = "title_and_abstract" if use_abstract else "title_only"
+    return output_root_dir / source / f"{input_stem}_{source}_{until_ngram}gram.csv"
+
+
+def get_analysis_output_path(
+    input_path: pathlib.Path,
+    use_abstract: bool = False,
+    until_ngram: int = 3,
+    output_root_dir: pathlib.Path = RAW_FREQUENCY_DIR,
+    adjusted_output_dir: pathlib.Path | None = None,
+) -> pathlib.Path:
+    """Return the path of the raw or directly adjusted CSV of a paper file.
+
+    Args:
+        input_path (pathlib.Path): Path to a paper file.
+        use_abstract (bool): Whether abstracts are used in addition to titles.
+        until_ngram (int): The maximum n of the n-grams.
+        output_root_dir (pathlib.Path): Root directory of the raw frequencies.
+        adjusted_output_dir (pathlib.Path | None): Root directory of the
+            adjusted frequencies if the frequency is adjusted while counting.
+
+    Returns:
+        pathlib.Path: The path of `get_raw_frequency_path`, or the one of
+            `get_adjusted_frequency_path` for it if `adjusted_output_dir` is
+            given.
+
+    """
+    raw_path: Final = get_raw_frequency_path(
+        input_path, use_abstract, until_ngram, output_root_dir
+    )
+    if adjusted_output_dir is None:
+        return raw_path
+    return get_adjusted_frequency_path(raw_path, adjusted_output_dir)
+
+
+def get_documents(papers: list[PartialPaper], use_abstract: bool = False) -> list[str]:
+    """Return the titles and optionally the abstracts as separate documents.
+
+    Args:
+        papers (list[PartialPaper]): Papers to analyze.
+        use_abstract (bool): Whether to use abstracts in addition to titles.
+
+    Returns:
+        list[str]: The titles followed by the abstracts.
+
+    """
+    documents: Final = [paper.title for paper in papers]
+    if use_abstract:
+        documents.extend(paper.abstract for paper in papers if paper.abstract)
+    return documents
+
+
+def load_documents(input_path: pathlib.Path, use_abstract: bool = False) -> list[str]:
+    """Load the titles and optionally the abstracts of a paper file.
+
+    Corpus stores are read column by column without building paper models.
+
+    Args:
+        input_path (pathlib.Path): Path to a paper file in any supported format.
+        use_abstract (bool): Whether to use abstracts in addition to titles.
+
+    Returns:
+        list[str]: The titles followed by the abstracts.
+
+    """
+    if get_paper_format(input_path) != "corpus":
+        papers: Final = [
+            PartialPaper.model_validate(p) for p in load_papers(input_path)
+        ]
+        return get_documents(papers, use_abstract)
+
+    with CorpusStore(input_path) as store:
+        documents: Final = [title or "" for title in store.column("title")]
+        if use_abstract:
+            documents.extend(
+                abstract for abstract in store.column("abstract") if abstract
+            )
+    return documents
+
+
+def load_paper_documents(
+    input_path: pathlib.Path, use_abstract: bool = False
+) -> list[list[str]]:
+    """Load the documents of each paper of a paper file.
+
+    Args:
+        input_path (pathlib.Path): Path to a paper file in any supported format.
+        use_abstract (bool): Whether to use abstracts in addition to titles.
+
+    Returns:
+        list[list[str]]: The title and optionally the abstract of each paper.
+
+    """
+    if get_paper_format(input_path) != "corpus":
+        papers: Final = [
+            PartialPaper.model_validate(p) for p in load_papers(input_path)
+        ]
+        return [
+            [paper.title, paper.abstract]
+            if use_abstract and paper.abstract
+            else [paper.title]
+            for paper in papers
+        ]
+
+    with CorpusStore(input_path) as store:
+        titles: Final = [title or "" for title in store.column("title")]
+        if not use_abstract:
+            return [[title] for title in titles]
+        return [
+            [title, abstract] if abstract else [title]
+            for title, abstract in zip(titles, store.column("abstract"), strict=True)
+        ]
+
+
+def tokenize_document(
+    document: str, normalizer: Normalizer, lemmatizer: CachedLemmatizer
+) -> list[str]:
+    """Tokenize, lemmatize and normalize a document.
+
+    Args:
+        document (str): A title or an abstract.
+        normalizer (Normalizer): The normalizer to remove stopwords.
+        lemmatizer (CachedLemmatizer): The lemmatizer of nouns.
+
+    Returns:
+        list[str]: The normalized tokens.
+
+    """
+    # Tokenize the document. Lowercase all tokens for lemmatization.
+    tokens: Final = [token.lower() for token in nltk.word_tokenize(document)]
+
+    # Lemmatize tokens. Only nouns are considered.
+    lemmatized_tokens: Final = lemmatizer(tokens)
+
+    # Remove stopwords.
+    return normalizer(lemmatized_tokens)
+
+
+def count_documents(
+    documents: list[str],
+    until_ngram: int,
+    normalizer: Normalizer,
+    lemmatizer: CachedLemmatizer,
+    ngram_filter: NgramFilter | None = None,
+    packed: bool = False,
+    minimum_count: int = 1,
+) -> dict[str, int]:
+    """Tokenize, lemmatize and normalize the documents and count their n-grams.
+
+    Args:
+        documents (list[str]): Documents such as titles and abstracts. N-grams
+            do not span two of them.
+        until_ngram (int): The maximum n of the n-grams.
+        normalizer (Normalizer): The normalizer to remove stopwords.
+        lemmatizer (CachedLemmatizer): The lemmatizer of nouns.
+        ngram_filter (NgramFilter | None): If given, n-grams with a partial
+            match stopword are not counted.
+        packed (bool): Whether to count with integer keys by
+            `count_ngrams_packed`, which is faster for many documents.
+            Defaults to False.
+        minimum_count (int): N-grams counted fewer times are dropped. Only
+            used with `packed`. Defaults to 1.
+
+    Returns:
+        dict[str, int]: N-grams of 1 to `until_ngram` words and their counts.
+
+    """
+    token_documents: list[Sequence[str]] = [
+        tokenize_document(document, normalizer, lemmatizer) for document in documents
+    ]
+    if ngram_filter is not None:
+        token_documents = [
+            part
+            for tokens in token_documents
+            for part in ngram_filter.split_tokens(tokens)
+        ]
+    if packed:
+        return count_ngrams_packed(token_documents, until_ngram, minimum_count)
+    return count_ngrams(token_documents, until_ngram)
+
+
+def count_document_frequency(
+    documents: list[str],
+    until_ngram: int = 3,
+    normalizer: Normalizer | None = None,
+    lemmatizer: CachedLemmatizer | None = None,
+    workers: int = 1,
+    ngram_filter: NgramFilter | None = None,
+    top_k: int | None = None,
+) -> dict[str, int]:
+    """Count the n-grams of the documents.
+
+    With more than one worker, the documents are split into shards which are
+    counted in worker processes (map) and the partial counts are summed
+    (reduce). The result is the same as the sequential one.
+
+    With an n-gram filter, the result is the same as adjusting the raw
+    frequency dict with `adjust_frequency_dict`, but n-grams with a partial
+    match stopword are never counted and the other stopwords and the minimum
+    count are checked once per distinct n-gram.
+
+    Args:
+        documents (list[str]): Documents such as titles and abstracts. N-grams
+            do not span two of them.
+        until_ngram (int): The maximum n of the n-grams.
+        normalizer (Normalizer | None): The normalizer to remove stopwords.
+            Defaults to `get_default_normalizer()`.
+        lemmatizer (CachedLemmatizer | None): The lemmatizer of nouns. Hits
+            and misses of the workers are added to it. Defaults to a new one
+            without an on-disk cache.
+        workers (int): The number of worker processes. Defaults to 1.
+        ngram_filter (NgramFilter | None): The filter to adjust the result
+            while counting. Defaults to None, which keeps all n-grams.
+        top_k (int | None): If given, only the `top_k` most frequent n-grams
+            are selected with a heap instead of sorting all of them.
+
+    Returns:
+        dict[str, int]: A sorted frequency dict of 1 to `until_ngram`-grams.
+
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}.")
+
+    normalizer = normalizer or get_default_normalizer()
+    lemmatizer = lemmatizer or CachedLemmatizer()
+    if workers == 1:
+        # Rare n-grams are dropped before they are decoded into strings.
+        frequency_dict = count_documents(
+            documents,
+            until_ngram,
+            normalizer,
+            lemmatizer,
+            ngram_filter,
+            packed=True,
+            minimum_count=ngram_filter.minimum_count if ngram_filter else 1,
+        )
+        return _sort_and_filter(frequency_dict, ngram_filter, top_k)
+
+    # Several shards per worker to balance titles and long abstracts.
+    shard_size: Final = max(1, math.ceil(len(documents) / (workers * 4)))
+    shards: Final = [
+        documents[i : i + shard_size] for i in range(0, len(documents), shard_size)
+    ]
+    frequency_dict = Counter()
+    # Each worker loads the lemma cache once. The lemmas new to the workers
+    # are merged here and saved once by the caller, since concurrent saves of
+    # the same file could drop each other's lemmas.
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(lemmatizer,)
+    ) as pool:
+        for shard_frequency_dict, hits, misses, new_lemmas in pool.map(
+            _count_shard,
+            shards,
+            itertools.repeat(until_ngram),
+            itertools.repeat(normalizer),
+            itertools.repeat(ngram_filter),
+        ):
+            frequency_dict.update(shard_frequency_dict)
+            lemmatizer.hits += hits
+            lemmatizer.misses += misses
+            lemmatizer.update(new_lemmas)
+
+    return _sort_and_filter(frequency_dict, ngram_filter, top_k)
+
+
+def _sort_and_filter(
+    frequency_dict: dict[str, int],
+    ngram_filter: NgramFilter | None,
+    top_k: int | None,
+) -> dict[str, int]:
+    # The minimum count is checked only after the shards are summed.
+    if ngram_filter is not None:
+        frequency_dict = ngram_filter(frequency_dict)
+    if top_k is not None:
+        return top_k_frequency_dict(frequency_dict, top_k)
+    return sort_frequency_dict(dict(frequency_dict))
+
+
+def count_document_heavy_hitters(
+    documents: Iterable[str],
+    heavy_hitter_counter: HeavyHitterCounter,
+    until_ngram: int = 3,
+    normalizer: Normalizer | None = None,
+    lemmatizer: CachedLemmatizer | None = None,
+    ngram_filter: NgramFilter | None = None,
+    top_k: int | None = None,
+) -> dict[str, int]:
+    """Count the most frequent n-grams of the documents approximately.
+
+    The documents are streamed into a counter of fixed memory, so the memory
+    does not grow with the number of distinct n-grams. The counts are upper
+    bounds of the true counts, see `src.heavy_hitters` for their errors.
+
+    Args:
+        documents (Iterable[str]): Documents such as titles and abstracts.
+        heavy_hitter_counter (HeavyHitterCounter): An empty counter like
+            `SpaceSaving.from_memory_budget(64 * 2**20)`. Its statistics can
+            be reported after counting.
+        until_ngram (int): The maximum n of the n-grams.
+        normalizer (Normalizer | None): The normalizer to remove stopwords.
+            Defaults to `get_default_normalizer()`.
+        lemmatizer (CachedLemmatizer | None): The lemmatizer of nouns.
+            Defaults to a new one without an on-disk cache.
+        ngram_filter (NgramFilter | None): If given, n-grams with a stopword
+            are never counted and the minimum count is applied to the
+            estimated counts.
+        top_k (int | None): The number of n-grams to return. Defaults to all
+            the n-grams kept by the counter.
+
+    Returns:
+        dict[str, int]: A sorted frequency dict of the estimated counts.
+
+    """
+    normalizer = normalizer or get_default_normalizer()
+    lemmatizer = lemmatizer or CachedLemmatizer()
+    for document in documents:
+        tokens = tokenize_document(document, normalizer, lemmatizer)
+        if ngram_filter is None:
+            heavy_hitter_counter.update(iter_ngrams(tokens, until_ngram))
+            continue
+
+        exact_match_stopwords = ngram_filter.exact_match_stopwords
+        for part in ngram_filter.split_tokens(tokens):
+            heavy_hitter_counter.update(
+                ngram
+                for ngram in iter_ngrams(part, until_ngram)
+                if ngram not in exact_match_stopwords
+            )
+
+    frequency_dict: Final = {
+        key: count for key, count, _ in heavy_hitter_counter.get_items()
+    }
+    return _sort_and_filter(frequency_dict, ngram_filter, top_k)
+
+
+def count_word_frequency(
+    papers: list[PartialPaper],
+    use_abstract: bool = False,
+    until_ngram: int = 3,
+    normalizer: Normalizer | None = None,
+    lemmatizer: CachedLemmatizer | None = None,
+    workers: int = 1,
+) -> dict[str, int]:
+    """Count the n-grams of the titles and optionally the abstracts.
+
+    Args:
+        papers (list[PartialPaper]): Papers to analyze.
+        use_abstract (bool): Whether to use abstracts in addition to titles.
+        until_ngram (int): The maximum n of the n-grams.
+        normalizer (Normalizer | None): The normalizer to remove stopwords.
+        lemmatizer (CachedLemmatizer | None): The lemmatizer of nouns.
+        workers (int): The number of worker processes. Defaults to 1.
+
+    Returns:
+        dict[str, int]: A sorted frequency dict of 1 to `until_ngram`-grams.
+
+    """
+    return count_document_frequency(
+        get_documents(papers, use_abstract),
+        until_ngram,
+        normalizer,
+        lemmatizer,
+        workers,
+    )
+
+
+# The lemmatizer of a worker process of `count_document_frequency`, which is
+# replaced by the one of the parent when the worker starts.
+_worker_lemmatizer: CachedLemmatizer = CachedLemmatizer()
+
+
+def _init_worker(lemmatizer: CachedLemmatizer) -> None:
+    global _worker_lemmatizer
+
+    _worker_lemmatizer = lemmatizer
+
+
+def _count_shard(
+    documents: list[str],
+    until_ngram: int,
+    normalizer: Normalizer,
+    ngram_filter: NgramFilter | None,
+) -> tuple[dict[str, int], int, int, dict[str, str]]:
+    lemmatizer: Final = _worker_lemmatizer
+    hits: Final = lemmatizer.hits
+    misses: Final = lemmatizer.misses
+    frequency_dict: Final = count_documents(
+        documents, until_ngram, normalizer, lemmatizer, ngram_filter, packed=True
+    )
+    return (
+        frequency_dict,
+        lemmatizer.hits - hits,
+        lemmatizer.misses - misses,
+        lemmatizer.pop_new_lemmas(),
+    )
+
+
+def read_frequency_csv(csv_path: pathlib.Path) -> dict[str, int]:
+    """Read a frequency CSV with `word` and `count` columns.
+
+    Args:
+        csv_path (pathlib.Path): Path to the CSV file.
+
+    Returns:
+        dict[str, int]: A frequency dict in the order of the rows.
+
+    """
+    with csv_path.open("r") as f:
+        reader = csv.reader(f)
+        _ = next(reader)  # Skip header.
+        return {row[0]: int(row[1]) for row in reader}
+
+
+def write_frequency_csv(csv_path: pathlib.Path, frequency_dict: dict[str, int]) -> None:
+    """Write a frequency dict as CSV with `word` and `count` columns.
+
+    Args:
+        csv_path (pathlib.Path): Path to the CSV file. Its parent directory is
+            created if not exists.
+        frequency_dict (dict[str, int]): A frequency dict.
+
+    """
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    with csv_path.open("w", newline="") as f:
+        writer: Final = csv.writer(f)
+        writer.writerow(["word", "count"])
+        for key, value in frequency_dict.items():
+            writer.writerow([key, value])
+
+
+def analyze_word_frequency(
+    input_path: pathlib.Path,
+    use_abstract: bool = False,
+    until_ngram: int = 3,
+    output_root_dir: pathlib.Path = RAW_FREQUENCY_DIR,
+    normalizer: Normalizer | None = None,
+    lemmatizer: CachedLemmatizer | None = None,
+    workers: int = 1,
+    ngram_filter: NgramFilter | None = None,
+    adjusted_output_dir: pathlib.Path = ADJUSTED_FREQUENCY_DIR,
+    top_k: int | None = None,
+    heavy_hitter_counter: HeavyHitterCounter | None = None,
+    save_lemmas: bool = True,
+) -> pathlib.Path:
+    """Calculate word frequency of a paper file and save it as CSV file.
+
+    With an n-gram filter, the adjusted frequency CSV is saved directly
+    instead of the raw one, as if `adjust_frequency_analysis_result` were run
+    on the raw one.
+
+    With a heavy hitter counter, the most frequent n-grams are counted
+    approximately in the fixed memory of the counter, and the error bounds
+    are printed.
+
+    Args:
+        input_path (pathlib.Path): Path to a paper file in any supported format.
+        use_abstract (bool): Whether to use abstracts in addition to titles.
+        until_ngram (int): The maximum n of the n-grams.
+        output_root_dir (pathlib.Path): Root directory of the raw frequencies.
+        normalizer (Normalizer | None): The normalizer to remove stopwords.
+            Defaults to `get_default_normalizer()`.
+        lemmatizer (CachedLemmatizer | None): The lemmatizer of nouns.
+            Defaults to a new one without an on-disk cache.
+        workers (int): The number of worker processes. Defaults to 1.
+        ngram_filter (NgramFilter | None): The filter to adjust the frequency
+            while counting. Defaults to None, which saves the raw frequency.
+        adjusted_output_dir (pathlib.Path): Root directory of the adjusted
+            frequencies, used with `ngram_filter`.
+        top_k (int | None): If given, only the `top_k` most frequent n-grams
+            are saved.
+        heavy_hitter_counter (HeavyHitterCounter | None): An empty counter to
+            count approximately. Only a single worker is supported. Defaults
+            to None, which counts exactly.
+        save_lemmas (bool): Whether to save the new lemmas of the lemmatizer
+            to its cache after the analysis. The caller saves them otherwise.
+            Defaults to True.
+
+    Returns:
+        pathlib.Path: Path to the saved CSV file.
+
+    """
+    # Check if input file exists.
+    if not input_path.exists():
+        raise FileNotFoundError(f"{input_path} does not exist.")
+    if heavy_hitter_counter is not None and workers != 1:
+        raise ValueError("Approximate counting supports only a single worker.")
+
+    output_path: Final = get_analysis_output_path(
+        input_path,
+        use_abstract,
+        until_ngram,
+        output_root_dir,
+        adjusted_output_dir if ngram_filter else None,
+    )
+
+    # Load titles and abstracts from the paper file.
+    documents: Final = load_documents(input_path, use_abstract)
+    lemmatizer = lemmatizer or CachedLemmatizer()
+    if heavy_hitter_counter is None:
+        frequency_dict = count_document_frequency(
+            documents, until_ngram, normalizer, lemmatizer, workers, ngram_filter, top_k
+        )
+    else:
+        frequency_dict = count_document_heavy_hitters(
+            documents,
+            heavy_hitter_counter,
+            until_ngram,
+            normalizer,
+            lemmatizer,
+            ngram_filter,
+            top_k,
+        )
+        print(heavy_hitter_counter.format_stats())
+    if save_lemmas:
+        lemmatizer.save()
+    print(lemmatizer.format_stats())
+
+    # Save word frequency as CSV file.
+    write_frequency_csv(output_path, frequency_dict)
+    print(f"Word frequency is saved as {output_path}.")
+    return output_path
+
+
+def load_stopwords(stopwords_path: pathlib.Path) -> set[str]:
+    """Load stopwords from a txt file with one stopword per line.
+
+    Args:
+        stopwords_path (pathlib.Path): Path to the txt file.
+
+    Returns:
+        set[str]: A set of stopwords.
+
+    """
+    stopwords: Final = set()
+    with stopwords_path.open("r") as f:
+        for line in f:
+            stopwords.add(line.strip())
+    return stopwords
+
+
+def load_ngram_filter(
+    exact_match_stopwords_path: pathlib.Path = EXACT_MATCH_STOPWORDS_PATH,
+    partial_match_stopwords_path: pathlib.Path = PARTIAL_MATCH_STOPWORDS_PATH,
+    minimum_count: int = 6,
+) -> NgramFilter:
+    """Load the n-gram filter of the adjustment from stopwords files.
+
+    Args:
+        exact_match_stopwords_path (pathlib.Path): A txt file which includes
+            exact match stopwords.
+        partial_match_stopwords_path (pathlib.Path): A txt file which includes
+            partial match stopwords.
+        minimum_count (int): Minimum count of n-gram to be included in the
+            result.
+
+    Returns:
+        NgramFilter: The filter.
+
+    """
+    return NgramFilter(
+        load_stopwords(exact_match_stopwords_path),
+        load_stopwords(partial_match_stopwords_path),
+        minimum_count,
+    )
+
+
+def adjust_frequency_dict(
+    frequency_dict: dict[str, int],
+    exact_match_stopwords: set[str],
+    partial_match_stopwords: set[str],
+    minimum_count: int = 6,
+) -> dict[str, int]:
+    """Remove rare n-grams and n-grams which match stopwords.
+
+    Args:
+        frequency_dict (dict[str, int]): A raw frequency dict.
+        exact_match_stopwords (set[str]): N-grams to remove as a whole.
+        partial_match_stopwords (set[str]): Words which remove every n-gram
+            that includes one of them.
+        minimum_count (int): Minimum count of n-gram to be included in the
+            result.
+
+    Returns:
+        dict[str, int]: The adjusted frequency dict in the original order.
+
+    """
+    return NgramFilter(exact_match_stopwords, partial_match_stopwords, minimum_count)(
+        frequency_dict
+    )
+
+
+def get_adjusted_frequency_path(
+    input_path: pathlib.Path, output_dir: pathlib.Path = ADJUSTED_FREQUENCY_DIR
+) -> pathlib.Path:
+    """Return the path of the adjusted frequency CSV of a raw frequency CSV.
+
+    Args:
+        input_path (pathlib.Path): Path to a raw frequency CSV file.
+        output_dir (pathlib.Path): Root directory of the adjusted frequencies.
+
+    Returns:
+        pathlib.Path: The path like
+            `<output_dir>/title_only/cvpr2023_papers_title_only_3gram_adjusted.csv`.
+
+    """
+    return output_dir / input_path.parent.stem / f"{input_path.stem}_adjusted.csv"
+
+
+def adjust_frequency_analysis_result(
+    input_path: pathlib.Path,
+    output_dir: pathlib.Path = ADJUSTED_FREQUENCY_DIR,
+    exact_match_stopwords_path: pathlib.Path = EXACT_MATCH_STOPWORDS_PATH,
+    partial_match_stopwords_path: pathlib.Path = PARTIAL_MATCH_STOPWORDS_PATH,
+    minimum_count: int = 6,
+) -> pathlib.Path:
+    """Adjust a raw frequency CSV and save it as CSV file.
+
+    Args:
+        input_path (pathlib.Path): Path to a raw frequency CSV file.
+        output_dir (pathlib.Path): Root directory of the adjusted frequencies.
+        exact_match_stopwords_path (pathlib.Path): A txt file which includes
+            exact match stopwords.
+        partial_match_stopwords_path (pathlib.Path): A txt file which includes
+            partial match stopwords.
+        minimum_count (int): Minimum count of n-gram to be included in the
+            result.
+
+    Returns:
+        pathlib.Path: Path to the saved CSV file.
+
+    """
+    ngram_filter: Final = load_ngram_filter(
+        exact_match_stopwords_path, partial_match_stopwords_path, minimum_count
+    )
+
+    # Check if input file exists.
+    if not input_path.exists():
+        raise FileNotFoundError(f"{input_path} does not exist.")
+
+    output_path: Final = get_adjusted_frequency_path(input_path, output_dir)
+    adjusted_frequency_dict: Final = ngram_filter(read_frequency_csv(input_path))
+
+    # Save word frequency as CSV file.
+    write_frequency_csv(output_path, adjusted_frequency_dict)
+    print(f"Adjusted word frequency is saved as {output_path}.")
+    return output_path
@@ -1,18 +1,21 @@
 import re
 from typing import Final
+from urllib.parse import urlencode
 from xml.etree import ElementTree
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
-from src.utils import Paper
+from src import http_client
+from src.utils import Paper, normalize_title
+
+ARXIV_API_URL: Final = "http://export.arxiv.org/api/query"
 
 
 def get_arxiv_papers(
     query: str,
     max_results: int = 2,
     timeout: int = 10,
+    base_url: str = ARXIV_API_URL,
 ) -> list[Paper]:
     """Get papers from arXiv API.
 
@@ -20,20 +23,20 @@ def get_arxiv_papers(
         query (str): The query to search papers.
         max_results (int): The maximum number of papers to get. Defaults to 1.
         timeout (int): The timeout for the request. Defaults to 10.
+        base_url (str): The URL of the arXiv API. Defaults to the public one.
 
     Returns:
         list[Paper]: A list of Paper objects.
 
     """
     # Define the URL.
-    base_url: Final = "http://export.arxiv.org/api/query"
-    search_query: Final = f"search_query={query}&start=0&max_results={max_results}"
+    search_query: Final = urlencode(
+        {"search_query": query, "start": 0, "max_results": max_results}
+    )
     url: Final = f"{base_url}?{search_query}"
 
-    session: Final = create_session_with_retries()
     try:
-        response = session.get(url, timeout=timeout)
-        response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes.
+        response = http_client.get(url, timeout=timeout)
     except requests.exceptions.RequestException as e:
         raise ValueError(f"Failed to get the response from {url}. {e}") from e
 
@@ -81,19 +84,50 @@ def get_arxiv_papers(
     return papers
 
 
-def create_session_with_retries() -> requests.Session:
-    """Create a session with retries."""
-    retry_strategy = Retry(
-        total=5,  # How many times to retry.
-        status_forcelist=[429, 500, 502, 503, 504],  # HTTP status codes to retry.
-        # method_whitelist=["HEAD", "GET", "OPTIONS"],  # HTTP methods to retry.
-        backoff_factor=1,  # A backoff factor to apply between attempts after the second try.
+def get_arxiv_papers_by_titles(
+    titles: list[str],
+    max_results_per_title: int = 2,
+    timeout: int = 30,
+    base_url: str = ARXIV_API_URL,
+) -> list[Paper]:
+    """Get candidate papers for many titles with a single arXiv API request.
+
+    The titles are normalized and OR'd as `ti:"..."` phrase clauses. The
+    returned papers are not matched to the titles, so the caller has to
+    match them locally.
+
+    Args:
+        titles (list[str]): The titles to search.
+        max_results_per_title (int): The maximum number of papers to get for
+            each title. Defaults to 2.
+        timeout (int): The timeout for the request. Defaults to 30.
+        base_url (str): The URL of the arXiv API. Defaults to the public one.
+
+    Returns:
+        list[Paper]: A list of candidate Paper objects.
+
+    """
+    return get_arxiv_papers(
+        build_title_query(titles),
+        max_results=max_results_per_title * len(titles),
+        timeout=timeout,
+        base_url=base_url,
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session = requests.Session()
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-    return session
+
+
+def build_title_query(titles: list[str]) -> str:
+    """Build an arXiv search query which matches any of the titles.
+
+    Args:
+        titles (list[str]): The titles to search.
+
+    Returns:
+        str: The query like `ti:"first title" OR ti:"second title"`.
+
+    """
+    # Normalization drops quotes and operators which would break the query.
+    phrases: Final = {normalize_title(title) for title in titles}
+    return " OR ".join(f'ti:"{phrase}"' for phrase in sorted(phrases) if phrase)
 
 
 def clean_text(text: str) -> str:
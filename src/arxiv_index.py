@@ -0,0 +1,255 @@
+"""Offline index of arXiv metadata for abstract enrichment without the API.
+
+The index is built from a bulk arXiv metadata snapshot in JSON Lines format,
+such as the `arxiv-metadata-oai-snapshot.json` distributed on Kaggle. Each
+line must have `id`, `title`, `authors` and `abstract`.
+
+File layout (little-endian):
+
+    - Header: magic (8 bytes), version (uint64), number of entries (uint64).
+    - Table: one (title hash, first author hash, record offset) uint64 triple
+      per paper, sorted by title hash.
+    - Records: one compact JSON record per paper, prefixed with its length as
+      uint32. Offsets in the table are relative to the start of this section.
+
+The file is memory-mapped, so opening it is instant and a lookup is a binary
+search over the table followed by decoding a single record.
+
+"""
+
+import json
+import mmap
+import pathlib
+import re
+import struct
+import tempfile
+from array import array
+from types import TracebackType
+from typing import Final, Iterator
+
+from src.arxiv import clean_text
+from src.utils import Paper, hash_key, normalize_title
+
+DEFAULT_INDEX_PATH: Final = pathlib.Path("./data/arxiv_index.bin")
+
+_MAGIC: Final = b"BABELAXI"
+_VERSION: Final = 1
+_HEADER: Final = struct.Struct("<8sQQ")
+_ENTRY: Final = struct.Struct("<QQQ")
+_RECORD_LENGTH: Final = struct.Struct("<I")
+_AUTHOR_SEPARATOR_PATTERN: Final = re.compile(r",|\band\b")
+
+
+def get_first_author_key(authors: str) -> str:
+    """Return the normalized family name of the first author.
+
+    Args:
+        authors (str): Authors like "Kaiming He, Xiangyu Zhang" or
+            "K. He and X. Zhang".
+
+    Returns:
+        str: The key like "he".
+
+    """
+    first_author: Final = _AUTHOR_SEPARATOR_PATTERN.split(authors, maxsplit=1)[0]
+    names: Final = normalize_title(first_author).split()
+    return names[-1] if names else ""
+
+
+def build_index(snapshot_path: pathlib.Path, index_path: pathlib.Path) -> int:
+    """Build the index from a JSON Lines arXiv metadata snapshot.
+
+    Args:
+        snapshot_path (pathlib.Path): Path to the snapshot.
+        index_path (pathlib.Path): Path to write the index.
+
+    Returns:
+        int: The number of indexed papers.
+
+    """
+    title_hashes: Final = array("Q")
+    author_hashes: Final = array("Q")
+    offsets: Final = array("Q")
+
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryFile(dir=index_path.parent) as records:
+        # Write records in the snapshot order and keep their table entries.
+        offset = 0
+        with snapshot_path.open("r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                metadata = json.loads(line)
+                record = json.dumps(
+                    {
+                        "id": metadata["id"],
+                        "title": clean_text(metadata["title"]),
+                        "authors": clean_text(metadata["authors"]),
+                        "abstract": clean_text(metadata["abstract"]),
+                    },
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                ).encode()
+
+                title_hashes.append(hash_key(normalize_title(metadata["title"])))
+                author_hashes.append(
+                    hash_key(get_first_author_key(metadata["authors"]))
+                )
+                offsets.append(offset)
+                records.write(_RECORD_LENGTH.pack(len(record)) + record)
+                offset += _RECORD_LENGTH.size + len(record)
+
+        # Write the header and the table sorted by title hash, then the records.
+        order: Final = sorted(range(len(offsets)), key=title_hashes.__getitem__)
+        with index_path.open("wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, len(order)))
+            for i in order:
+                f.write(_ENTRY.pack(title_hashes[i], author_hashes[i], offsets[i]))
+            records.seek(0)
+            while chunk := records.read(1024 * 1024):
+                f.write(chunk)
+
+    return len(order)
+
+
+class ArxivIndex:
+    """Memory-mapped index of arXiv papers keyed by normalized title."""
+
+    def __init__(self, index_path: pathlib.Path = DEFAULT_INDEX_PATH) -> None:
+        """Open the index.
+
+        Args:
+            index_path (pathlib.Path): Path to the index built by `build_index`.
+
+        """
+        self.index_path: Final = index_path
+        with index_path.open("rb") as f:
+            self._mmap: Final = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(
+                f"{index_path} is not an arXiv index of version {_VERSION}."
+            )
+
+        table_end: Final = _HEADER.size + self.count * _ENTRY.size
+        # The table is read in place as a flat array of uint64.
+        self._table: Final = memoryview(self._mmap)[_HEADER.size : table_end].cast("Q")
+        self._records_offset: Final = table_end
+
+    def __enter__(self) -> "ArxivIndex":
+        """Return the index itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the index."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of indexed papers."""
+        return int(self.count)
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._table.release()
+        self._mmap.close()
+
+    def lookup(self, title: str, author: str) -> Paper | None:
+        """Return the paper with the same normalized title and first author.
+
+        Args:
+            title (str): The title of the paper.
+            author (str): The authors of the paper, the first one is used.
+
+        Returns:
+            Paper | None: The paper, or None if not found.
+
+        """
+        normalized_title: Final = normalize_title(title)
+        author_hash: Final = hash_key(get_first_author_key(author))
+        for i in self._iter_entries(hash_key(normalized_title)):
+            if self._table[3 * i + 1] != author_hash:
+                continue
+            record = self._read_record(self._table[3 * i + 2])
+            # Guard against hash collisions.
+            if normalize_title(record["title"]) == normalized_title:
+                return Paper(
+                    title=record["title"],
+                    author=record["authors"],
+                    abstract=record["abstract"],
+                    page=f"http://arxiv.org/abs/{record['id']}",  # type: ignore
+                    pdf=f"http://arxiv.org/pdf/{record['id']}.pdf",  # type: ignore
+                )
+
+        return None
+
+    def _iter_entries(self, title_hash: int) -> Iterator[int]:
+        # Binary search for the first entry with the title hash.
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._table[3 * middle] < title_hash:
+                low = middle + 1
+            else:
+                high = middle
+
+        while low < len(self) and self._table[3 * low] == title_hash:
+            yield low
+            low += 1
+
+    def _read_record(self, offset: int) -> dict:
+        start: Final = self._records_offset + offset
+        (length,) = _RECORD_LENGTH.unpack_from(self._mmap, start)
+        record: Final[dict] = json.loads(
+            self._mmap[
+                start + _RECORD_LENGTH.size : start + _RECORD_LENGTH.size + length
+            ]
+        )
+        return record
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Build the index.")
+    build_parser.add_argument(
+        "--snapshot-path",
+        "-i",
+        type=pathlib.Path,
+        required=True,
+        help="A JSON Lines arXiv metadata snapshot.",
+    )
+    build_parser.add_argument(
+        "--index-path",
+        "-o",
+        type=pathlib.Path,
+        default=DEFAULT_INDEX_PATH,
+        help="Path to write the index.",
+    )
+
+    lookup_parser = subparsers.add_parser("lookup", help="Look up a paper.")
+    lookup_parser.add_argument("--title", "-t", type=str, required=True)
+    lookup_parser.add_argument("--author", "-a", type=str, required=True)
+    lookup_parser.add_argument(
+        "--index-path",
+        "-o",
+        type=pathlib.Path,
+        default=DEFAULT_INDEX_PATH,
+        help="Path to the index.",
+    )
+    args = parser.parse_args()
+
+    if args.command == "build":
+        count = build_index(args.snapshot_path, args.index_path)
+        print(f"{count} papers are indexed in {args.index_path}.")
+    else:
+        with ArxivIndex(args.index_path) as index:
+            print(index.lookup(args.title, args.author))
@@ -0,0 +1,185 @@
+"""Local stand-in of the arXiv API for offline development and tests.
+
+The server answers `/api/query?search_query=...` with an Atom feed built from
+the given papers. Queries made of `ti:"..."` clauses joined with `OR` match
+papers whose normalized title equals one of the phrases. Any other query is
+treated as a single title.
+
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Final
+from urllib.parse import parse_qs, urlparse
+from xml.etree import ElementTree
+
+from src.utils import Paper, normalize_title
+
+_ATOM_NAMESPACE: Final = "http://www.w3.org/2005/Atom"
+
+
+class ArxivStubServer:
+    """Serve Atom feeds of the given papers on a local port."""
+
+    def __init__(
+        self, papers: list[Paper], host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        """Initialize the server. It starts serving on `start`.
+
+        Args:
+            papers (list[Paper]): Papers served by the stand-in. Their `page`
+                must be an arXiv abstract URL like `http://arxiv.org/abs/<id>`.
+            host (str): The host to bind. Defaults to "127.0.0.1".
+            port (int): The port to bind. Defaults to 0, an unused port.
+
+        """
+        self.papers: Final = papers
+        self.request_count = 0
+        self._papers_by_title: Final[dict[str, list[Paper]]] = {}
+        for paper in papers:
+            self._papers_by_title.setdefault(normalize_title(paper.title), []).append(
+                paper
+            )
+
+        self._server: Final = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL to pass as `base_url` of the arXiv client."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/api/query"
+
+    def __enter__(self) -> "ArxivStubServer":
+        """Start serving in a background thread."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop serving."""
+        self.stop()
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def search(self, query: str, max_results: int) -> list[Paper]:
+        """Return the papers matching the query.
+
+        Args:
+            query (str): The `search_query` parameter.
+            max_results (int): The maximum number of papers to return.
+
+        Returns:
+            list[Paper]: The matched papers.
+
+        """
+        clauses: Final = [clause.strip() for clause in query.split(" OR ")]
+        papers: list[Paper] = []
+        for clause in clauses:
+            phrase = clause.removeprefix("ti:").strip('"')
+            papers.extend(self._papers_by_title.get(normalize_title(phrase), []))
+        return papers[:max_results]
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub: Final = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                stub.request_count += 1
+                params = parse_qs(urlparse(self.path).query)
+                papers = stub.search(
+                    params.get("search_query", [""])[0],
+                    int(params.get("max_results", ["10"])[0]),
+                )
+                body = build_atom_feed(papers)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/atom+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return _Handler
+
+
+def build_atom_feed(papers: list[Paper]) -> bytes:
+    """Build an arXiv-like Atom feed of the papers.
+
+    Args:
+        papers (list[Paper]): Papers to include as entries.
+
+    Returns:
+        bytes: The UTF-8 encoded Atom feed.
+
+    """
+    ElementTree.register_namespace("", _ATOM_NAMESPACE)
+    feed: Final = ElementTree.Element(f"{{{_ATOM_NAMESPACE}}}feed")
+    for paper in papers:
+        entry = ElementTree.SubElement(feed, f"{{{_ATOM_NAMESPACE}}}entry")
+        # arXiv returns versioned ids like http://arxiv.org/abs/2305.11288v2.
+        ElementTree.SubElement(
+            entry, f"{{{_ATOM_NAMESPACE}}}id"
+        ).text = f"{paper.page}v1"
+        ElementTree.SubElement(entry, f"{{{_ATOM_NAMESPACE}}}title").text = paper.title
+        ElementTree.SubElement(
+            entry, f"{{{_ATOM_NAMESPACE}}}summary"
+        ).text = paper.abstract
+        for name in paper.author.split(", "):
+            author = ElementTree.SubElement(entry, f"{{{_ATOM_NAMESPACE}}}author")
+            ElementTree.SubElement(author, f"{{{_ATOM_NAMESPACE}}}name").text = name
+
+    body: Final[bytes] = ElementTree.tostring(
+        feed, encoding="utf-8", xml_declaration=True
+    )
+    return body
+
+
+if __name__ == "__main__":
+    import argparse
+    import pathlib
+
+    from src.paper_io import load_papers
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--input-path",
+        "-i",
+        type=pathlib.Path,
+        required=True,
+        help="A JSON/JSONL file of papers with arXiv page URLs to serve.",
+    )
+    parser.add_argument(
+        "--port",
+        "-p",
+        type=int,
+        default=8080,
+        help="The port to serve on.",
+    )
+    args = parser.parse_args()
+
+    papers = [
+        Paper.model_validate(p)
+        for p in load_papers(args.input_path)
+        if p.get("abstract") and p.get("page") and p.get("pdf")
+    ]
+    server = ArxivStubServer(papers, port=args.port)
+    print(f"Serving {len(papers)} papers at {server.base_url}.")
+    with server:
+        threading.Event().wait()
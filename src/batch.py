@@ -0,0 +1,146 @@
+"""In-process batch driver which runs many jobs on a process pool.
+
+Each job is a call of an importable function. Jobs are isolated from each
+other: an exception is recorded in the result of its job and the rest of the
+batch keeps running.
+
+"""
+
+import dataclasses
+import logging
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Final
+
+logger: Final = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class BatchJob:
+    """A function call to run in the batch.
+
+    The function and its arguments must be picklable to run on a process
+    pool, so the function must be defined at the top level of a module.
+
+    """
+
+    name: str
+    func: Callable[..., Any]
+    kwargs: dict[str, Any] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass(frozen=True)
+class BatchResult:
+    """The outcome of a job."""
+
+    name: str
+    elapsed: float
+    output: Any = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the job finished without an exception."""
+        return self.error is None
+
+
+def run_job(job: BatchJob) -> BatchResult:
+    """Run a job and capture its exception.
+
+    Args:
+        job (BatchJob): The job to run.
+
+    Returns:
+        BatchResult: The result with the return value or the traceback.
+
+    """
+    start: Final = time.perf_counter()
+    try:
+        output = job.func(**job.kwargs)
+    except Exception:
+        return BatchResult(
+            name=job.name,
+            elapsed=time.perf_counter() - start,
+            error=traceback.format_exc(),
+        )
+    return BatchResult(
+        name=job.name, elapsed=time.perf_counter() - start, output=output
+    )
+
+
+def run_batch(
+    jobs: list[BatchJob],
+    num_jobs: int = 1,
+    initializer: Callable[[], None] | None = None,
+) -> list[BatchResult]:
+    """Run the jobs, in parallel when `num_jobs` is more than one.
+
+    Args:
+        jobs (list[BatchJob]): Jobs to run.
+        num_jobs (int): The number of worker processes. 1 runs the jobs one
+            after another in the current process. Defaults to 1.
+        initializer (Callable[[], None] | None): Function called once in each
+            worker process, or once before the jobs when `num_jobs` is 1.
+
+    Returns:
+        list[BatchResult]: The results in the order of the jobs.
+
+    """
+    if num_jobs < 1:
+        raise ValueError(f"num_jobs must be positive, got {num_jobs}.")
+
+    if num_jobs == 1:
+        if initializer is not None:
+            initializer()
+        results: list[BatchResult] = []
+        for i, job in enumerate(jobs):
+            results.append(run_job(job))
+            _log_result(results[-1], i + 1, len(jobs))
+        return results
+
+    results_by_index: Final[dict[int, BatchResult]] = {}
+    with ProcessPoolExecutor(max_workers=num_jobs, initializer=initializer) as pool:
+        futures: Final = {pool.submit(run_job, job): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except Exception:
+                # The worker died, e.g. killed by the OOM killer.
+                result = BatchResult(
+                    name=jobs[i].name, elapsed=0.0, error=traceback.format_exc()
+                )
+            results_by_index[i] = result
+            _log_result(result, len(results_by_index), len(jobs))
+
+    return [results_by_index[i] for i in range(len(jobs))]
+
+
+def format_summary(results: list[BatchResult], elapsed: float) -> str:
+    """Format the timing summary and the errors of a batch.
+
+    Args:
+        results (list[BatchResult]): Results returned by `run_batch`.
+        elapsed (float): Wall-clock time of the batch in seconds.
+
+    Returns:
+        str: A multi-line summary.
+
+    """
+    failed: Final = [result for result in results if not result.ok]
+    total: Final = sum(result.elapsed for result in results)
+    lines: Final = [
+        f"{len(results) - len(failed)} / {len(results)} jobs succeeded "
+        f"in {elapsed:.1f}s (sum of job times {total:.1f}s).",
+    ]
+    for result in sorted(results, key=lambda r: r.elapsed, reverse=True)[:5]:
+        lines.append(f"  {result.elapsed:8.2f}s  {result.name}")
+    for result in failed:
+        lines.append(f"Failed: {result.name}\n{result.error}")
+    return "\n".join(lines)
+
+
+def _log_result(result: BatchResult, done: int, total: int) -> None:
+    status: Final = "done" if result.ok else "failed"
+    logger.info(f"[{done}/{total}] {result.name} {status} in {result.elapsed:.2f}s")
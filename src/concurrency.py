@@ -0,0 +1,149 @@
+"""Helpers to fetch many pages concurrently while keeping the order of the
+results identical to the sequential path.
+
+"""
+
+import contextlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Final, Iterator, TypeVar
+from urllib.parse import urlparse
+
+from src.journal import ScrapeJournal
+from src.utils import Paper
+
+logger: Final = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HostSemaphores:
+    """Bound the number of in-flight requests for each host."""
+
+    def __init__(self, max_per_host: int) -> None:
+        """Initialize the semaphores.
+
+        Args:
+            max_per_host (int): The maximum number of concurrent requests
+                sent to a single host.
+
+        """
+        if max_per_host < 1:
+            raise ValueError(f"max_per_host must be positive, got {max_per_host}.")
+
+        self.max_per_host: Final = max_per_host
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock: Final = threading.Lock()
+
+    @contextlib.contextmanager
+    def hold(self, url: str) -> Iterator[None]:
+        """Hold a slot of the host of the URL while the block is running.
+
+        Args:
+            url (str): The URL to be requested.
+
+        """
+        host: Final = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.setdefault(
+                host, threading.BoundedSemaphore(self.max_per_host)
+            )
+
+        with semaphore:
+            yield
+
+
+def map_urls(
+    func: Callable[[str], T],
+    urls: list[str],
+    workers: int = 1,
+    max_per_host: int | None = None,
+) -> Iterator[T]:
+    """Apply the function to each URL and yield the results in the input
+    order.
+
+    When `workers` is 1, the URLs are processed one by one in the calling
+    thread. Otherwise a bounded thread pool is used, and the number of
+    concurrent requests to a single host is capped by `max_per_host`.
+
+    Args:
+        func (Callable[[str], T]): The function which fetches and parses a URL.
+        urls (list[str]): A list of URLs.
+        workers (int): The number of worker threads. Defaults to 1.
+        max_per_host (int | None): The maximum number of concurrent requests
+            per host. Defaults to the number of workers.
+
+    Yields:
+        T: The result of the function for each URL.
+
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}.")
+
+    if workers == 1:
+        for url in urls:
+            yield func(url)
+        return
+
+    semaphores: Final = HostSemaphores(max_per_host or workers)
+
+    def _run(url: str) -> T:
+        with semaphores.hold(url):
+            return func(url)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # `Executor.map` yields the results in the order of the inputs.
+        yield from executor.map(_run, urls)
+
+
+def iter_paper_pages(
+    urls: list[str],
+    parse_paper_page: Callable[[str], Paper],
+    workers: int = 1,
+    max_per_host: int | None = None,
+    journal: ScrapeJournal | None = None,
+) -> Iterator[dict]:
+    """Parse paper pages and yield the papers in the order of the URLs.
+
+    Pages already recorded in the journal are not fetched again, and each
+    newly parsed paper is recorded to the journal as soon as it is parsed.
+
+    Args:
+        urls (list[str]): A list of paper page URLs.
+        parse_paper_page (Callable[[str], Paper]): The function which fetches
+            and parses a paper page.
+        workers (int): The number of pages fetched concurrently. Defaults to 1.
+        max_per_host (int | None): The maximum number of concurrent requests
+            per host. Defaults to the number of workers.
+        journal (ScrapeJournal | None): The journal to resume from and record
+            to. Defaults to None.
+
+    Yields:
+        dict: A paper dict.
+
+    """
+    done_urls: Final = {url for url in urls if journal is not None and url in journal}
+    if done_urls:
+        logger.info(f"Skipping {len(done_urls)} pages already recorded in journal.")
+
+    def _parse(url: str) -> dict:
+        paper = parse_paper_page(url).model_dump()
+        if journal is not None:
+            journal.record(url, paper)
+        return paper
+
+    parsed_papers: Final = map_urls(
+        _parse,
+        [url for url in urls if url not in done_urls],
+        workers=workers,
+        max_per_host=max_per_host,
+    )
+
+    for i, url in enumerate(urls):
+        if url in done_urls:
+            yield journal.get(url)  # type: ignore[union-attr,misc]
+            continue
+
+        yield next(parsed_papers)
+        logger.info(f"Processed {i+1}/{len(urls)}: {url}")
@@ -0,0 +1,231 @@
+"""Columnar, memory-mapped store of a paper corpus.
+
+Each field of the papers is stored as a column, so that analysis can read
+only the titles or abstracts without parsing JSON or validating models.
+The file is memory-mapped and a value is decoded only when it is accessed.
+
+File layout (little-endian, sections aligned to 8 bytes):
+
+    - Header: magic (8 bytes), version, number of papers and number of
+      columns (uint32 each), padding.
+    - Directory: one entry per column with its name (16 bytes) and the
+      offsets of its validity, offsets and data sections (uint64 each).
+    - Per column: validity (one byte per paper, 0 for null), offsets (one
+      uint64 per paper plus one, relative to the data section) and data (the
+      UTF-8 values concatenated).
+
+"""
+
+import mmap
+import pathlib
+import struct
+from types import TracebackType
+from typing import Any, Final, Iterable, Iterator
+
+from src.utils import write_atomic
+
+CORPUS_COLUMNS: Final = ("title", "author", "abstract", "page", "pdf")
+
+_MAGIC: Final = b"BABELCOR"
+_VERSION: Final = 1
+_HEADER: Final = struct.Struct("<8sIII4x")
+# Column names are stored in this many bytes of UTF-8, padded with NUL.
+_MAX_COLUMN_NAME_SIZE: Final = 16
+_DIRECTORY_ENTRY: Final = struct.Struct(f"<{_MAX_COLUMN_NAME_SIZE}sQQQ")
+
+
+def write_corpus(
+    path: pathlib.Path,
+    papers: Iterable[dict],
+    columns: tuple[str, ...] = CORPUS_COLUMNS,
+) -> int:
+    """Write papers to a corpus store.
+
+    Args:
+        path (pathlib.Path): Path to write the store.
+        papers (Iterable[dict]): Paper dicts. Values are stored as strings,
+            so URL objects are converted with `str`.
+        columns (tuple[str, ...]): Fields to store. Missing fields are null.
+
+    Returns:
+        int: The number of written papers.
+
+    Raises:
+        ValueError: If a column name is longer than 16 bytes in UTF-8.
+
+    """
+    for column in columns:
+        if len(column.encode()) > _MAX_COLUMN_NAME_SIZE:
+            raise ValueError(
+                f"Column name {column!r} is longer than {_MAX_COLUMN_NAME_SIZE} "
+                "bytes in UTF-8."
+            )
+
+    values: Final[dict[str, list[bytes | None]]] = {column: [] for column in columns}
+    for paper in papers:
+        for column in columns:
+            value = paper.get(column)
+            values[column].append(None if value is None else str(value).encode())
+    count: Final = len(values[columns[0]]) if columns else 0
+
+    sections: Final[list[bytes]] = []
+    position = _HEADER.size + _DIRECTORY_ENTRY.size * len(columns)
+    directory: Final[list[bytes]] = []
+    for column in columns:
+        validity = bytes(value is not None for value in values[column])
+        offsets = [0]
+        for value in values[column]:
+            offsets.append(offsets[-1] + len(value or b""))
+        packed_offsets = struct.pack(f"<{count + 1}Q", *offsets)
+        data = b"".join(value or b"" for value in values[column])
+
+        entry_offsets = []
+        for section in [validity, packed_offsets, data]:
+            entry_offsets.append(position)
+            padded_section = section + b"\0" * (-len(section) % 8)
+            sections.append(padded_section)
+            position += len(padded_section)
+        directory.append(_DIRECTORY_ENTRY.pack(column.encode(), *entry_offsets))
+
+    header: Final = _HEADER.pack(_MAGIC, _VERSION, count, len(columns))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, b"".join([header, *directory, *sections]))
+    return count
+
+
+class StringColumn:
+    """Read-only sequence of the nullable string values of a column."""
+
+    def __init__(
+        self, validity: memoryview, offsets: memoryview, data: memoryview
+    ) -> None:
+        """Initialize the column over the sections of a memory map.
+
+        Args:
+            validity (memoryview): One byte per value, 0 for null.
+            offsets (memoryview): Offsets of the values in `data` as uint64.
+            data (memoryview): The UTF-8 values concatenated.
+
+        """
+        self.validity: Final = validity
+        self.offsets: Final = offsets
+        self.data: Final = data
+
+    def __len__(self) -> int:
+        """Return the number of values."""
+        return len(self.validity)
+
+    def __getitem__(self, i: int) -> str | None:
+        """Return the i-th value decoded, or None if it is null."""
+        value: Final = self.get_bytes(i)
+        return None if value is None else str(value, "utf-8")
+
+    def __iter__(self) -> Iterator[str | None]:
+        """Yield the values decoded."""
+        for i in range(len(self)):
+            yield self[i]
+
+    def get_bytes(self, i: int) -> memoryview | None:
+        """Return the i-th value as UTF-8 bytes without copying.
+
+        Args:
+            i (int): The index of the value.
+
+        Returns:
+            memoryview | None: A view into the memory map, or None if null.
+
+        """
+        if not self.validity[i]:
+            return None
+        return self.data[self.offsets[i] : self.offsets[i + 1]]
+
+    def release(self) -> None:
+        """Release the views into the memory map."""
+        self.validity.release()
+        self.offsets.release()
+        self.data.release()
+
+
+class CorpusStore:
+    """Memory-mapped corpus store written by `write_corpus`."""
+
+    def __init__(self, path: pathlib.Path) -> None:
+        """Open the store.
+
+        Args:
+            path (pathlib.Path): Path to the store.
+
+        """
+        self.path: Final = path
+        with path.open("rb") as f:
+            self._mmap: Final = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.count, num_columns = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a corpus store of version {_VERSION}.")
+
+        buffer: Final = memoryview(self._mmap)
+        self._columns: Final[dict[str, StringColumn]] = {}
+        for i in range(num_columns):
+            name, validity_offset, offsets_offset, data_offset = (
+                _DIRECTORY_ENTRY.unpack_from(
+                    self._mmap, _HEADER.size + i * _DIRECTORY_ENTRY.size
+                )
+            )
+            offsets = buffer[
+                offsets_offset : offsets_offset + (self.count + 1) * 8
+            ].cast("Q")
+            self._columns[name.rstrip(b"\0").decode()] = StringColumn(
+                buffer[validity_offset : validity_offset + self.count],
+                offsets,
+                buffer[data_offset : data_offset + offsets[self.count]],
+            )
+        buffer.release()
+
+    def __enter__(self) -> "CorpusStore":
+        """Return the store itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the store."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of papers."""
+        return int(self.count)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Return the names of the columns."""
+        return tuple(self._columns)
+
+    def column(self, name: str) -> StringColumn:
+        """Return a column.
+
+        Args:
+            name (str): The name of the column like "title".
+
+        Returns:
+            StringColumn: The column. It is valid until the store is closed.
+
+        """
+        if name not in self._columns:
+            raise KeyError(f"{self.path} has no column {name}.")
+        return self._columns[name]
+
+    def iter_papers(self) -> Iterator[dict[str, Any]]:
+        """Yield the papers as dicts of all columns."""
+        columns: Final = self._columns.items()
+        for i in range(len(self)):
+            yield {name: column[i] for name, column in columns}
+
+    def close(self) -> None:
+        """Release the memory map."""
+        for column in self._columns.values():
+            column.release()
+        self._mmap.close()
@@ -4,40 +4,96 @@ The code estimates Computer Vision Foundation(CVF) supported conferences such as
 """
 
 import logging
-from typing import Final
-
-import requests
-from bs4 import BeautifulSoup
+from typing import Final, Iterator
 
+from src import http_client
+from src.concurrency import iter_paper_pages, map_urls
+from src.html_parser import make_soup, select_hrefs
+from src.journal import ScrapeJournal
 from src.utils import Paper
 
 logger: Final = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
-def get_papers(conference: str, year: int) -> list[dict]:
+def get_papers(
+    conference: str,
+    year: int,
+    workers: int = 1,
+    max_per_host: int | None = None,
+    journal: ScrapeJournal | None = None,
+) -> list[dict]:
     """Extract paper information from a list of URLs.
 
     Args:
         conference (str): The conference name.
         year (int): The year of the conference.
+        workers (int): The number of pages fetched concurrently. Defaults to 1.
+        max_per_host (int | None): The maximum number of concurrent requests
+            per host. Defaults to the number of workers.
+        journal (ScrapeJournal | None): The journal to resume from and record
+            to. Defaults to None.
 
     Returns:
         list[Paper]: A list of Paper objects.
 
     """
-    urls: Final[list[str]] = get_paper_page_urls(conference=conference, year=year)
+    return list(
+        iter_papers(
+            conference=conference,
+            year=year,
+            workers=workers,
+            max_per_host=max_per_host,
+            journal=journal,
+        )
+    )
+
 
-    papers: list[dict] = list()
-    for i, url in enumerate(urls):
-        logger.info(f"Processing {i+1}/{len(urls)}: {url}")
-        paper = parse_paper_page(url)
-        papers.append(paper.model_dump())
+def iter_papers(
+    conference: str,
+    year: int,
+    workers: int = 1,
+    max_per_host: int | None = None,
+    journal: ScrapeJournal | None = None,
+) -> Iterator[dict]:
+    """Extract paper information from a list of URLs and yield each paper as
+    soon as it is parsed.
 
-    return papers
+    Args:
+        conference (str): The conference name.
+        year (int): The year of the conference.
+        workers (int): The number of pages fetched concurrently. Defaults to 1.
+        max_per_host (int | None): The maximum number of concurrent requests
+            per host. Defaults to the number of workers.
+        journal (ScrapeJournal | None): The journal to resume from and record
+            to. Defaults to None.
 
+    Yields:
+        dict: A paper dict.
 
-def get_paper_page_urls(conference: str, year: int) -> list[str]:
+    """
+    urls: Final[list[str]] = get_paper_page_urls(
+        conference=conference,
+        year=year,
+        workers=workers,
+        max_per_host=max_per_host,
+    )
+
+    yield from iter_paper_pages(
+        urls,
+        parse_paper_page,
+        workers=workers,
+        max_per_host=max_per_host,
+        journal=journal,
+    )
+
+
+def get_paper_page_urls(
+    conference: str,
+    year: int,
+    workers: int = 1,
+    max_per_host: int | None = None,
+) -> list[str]:
     """Return a list of CVF page URL.
 
     The number of accepted papers is different for each conference:
@@ -47,6 +103,10 @@ def get_paper_page_urls(conference: str, year: int) -> list[str]:
     Args:
         conference (str): The conference name.
         year (int): The year of the conference.
+        workers (int): The number of day pages fetched concurrently.
+            Defaults to 1.
+        max_per_host (int | None): The maximum number of concurrent requests
+            per host. Defaults to the number of workers.
 
     Returns:
         list[str]: A list of CVF page URL of each paper.
@@ -58,33 +118,31 @@ def get_paper_page_urls(conference: str, year: int) -> list[str]:
     if int(year) <= 2020:
         cvf_all_paper_url = cvf_root_url + f"/{conference_name}"
 
-        html = requests.get(cvf_all_paper_url).text
-        bs = BeautifulSoup(html, "html.parser")
-        parsed_tags = bs.select("#content a")
-        day_cvf_url_list = [
-            cvf_root_url + f"/{parsed_tag.get("href")}" for parsed_tag in parsed_tags
-        ]
+        html = http_client.get_text(cvf_all_paper_url)
+        hrefs = select_hrefs(html, "#content a")
+        day_cvf_url_list = [cvf_root_url + f"/{href}" for href in hrefs]
+
+        def _parse_day_page(day_cvf_url: str) -> list[str]:
+            html = http_client.get_text(day_cvf_url)
+            hrefs = select_hrefs(html, ".ptitle > a", restrict_to_class="ptitle")
+            return [cvf_root_url + f"/{href}" for href in hrefs]
 
         all_day_cvf_url_list = []
-        for day_cvf_url in day_cvf_url_list:
-            html = requests.get(day_cvf_url).text
-            bs = BeautifulSoup(html, "html.parser")
-            parsed_tags = bs.select(".ptitle > a")
-            all_day_cvf_url_list.extend(
-                [
-                    cvf_root_url + f"/{parsed_tag.get("href")}"
-                    for parsed_tag in parsed_tags
-                ]
-            )
+        for day_urls in map_urls(
+            _parse_day_page,
+            day_cvf_url_list,
+            workers=workers,
+            max_per_host=max_per_host,
+        ):
+            all_day_cvf_url_list.extend(day_urls)
         return all_day_cvf_url_list
 
     else:
         cvf_all_paper_url = cvf_root_url + f"/{conference_name}?day=all"
 
-        html = requests.get(cvf_all_paper_url).text
-        bs = BeautifulSoup(html, "html.parser")
-        parsed_tags = bs.select(".ptitle > a")
-        return [cvf_root_url + parsed_tag.get("href") for parsed_tag in parsed_tags]
+        html = http_client.get_text(cvf_all_paper_url)
+        hrefs = select_hrefs(html, ".ptitle > a", restrict_to_class="ptitle")
+        return [cvf_root_url + href for href in hrefs]
 
 
 def validate_conference(conference: str, year: int) -> str:
@@ -129,8 +187,8 @@ def parse_paper_page(page_url: str) -> Paper:
     Returns:
         Paper: The Paper object which stores the paper information.
     """
-    html: Final[str] = requests.get(page_url).text
-    bs: Final = BeautifulSoup(html, "html.parser")
+    html: Final[str] = http_client.get_text(page_url)
+    bs: Final = make_soup(html)
 
     title: Final[str] = (
         bs.select_one("#papertitle").text.strip()
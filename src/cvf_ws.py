@@ -4,37 +4,83 @@ The code estimates Computer Vision Foundation(CVF) supported conferences such as
 """
 
 import logging
-from typing import Final
-
-import requests
-from bs4 import BeautifulSoup
+from typing import Final, Iterator
 
+from src import http_client
+from src.concurrency import iter_paper_pages
+from src.html_parser import make_soup, select_hrefs
+from src.journal import ScrapeJournal
 from src.utils import Paper
 
 logger: Final = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
-def get_papers(conference: str, year: int) -> list[dict]:
+def get_papers(
+    conference: str,
+    year: int,
+    workers: int = 1,
+    max_per_host: int | None = None,
+    journal: ScrapeJournal | None = None,
+) -> list[dict]:
     """Extract paper information from a list of URLs.
 
     Args:
         conference (str): The conference name.
         year (int): The year of the conference.
+        workers (int): The number of pages fetched concurrently. Defaults to 1.
+        max_per_host (int | None): The maximum number of concurrent requests
+            per host. Defaults to the number of workers.
+        journal (ScrapeJournal | None): The journal to resume from and record
+            to. Defaults to None.
 
     Returns:
         list[Paper]: A list of Paper objects.
 
     """
-    urls: Final[list[str]] = get_paper_page_urls(conference=conference, year=year)
+    return list(
+        iter_papers(
+            conference=conference,
+            year=year,
+            workers=workers,
+            max_per_host=max_per_host,
+            journal=journal,
+        )
+    )
+
+
+def iter_papers(
+    conference: str,
+    year: int,
+    workers: int = 1,
+    max_per_host: int | None = None,
+    journal: ScrapeJournal | None = None,
+) -> Iterator[dict]:
+    """Extract paper information from a list of URLs and yield each paper as
+    soon as it is parsed.
+
+    Args:
+        conference (str): The conference name.
+        year (int): The year of the conference.
+        workers (int): The number of pages fetched concurrently. Defaults to 1.
+        max_per_host (int | None): The maximum number of concurrent requests
+            per host. Defaults to the number of workers.
+        journal (ScrapeJournal | None): The journal to resume from and record
+            to. Defaults to None.
 
-    papers: list[dict] = list()
-    for i, url in enumerate(urls):
-        logger.info(f"Processing {i+1}/{len(urls)}: {url}")
-        paper = parse_paper_page(url)
-        papers.append(paper.model_dump())
+    Yields:
+        dict: A paper dict.
+
+    """
+    urls: Final[list[str]] = get_paper_page_urls(conference=conference, year=year)
 
-    return papers
+    yield from iter_paper_pages(
+        urls,
+        parse_paper_page,
+        workers=workers,
+        max_per_host=max_per_host,
+        journal=journal,
+    )
 
 
 def get_paper_page_urls(conference: str, year: int) -> list[str]:
@@ -58,38 +104,29 @@ def get_paper_page_urls(conference: str, year: int) -> list[str]:
     # https://openaccess.thecvf.com/CVPR2023_workshops/menu
     ws_root_url: Final = cvf_root_url + f"/{conference_name}_workshops/menu"
 
-    html: Final = requests.get(ws_root_url).text
-    bs: Final = BeautifulSoup(html, "html.parser")
-    parsed_tags = bs.select("#content a")
+    html: Final = http_client.get_text(ws_root_url)
+    hrefs: Final = select_hrefs(html, "#content a")
 
     # 2023~2021までは同じ形式
     if year == 2023 or year == 2022 or year == 2021:
         # workshopごとのページに遷移するためのURLを取得する
         # https://openaccess.thecvf.com/CVPR2023_workshops/TCV
-        ws_root_list = [
-            cvf_root_url + parsed_tag.get("href") for parsed_tag in parsed_tags
-        ]
+        ws_root_list = [cvf_root_url + href for href in hrefs]
 
         ws_all_paper_url_list = []
         for ws_root in ws_root_list:
-            ws_html = requests.get(ws_root).text
-            ws_bs = BeautifulSoup(ws_html, "html.parser")
-            ws_parsed_tags = ws_bs.select(".ptitle > a")
+            ws_html = http_client.get_text(ws_root)
+            ws_hrefs = select_hrefs(ws_html, ".ptitle > a", restrict_to_class="ptitle")
             ws_all_paper_url_list.extend(
-                [
-                    cvf_root_url + ws_parsed_tag.get("href")
-                    for ws_parsed_tag in ws_parsed_tags
-                ]
+                [cvf_root_url + ws_href for ws_href in ws_hrefs]
             )
         return ws_all_paper_url_list
 
     # 2020以前のデータは parsed_tagsで取れるものは"CVPR2020_w42.py"のような形式
     else:
         ws_root_list = [
-            cvf_root_url
-            + f"/{conference_name}_workshops/"
-            + parsed_tag.get("href").removesuffix(".py")
-            for parsed_tag in parsed_tags
+            cvf_root_url + f"/{conference_name}_workshops/" + href.removesuffix(".py")
+            for href in hrefs
         ]
         # The URL to be removed
         # https://openaccess.thecvf.com/CVPR2020_workshops/../menuが最後にはいってしまう
@@ -101,14 +138,10 @@ def get_paper_page_urls(conference: str, year: int) -> list[str]:
 
         ws_all_paper_url_list = []
         for ws_root in ws_root_list:
-            ws_html = requests.get(ws_root).text
-            ws_bs = BeautifulSoup(ws_html, "html.parser")
-            ws_parsed_tags = ws_bs.select(".ptitle > a")
+            ws_html = http_client.get_text(ws_root)
+            ws_hrefs = select_hrefs(ws_html, ".ptitle > a", restrict_to_class="ptitle")
             ws_all_paper_url_list.extend(
-                [
-                    cvf_root_url + ws_parsed_tag.get("href").replace("..", "")
-                    for ws_parsed_tag in ws_parsed_tags
-                ]
+                [cvf_root_url + ws_href.replace("..", "") for ws_href in ws_hrefs]
             )
         return ws_all_paper_url_list
 
@@ -149,8 +182,8 @@ def parse_paper_page(page_url: str) -> Paper:
     Returns:
         Paper: The Paper object which stores the paper information.
     """
-    html: Final[str] = requests.get(page_url).text
-    bs: Final = BeautifulSoup(html, "html.parser")
+    html: Final[str] = http_client.get_text(page_url)
+    bs: Final = make_soup(html)
 
     title: Final[str] = (
         bs.select_one("#papertitle").text.strip()
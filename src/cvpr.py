@@ -1,16 +1,18 @@
 """This is module to parse CVPR specific page."""
 
-import json
 import logging
 import pathlib
 import time
 from typing import Final
 
-import requests
-from bs4 import BeautifulSoup
-
-from src.arxiv import get_arxiv_papers
-from src.utils import PartialPaper, serialize_for_json_dump
+from src import http_client
+from src.arxiv import ARXIV_API_URL, get_arxiv_papers, get_arxiv_papers_by_titles
+from src.arxiv_index import DEFAULT_INDEX_PATH, ArxivIndex
+from src.html_parser import make_soup
+from src.journal import ScrapeJournal, get_journal_path
+from src.paper_io import PaperWriter
+from src.title_matching import TitleIndex
+from src.utils import Paper, PartialPaper
 
 logger: Final = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -19,8 +21,10 @@ logging.basicConfig(level=logging.INFO)
 def get_papers(
     year: int,
     output_path: pathlib.Path,
-    time_sleep: int = 1,
-    save_frequency: int = 3,
+    time_sleep: int = 0,
+    batch_size: int = 1,
+    arxiv_base_url: str = ARXIV_API_URL,
+    arxiv_index: ArxivIndex | None = None,
 ) -> list[dict]:
     """Extract paper information from a list of URLs.
 
@@ -29,82 +33,159 @@ def get_papers(
     So try to find the paper from arxiv and if found, extract the
     abstract and urls from there.
 
+    Papers are journaled as they are found, so an interrupted run resumes
+    from the journal next to the output path. The journal is removed once
+    the output is written.
+
     Args:
         year (int): The year of the conference.
-        output_path (pathlib.Path): Output path to save the JSON file.
-        time_sleep (int): Sleep time between requests.
-        save_frequency (int): Save frequency of the papers.
+        output_path (pathlib.Path): Output path to save the papers. The
+            format is given by the suffix, see `PaperWriter`.
+        time_sleep (int): Extra sleep time between arXiv requests. Requests
+            are already throttled by the shared rate limiter. Defaults to 0.
+        batch_size (int): The number of titles searched with a single arXiv
+            request. Defaults to 1.
+        arxiv_base_url (str): The URL of the arXiv API. Defaults to the
+            public one.
+        arxiv_index (ArxivIndex | None): Offline arXiv index looked up before
+            the API. Only the misses are searched with the API. Defaults to
+            None.
 
     Returns:
         list[Paper]: A list of Paper objects.
 
     """
-    # Load papers from JSON file.
-    if output_path.exists():
-        with output_path.open("r") as f:
-            papers: list[PartialPaper] = [
-                PartialPaper.model_validate(p) for p in json.load(f)
-            ]
+    # Get title and authors from the accepted papers page.
+    partial_papers = get_partial_papers(year)
 
-        titles: set[str] = {paper.title.lower() for paper in papers}
-        print(f"Papers loaded from {output_path}.")
+    # Papers are recorded under their lowercased titles.
+    with ScrapeJournal(get_journal_path(output_path)) as journal:
+        papers: Final = enrich_partial_papers(
+            partial_papers,
+            time_sleep=time_sleep,
+            journal=journal,
+            batch_size=batch_size,
+            arxiv_base_url=arxiv_base_url,
+            arxiv_index=arxiv_index,
+        )
+        with PaperWriter(output_path) as writer:
+            for paper in papers:
+                writer.write(paper)
+    journal.remove()
+
+    print(f"Papers are saved at {output_path}.")
+    return papers
+
+
+def enrich_partial_papers(
+    partial_papers: list[PartialPaper],
+    time_sleep: int = 0,
+    journal: ScrapeJournal | None = None,
+    batch_size: int = 1,
+    arxiv_base_url: str = ARXIV_API_URL,
+    arxiv_index: ArxivIndex | None = None,
+) -> list[dict]:
+    """Try to find the abstract and urls of each partial paper from arXiv.
 
-    else:
-        papers: list[PartialPaper] = []  # type: ignore[no-redef]
-        titles: set[str] = set()  # type: ignore[no-redef]
+    With `batch_size` larger than 1, the titles of a batch are packed into a
+    single arXiv query and the returned entries are matched back to the
+    partial papers locally, which cuts the number of requests.
 
-    # Get title and authors from the accepted papers page.
-    partial_papers = get_partial_papers(year)
+    Args:
+        partial_papers (list[PartialPaper]): Papers which have only title and
+            authors.
+        time_sleep (int): Extra sleep time between arXiv requests. Requests
+            are already throttled by the shared rate limiter. Defaults to 0.
+        journal (ScrapeJournal | None): The journal to resume from and record
+            to. Defaults to None.
+        batch_size (int): The number of titles searched with a single arXiv
+            request. Defaults to 1.
+        arxiv_base_url (str): The URL of the arXiv API. Defaults to the
+            public one.
+        arxiv_index (ArxivIndex | None): Offline arXiv index looked up before
+            the API. Only the misses are searched with the API. Defaults to
+            None.
 
-    # Try to find the paper abstract and urls from arxiv.
-    found_count: int = 0
-    for i, partial_paper in enumerate(partial_papers):
-        # Save the paper to the list.
-        if (i + 1) % save_frequency == 0:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with output_path.open("w") as f:
-                json.dump(
-                    [paper.model_dump() for paper in papers],
-                    f,
-                    indent=4,
-                    default=serialize_for_json_dump,
-                )
-
-        logger.info(f"Processing {i+1}/{len(partial_papers)}: {partial_paper.title}")
+    Returns:
+        list[dict]: A list of paper dicts in the order of the partial papers.
 
+    """
+    # Skip the papers which are already processed.
+    papers: Final[dict[str, dict]] = {}
+    pending_papers: Final[list[PartialPaper]] = []
+    for partial_paper in partial_papers:
         query = partial_paper.title.lower()
-        # Skip if the paper is already found.
-        if query in titles:
-            found_count += 1
-            continue
+        recorded_paper = journal.get(query) if journal is not None else None
+        indexed_paper = (
+            arxiv_index.lookup(partial_paper.title, partial_paper.author)
+            if recorded_paper is None and arxiv_index is not None
+            else None
+        )
+        if recorded_paper is not None:
+            papers[query] = recorded_paper
+        elif indexed_paper is not None:
+            papers[query] = _merge_paper(partial_paper, indexed_paper).model_dump()
+            if journal is not None:
+                journal.record(query, papers[query])
         else:
-            # Sleep to avoid being blocked.
+            pending_papers.append(partial_paper)
+
+    if arxiv_index is not None:
+        logger.info(
+            f"{len(partial_papers) - len(pending_papers)} papers resolved offline, "
+            f"{len(pending_papers)} papers are searched with the arXiv API."
+        )
+
+    for i in range(0, len(pending_papers), batch_size):
+        batch = pending_papers[i : i + batch_size]
+        logger.info(
+            f"Processing {i+len(batch)}/{len(pending_papers)}: {batch[-1].title}"
+        )
+
+        # Requests are throttled by the shared rate limiter in `http_client`.
+        if time_sleep > 0:
             time.sleep(time_sleep)
 
-        paper = partial_paper
-        for candidate_paper in get_arxiv_papers(query):
-            # Check if the title and first author are the same.
-            has_same_title = (
-                candidate_paper.title.lower() == partial_paper.title.lower()
+        if batch_size == 1:
+            candidate_papers = get_arxiv_papers(
+                batch[0].title.lower(), base_url=arxiv_base_url
             )
-            has_same_first_author = (
-                candidate_paper.author.split(",")[0].lower()
-                == partial_paper.author.split(",")[0].lower()
+        else:
+            candidate_papers = get_arxiv_papers_by_titles(
+                [partial_paper.title for partial_paper in batch],
+                base_url=arxiv_base_url,
+            )
+
+        title_index = TitleIndex(candidate_papers)
+        for partial_paper in batch:
+            paper = partial_paper
+            candidate_paper = title_index.find(
+                partial_paper.title, partial_paper.author
             )
-            if has_same_title and has_same_first_author:
-                found_count += 1
-                paper = PartialPaper(
-                    title=partial_paper.title,
-                    author=partial_paper.author,
-                    abstract=candidate_paper.abstract,
-                    page=candidate_paper.page,
-                    pdf=candidate_paper.pdf,
-                )
-
-        papers.append(paper)
+            if candidate_paper is not None:
+                paper = _merge_paper(partial_paper, candidate_paper)
 
+            query = partial_paper.title.lower()
+            papers[query] = paper.model_dump()
+            if journal is not None:
+                journal.record(query, papers[query])
+
+    found_count: Final = sum(
+        papers[p.title.lower()]["abstract"] is not None for p in partial_papers
+    )
     print(f"{found_count} / {len(partial_papers)} papers found in arxiv.")
-    return [paper.model_dump() for paper in papers]
+    return [papers[partial_paper.title.lower()] for partial_paper in partial_papers]
+
+
+def _merge_paper(partial_paper: PartialPaper, arxiv_paper: Paper) -> PartialPaper:
+    """Fill the abstract and urls of the partial paper from arXiv."""
+    return PartialPaper(
+        title=partial_paper.title,
+        author=partial_paper.author,
+        abstract=arxiv_paper.abstract,
+        page=arxiv_paper.page,
+        pdf=arxiv_paper.pdf,
+    )
 
 
 def get_partial_papers(year: int) -> list[PartialPaper]:
@@ -119,8 +200,8 @@ def get_partial_papers(year: int) -> list[PartialPaper]:
     """
     url: Final = f"https://cvpr.thecvf.com/Conferences/{year}/AcceptedPapers"
 
-    html = requests.get(url).text
-    bs = BeautifulSoup(html, "html.parser")
+    html = http_client.get_text(url)
+    bs = make_soup(html)
 
     # hypothesys that the title and author are in the table.
     table = bs.find("table")
@@ -161,8 +242,13 @@ def get_partial_papers(year: int) -> list[PartialPaper]:
 
 
 if __name__ == "__main__":
+    # Papers in the offline index are enriched without the arXiv API.
+    arxiv_index: Final = (
+        ArxivIndex(DEFAULT_INDEX_PATH) if DEFAULT_INDEX_PATH.exists() else None
+    )
     papers = get_papers(
         year=2024,
         output_path=pathlib.Path("./data/json/cvpr2024_papers.json"),
+        arxiv_index=arxiv_index,
     )
     print(papers)
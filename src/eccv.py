@@ -1,34 +1,76 @@
 import logging
-from typing import Final
-
-import requests
-from bs4 import BeautifulSoup
+from typing import Final, Iterator
 
+from src import http_client
+from src.concurrency import iter_paper_pages
+from src.html_parser import make_soup, select_hrefs
+from src.journal import ScrapeJournal
 from src.utils import Paper
 
 logger: Final = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
-def get_papers(year: int) -> list[dict]:
+def get_papers(
+    year: int,
+    workers: int = 1,
+    max_per_host: int | None = None,
+    journal: ScrapeJournal | None = None,
+) -> list[dict]:
     """Extract paper information from a list of URLs.
 
     Args:
         year (int): The year of the conference.
+        workers (int): The number of pages fetched concurrently. Defaults to 1.
+        max_per_host (int | None): The maximum number of concurrent requests
+            per host. Defaults to the number of workers.
+        journal (ScrapeJournal | None): The journal to resume from and record
+            to. Defaults to None.
 
     Returns:
         list[Paper]: A list of Paper objects.
 
     """
-    urls: Final[list[str]] = get_paper_page_urls(year=year)
+    return list(
+        iter_papers(
+            year=year,
+            workers=workers,
+            max_per_host=max_per_host,
+            journal=journal,
+        )
+    )
+
+
+def iter_papers(
+    year: int,
+    workers: int = 1,
+    max_per_host: int | None = None,
+    journal: ScrapeJournal | None = None,
+) -> Iterator[dict]:
+    """Extract paper information from a list of URLs and yield each paper as
+    soon as it is parsed.
+
+    Args:
+        year (int): The year of the conference.
+        workers (int): The number of pages fetched concurrently. Defaults to 1.
+        max_per_host (int | None): The maximum number of concurrent requests
+            per host. Defaults to the number of workers.
+        journal (ScrapeJournal | None): The journal to resume from and record
+            to. Defaults to None.
 
-    papers: list[dict] = list()
-    for i, url in enumerate(urls):
-        logger.info(f"Processing {i+1}/{len(urls)}: {url}")
-        paper = parse_paper_page(url)
-        papers.append(paper.model_dump())
+    Yields:
+        dict: A paper dict.
 
-    return papers
+    """
+    urls: Final[list[str]] = get_paper_page_urls(year=year)
+
+    yield from iter_paper_pages(
+        urls,
+        parse_paper_page,
+        workers=workers,
+        max_per_host=max_per_host,
+        journal=journal,
+    )
 
 
 def get_paper_page_urls(year: int) -> list[str]:
@@ -47,13 +89,13 @@ def get_paper_page_urls(year: int) -> list[str]:
     """
     root_url: Final[str] = "https://www.ecva.net/papers.php"
 
-    html: Final[str] = requests.get(root_url).text
-    bs: Final = BeautifulSoup(html, "html.parser")
+    html: Final[str] = http_client.get_text(root_url)
 
     # This list inludes sub-URLs like "papers/eccv_2022/papers_ECCV/html/19_ECCV_2022_paper.php".
-    all_paper_page_sub_urls: list[str] = [
-        link.get("href") for link in bs.select("dt.ptitle a") if link.get("href")
-    ]
+    # The page covers all years, so only `dt.ptitle` elements are built.
+    all_paper_page_sub_urls: list[str] = select_hrefs(
+        html, "dt.ptitle a", restrict_to_class="ptitle"
+    )
 
     return [
         root_url.replace("papers.php", "") + url
@@ -73,8 +115,8 @@ def parse_paper_page(page_url: str) -> Paper:
         Paper: The Paper object which stores the paper information.
 
     """
-    html: Final[str] = requests.get(page_url).text
-    bs: Final = BeautifulSoup(html, "html.parser")
+    html: Final[str] = http_client.get_text(page_url)
+    bs: Final = make_soup(html)
 
     title = bs.find(id="papertitle").text.strip()
     author = bs.find(id="authors").text.replace(";", "").strip()
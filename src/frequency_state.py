@@ -0,0 +1,458 @@
+"""Incremental word frequency analysis keyed by paper content hash.
+
+The n-gram counts of a corpus are persisted in a state directory next to
+the counts of every paper, keyed by the hash of the paper's documents. When
+the corpus changes, only the added papers are counted and the counts of the
+removed papers are subtracted, so the counting work of an update is
+proportional to the change. A changed paper is a removal of its old version
+and an addition of its new one. A state directory has:
+
+    - `state.json`: The settings, the hash of the paper file and the index
+      of the papers: their hashes, the number of papers with each hash and
+      the segment which has their counts. The documents are not kept.
+    - `segment-<generation>.npz`: The n-gram counts of the papers added by
+      an update, in sparse rows over a vocabulary of the segment.
+    - `counts-<generation>.json`: The n-gram counts of the corpus, sorted
+      like the CSV so that sorting them again after an update is cheap.
+
+`state.json` is replaced last, so an interrupted update leaves the previous
+state intact. A paper file whose hash has not changed is not read at all.
+
+"""
+
+import dataclasses
+import hashlib
+import io
+import json
+import pathlib
+from collections import Counter
+from typing import Final
+
+import numpy as np
+
+from src.analysis import (
+    ADJUSTED_FREQUENCY_DIR,
+    RAW_FREQUENCY_DIR,
+    count_documents,
+    get_analysis_output_path,
+    get_raw_frequency_path,
+    load_paper_documents,
+    write_frequency_csv,
+)
+from src.frequencies import (
+    NgramFilter,
+    Normalizer,
+    get_default_normalizer,
+    sort_frequency_dict,
+)
+from src.lemmatization import CachedLemmatizer
+from src.manifest import hash_file
+from src.utils import write_atomic
+
+DEFAULT_STATE_DIR: Final = pathlib.Path("./outputs/frequency_state/")
+
+_VERSION: Final = 2
+_STATE_FILE_NAME: Final = "state.json"
+
+
+@dataclasses.dataclass
+class FrequencyState:
+    """N-gram counts of a corpus and the index of the papers included in them."""
+
+    until_ngram: int
+    use_abstract: bool
+    # Hash of the stopwords. The counts are rebuilt when it changes.
+    normalizer_fingerprint: str
+    # Hash of the paper file the counts were made from.
+    input_hash: str = ""
+    # Incremented by each update to name its files.
+    generation: int = 0
+    # Paper hash to the number of papers with that hash and their segment.
+    papers: dict[str, dict] = dataclasses.field(default_factory=dict)
+    # Segment file name to the number of papers in it.
+    segments: dict[str, int] = dataclasses.field(default_factory=dict)
+    counts: Counter[str] = dataclasses.field(default_factory=Counter)
+
+
+@dataclasses.dataclass(frozen=True)
+class PaperCountSegment:
+    """The n-gram counts of papers as sparse rows, one row per paper."""
+
+    paper_hashes: np.ndarray
+    # The row of paper i is `term_ids[offsets[i] : offsets[i + 1]]`.
+    offsets: np.ndarray
+    term_ids: np.ndarray
+    counts: np.ndarray
+    # The terms of the segment joined by newlines as UTF-8.
+    terms: np.ndarray
+
+    def get_rows(self) -> dict[str, dict[str, int]]:
+        """Return the n-gram counts of each paper hash."""
+        terms: Final = self.terms.tobytes().decode().split("\n")
+        term_ids: Final = self.term_ids.tolist()
+        counts: Final = self.counts.tolist()
+        offsets: Final = self.offsets.tolist()
+        return {
+            paper_hash: {
+                terms[term_id]: count
+                for term_id, count in zip(
+                    term_ids[offsets[i] : offsets[i + 1]],
+                    counts[offsets[i] : offsets[i + 1]],
+                    strict=True,
+                )
+            }
+            for i, paper_hash in enumerate(self.paper_hashes.tolist())
+        }
+
+
+def build_segment(rows: dict[str, dict[str, int]]) -> PaperCountSegment:
+    """Build a segment from the n-gram counts of each paper hash.
+
+    Args:
+        rows (dict[str, dict[str, int]]): Paper hash to its n-gram counts.
+
+    Returns:
+        PaperCountSegment: The segment.
+
+    """
+    term_ids: Final[dict[str, int]] = {}
+    ids: Final[list[int]] = []
+    counts: Final[list[int]] = []
+    offsets: Final = [0]
+    for frequency_dict in rows.values():
+        for term, count in frequency_dict.items():
+            ids.append(term_ids.setdefault(term, len(term_ids)))
+            counts.append(count)
+        offsets.append(len(ids))
+    return PaperCountSegment(
+        paper_hashes=np.array(list(rows), dtype="U64"),
+        offsets=np.array(offsets, dtype=np.int64),
+        term_ids=np.array(ids, dtype=np.int64),
+        counts=np.array(counts, dtype=np.int64),
+        terms=np.frombuffer("\n".join(term_ids).encode(), dtype=np.uint8),
+    )
+
+
+def save_segment(path: pathlib.Path, segment: PaperCountSegment) -> None:
+    """Save a segment as an uncompressed NumPy archive."""
+    buffer: Final = io.BytesIO()
+    np.savez(
+        buffer,
+        allow_pickle=False,
+        **{
+            field.name: getattr(segment, field.name)
+            for field in dataclasses.fields(segment)
+        },
+    )
+    write_atomic(path, buffer.getvalue())
+
+
+def load_segment(path: pathlib.Path) -> PaperCountSegment:
+    """Load a segment saved by `save_segment`."""
+    with np.load(path) as archive:
+        return PaperCountSegment(**{name: archive[name] for name in archive.files})
+
+
+def get_paper_hash(documents: list[str]) -> str:
+    """Return the content hash of the documents of a paper.
+
+    Args:
+        documents (list[str]): The title and optionally the abstract.
+
+    Returns:
+        str: The hex digest.
+
+    """
+    return hashlib.sha256("\0".join(documents).encode()).hexdigest()
+
+
+def get_normalizer_fingerprint(normalizer: Normalizer) -> str:
+    """Return the hash of the stopwords of the normalizer."""
+    return hashlib.sha256("\n".join(sorted(normalizer.stopwords)).encode()).hexdigest()
+
+
+def get_state_path(
+    input_path: pathlib.Path,
+    use_abstract: bool = False,
+    until_ngram: int = 3,
+    state_dir: pathlib.Path = DEFAULT_STATE_DIR,
+) -> pathlib.Path:
+    """Return the path of the state directory of a paper file.
+
+    Args:
+        input_path (pathlib.Path): Path to a paper file.
+        use_abstract (bool): Whether abstracts are used in addition to titles.
+        until_ngram (int): The maximum n of the n-grams.
+        state_dir (pathlib.Path): Root directory of the states.
+
+    Returns:
+        pathlib.Path: The path like
+            `<state_dir>/title_only/cvpr2023_papers_title_only_3gram.state`.
+
+    """
+    csv_path: Final = get_raw_frequency_path(
+        input_path, use_abstract, until_ngram, state_dir
+    )
+    return csv_path.with_name(f"{csv_path.stem}.state")
+
+
+def load_state(state_path: pathlib.Path) -> FrequencyState | None:
+    """Load a state saved by `save_state`.
+
+    Args:
+        state_path (pathlib.Path): Path to the state directory.
+
+    Returns:
+        FrequencyState | None: The state, or None if it does not exist or was
+            saved by another version.
+
+    """
+    index_path: Final = state_path / _STATE_FILE_NAME
+    if not index_path.exists():
+        return None
+
+    with index_path.open("r") as f:
+        data: Final = json.load(f)
+    if data.get("version") != _VERSION:
+        return None
+
+    with (state_path / f"counts-{data['generation']}.json").open("r") as f:
+        counts: Final = Counter(json.load(f))
+    return FrequencyState(
+        until_ngram=data["until_ngram"],
+        use_abstract=data["use_abstract"],
+        normalizer_fingerprint=data["normalizer_fingerprint"],
+        input_hash=data["input_hash"],
+        generation=data["generation"],
+        papers=data["papers"],
+        segments=data["segments"],
+        counts=counts,
+    )
+
+
+def save_state(state_path: pathlib.Path, state: FrequencyState) -> None:
+    """Save the counts and the index of a state, then delete unused files.
+
+    Args:
+        state_path (pathlib.Path): Path to the state directory.
+        state (FrequencyState): The state. Its segments are already saved by
+            `update_state`.
+
+    """
+    counts_name: Final = f"counts-{state.generation}.json"
+    write_atomic(
+        state_path / counts_name,
+        json.dumps(state.counts, ensure_ascii=False).encode(),
+    )
+    data: Final = {
+        "version": _VERSION,
+        "until_ngram": state.until_ngram,
+        "use_abstract": state.use_abstract,
+        "normalizer_fingerprint": state.normalizer_fingerprint,
+        "input_hash": state.input_hash,
+        "generation": state.generation,
+        "papers": state.papers,
+        "segments": state.segments,
+    }
+    write_atomic(state_path / _STATE_FILE_NAME, json.dumps(data).encode())
+
+    used_names: Final = {_STATE_FILE_NAME, counts_name, *state.segments}
+    for path in state_path.iterdir():
+        if path.name not in used_names and not path.name.startswith("."):
+            path.unlink()
+
+
+def update_state(
+    state: FrequencyState,
+    state_path: pathlib.Path,
+    paper_documents: list[list[str]],
+    normalizer: Normalizer,
+    lemmatizer: CachedLemmatizer,
+) -> tuple[int, int]:
+    """Update the state to the current papers of the corpus.
+
+    Only the added papers are tokenized. Their counts are saved in a new
+    segment, and the counts of removed papers are read from their segments.
+    When more than half of the saved rows belong to removed papers, the rows
+    of the remaining papers are merged into one segment.
+
+    Args:
+        state (FrequencyState): The state to update in place.
+        state_path (pathlib.Path): Path to the state directory.
+        paper_documents (list[list[str]]): The documents of each paper.
+        normalizer (Normalizer): The normalizer to remove stopwords.
+        lemmatizer (CachedLemmatizer): The lemmatizer of nouns.
+
+    Returns:
+        tuple[int, int]: The numbers of added and removed papers.
+
+    """
+    documents_by_hash: Final[dict[str, list[str]]] = {}
+    new_paper_counts: Final[Counter[str]] = Counter()
+    for documents in paper_documents:
+        paper_hash = get_paper_hash(documents)
+        documents_by_hash.setdefault(paper_hash, documents)
+        new_paper_counts[paper_hash] += 1
+    old_paper_counts: Final = Counter(
+        {paper_hash: paper["count"] for paper_hash, paper in state.papers.items()}
+    )
+    added: Final = new_paper_counts - old_paper_counts
+    removed: Final = old_paper_counts - new_paper_counts
+
+    state.generation += 1
+    segment_name: Final = f"segment-{state.generation}.npz"
+    segment_rows: Final[dict[str, dict[str, dict[str, int]]]] = {}
+    new_rows: Final[dict[str, dict[str, int]]] = {}
+
+    def get_row(paper_hash: str) -> dict[str, int]:
+        paper = state.papers.get(paper_hash)
+        if paper is None:
+            if paper_hash not in new_rows:
+                new_rows[paper_hash] = count_documents(
+                    documents_by_hash[paper_hash],
+                    state.until_ngram,
+                    normalizer,
+                    lemmatizer,
+                )
+            return new_rows[paper_hash]
+
+        if paper["segment"] not in segment_rows:
+            segment = load_segment(state_path / paper["segment"])
+            segment_rows[paper["segment"]] = segment.get_rows()
+        return segment_rows[paper["segment"]][paper_hash]
+
+    for paper_hash, count in removed.items():
+        for key, value in get_row(paper_hash).items():
+            state.counts[key] -= count * value
+    for paper_hash, count in added.items():
+        for key, value in get_row(paper_hash).items():
+            state.counts[key] += count * value
+    for key in [key for key, value in state.counts.items() if value <= 0]:
+        del state.counts[key]
+
+    for paper_hash in removed.keys() | added.keys():
+        if new_paper_counts[paper_hash] == 0:
+            del state.papers[paper_hash]
+        elif paper_hash in new_rows:
+            state.papers[paper_hash] = {
+                "count": new_paper_counts[paper_hash],
+                "segment": segment_name,
+            }
+        else:
+            state.papers[paper_hash]["count"] = new_paper_counts[paper_hash]
+
+    if new_rows:
+        state.segments[segment_name] = len(new_rows)
+        state_path.mkdir(parents=True, exist_ok=True)
+        save_segment(state_path / segment_name, build_segment(new_rows))
+
+    live_segments: Final = Counter(paper["segment"] for paper in state.papers.values())
+    for name in list(state.segments):
+        if name not in live_segments:
+            del state.segments[name]
+    if len(state.segments) > 1 and sum(state.segments.values()) > 2 * len(state.papers):
+        _compact(state, state_path)
+
+    return sum(added.values()), sum(removed.values())
+
+
+def _compact(state: FrequencyState, state_path: pathlib.Path) -> None:
+    # Amortized over the updates which removed the papers, since the saved
+    # rows are at least twice the remaining ones.
+    segment_name: Final = f"segment-{state.generation}-compacted.npz"
+    rows: Final[dict[str, dict[str, int]]] = {}
+    for name in state.segments:
+        for paper_hash, row in load_segment(state_path / name).get_rows().items():
+            if paper_hash in state.papers:
+                rows[paper_hash] = row
+    save_segment(state_path / segment_name, build_segment(rows))
+    for paper in state.papers.values():
+        paper["segment"] = segment_name
+    state.segments.clear()
+    state.segments[segment_name] = len(rows)
+
+
+def analyze_word_frequency_incremental(
+    input_path: pathlib.Path,
+    use_abstract: bool = False,
+    until_ngram: int = 3,
+    output_root_dir: pathlib.Path = RAW_FREQUENCY_DIR,
+    state_dir: pathlib.Path = DEFAULT_STATE_DIR,
+    normalizer: Normalizer | None = None,
+    lemmatizer: CachedLemmatizer | None = None,
+    ngram_filter: NgramFilter | None = None,
+    adjusted_output_dir: pathlib.Path = ADJUSTED_FREQUENCY_DIR,
+) -> pathlib.Path:
+    """Update the word frequency of a paper file from its previous state.
+
+    The CSV file is the same as the one of `analyze_word_frequency`. The
+    state always keeps the raw counts, so an n-gram filter is applied only
+    when the CSV is written, and the CSV is written again even if the paper
+    file has not changed, since the stopwords may have.
+
+    Args:
+        input_path (pathlib.Path): Path to a paper file in any supported format.
+        use_abstract (bool): Whether to use abstracts in addition to titles.
+        until_ngram (int): The maximum n of the n-grams.
+        output_root_dir (pathlib.Path): Root directory of the raw frequencies.
+        state_dir (pathlib.Path): Root directory of the states.
+        normalizer (Normalizer | None): The normalizer to remove stopwords.
+            Defaults to `get_default_normalizer()`.
+        lemmatizer (CachedLemmatizer | None): The lemmatizer of nouns.
+            Defaults to a new one without an on-disk cache.
+        ngram_filter (NgramFilter | None): The filter to save the adjusted
+            frequency instead of the raw one. Defaults to None.
+        adjusted_output_dir (pathlib.Path): Root directory of the adjusted
+            frequencies, used with `ngram_filter`.
+
+    Returns:
+        pathlib.Path: Path to the saved CSV file.
+
+    """
+    # Check if input file exists.
+    if not input_path.exists():
+        raise FileNotFoundError(f"{input_path} does not exist.")
+
+    normalizer = normalizer or get_default_normalizer()
+    lemmatizer = lemmatizer or CachedLemmatizer()
+    fingerprint: Final = get_normalizer_fingerprint(normalizer)
+    input_hash: Final = hash_file(input_path)
+    output_path: Final = get_analysis_output_path(
+        input_path,
+        use_abstract,
+        until_ngram,
+        output_root_dir,
+        adjusted_output_dir if ngram_filter else None,
+    )
+    state_path: Final = get_state_path(input_path, use_abstract, until_ngram, state_dir)
+
+    # Start over if the state was made with other settings.
+    state = load_state(state_path)
+    if state is None or state.normalizer_fingerprint != fingerprint:
+        state = FrequencyState(until_ngram, use_abstract, fingerprint)
+
+    if state.input_hash == input_hash:
+        print(f"{input_path} has not changed.")
+        if ngram_filter is None and output_path.exists():
+            print(f"Word frequency is saved as {output_path}.")
+            return output_path
+    else:
+        added, removed = update_state(
+            state,
+            state_path,
+            load_paper_documents(input_path, use_abstract),
+            normalizer,
+            lemmatizer,
+        )
+        print(f"{added} papers are added and {removed} papers are removed.")
+        # The counts are kept in the order of the CSV, which makes sorting
+        # them again after a small change close to linear.
+        state.counts = Counter(sort_frequency_dict(state.counts))
+        state.input_hash = input_hash
+        save_state(state_path, state)
+        lemmatizer.save()
+
+    frequency_dict: Final = ngram_filter(state.counts) if ngram_filter else state.counts
+    write_frequency_csv(output_path, sort_frequency_dict(dict(frequency_dict)))
+    print(f"Word frequency is saved as {output_path}.")
+    return output_path
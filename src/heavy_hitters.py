@@ -0,0 +1,287 @@
+"""Approximate counting of the most frequent n-grams in bounded memory.
+
+Exact counting keeps every distinct n-gram, which is millions of entries for
+the 1 to 3-grams of all abstracts, although only the most frequent ones are
+used. The counters of this module keep a fixed number of entries instead:
+
+    - `SpaceSaving` monitors a fixed number of n-grams. A new n-gram replaces
+      the least frequent one and inherits its count as the error, so each
+      count overestimates the true count by at most its error, and every
+      n-gram more frequent than N / capacity is monitored, where N is the
+      number of counted n-grams.
+    - `CountMinSketch` adds every n-gram to `depth` rows of `width` counters
+      and estimates a count as the minimum of its counters. An estimate
+      overestimates the true count by at most e * N / width with a
+      probability of at least 1 - exp(-depth). The most frequent n-grams are
+      kept as candidates with their estimates.
+
+Both are sized from a memory budget in bytes.
+
+"""
+
+import heapq
+import math
+from typing import Final, Iterable
+
+import numpy as np
+
+from src.utils import hash_key
+
+# Rough size of a monitored n-gram in bytes: the key string, the dict
+# entries of its count and error, and its heap entry.
+BYTES_PER_ENTRY: Final = 320
+# Bytes of a counter of the Count-Min sketch.
+BYTES_PER_COUNTER: Final = 8
+
+
+class _MinTracker:
+    """Keys with increasing values and the key with the minimum value.
+
+    The heap has one entry per key whose value may be outdated. An outdated
+    entry is refreshed only when it reaches the top, so that an increment
+    costs O(1) and the heap never grows beyond the number of keys.
+
+    """
+
+    def __init__(self) -> None:
+        self.values: Final[dict[str, int]] = {}
+        self._heap: Final[list[tuple[int, str]]] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, key: str, value: int) -> None:
+        self.values[key] = value
+        heapq.heappush(self._heap, (value, key))
+
+    def pop_min(self) -> tuple[str, int]:
+        while True:
+            value, key = self._heap[0]
+            current_value = self.values[key]
+            if value == current_value:
+                heapq.heappop(self._heap)
+                del self.values[key]
+                return key, value
+            heapq.heapreplace(self._heap, (current_value, key))
+
+    def peek_min(self) -> int:
+        while True:
+            value, key = self._heap[0]
+            current_value = self.values[key]
+            if value == current_value:
+                return value
+            heapq.heapreplace(self._heap, (current_value, key))
+
+
+class SpaceSaving:
+    """SpaceSaving counter of the most frequent n-grams."""
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the counter.
+
+        Args:
+            capacity (int): The number of n-grams to monitor.
+
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}.")
+
+        self.capacity: Final = capacity
+        self.total = 0
+        self._counts: Final = _MinTracker()
+        self._errors: Final[dict[str, int]] = {}
+
+    @classmethod
+    def from_memory_budget(cls, memory_budget: int) -> "SpaceSaving":
+        """Return a counter which monitors as many n-grams as fit in a budget.
+
+        Args:
+            memory_budget (int): The memory budget in bytes.
+
+        Returns:
+            SpaceSaving: The counter.
+
+        """
+        return cls(max(1, memory_budget // BYTES_PER_ENTRY))
+
+    @property
+    def error_bound(self) -> float:
+        """Return the maximum overestimate of any count, N / capacity."""
+        return self.total / self.capacity
+
+    def update(self, keys: Iterable[str]) -> None:
+        """Count the n-grams.
+
+        Args:
+            keys (Iterable[str]): N-grams, one occurrence each.
+
+        """
+        counts: Final = self._counts
+        values: Final = counts.values
+        errors: Final = self._errors
+        for key in keys:
+            self.total += 1
+            if key in values:
+                values[key] += 1
+            elif len(counts) < self.capacity:
+                counts.add(key, 1)
+                errors[key] = 0
+            else:
+                evicted_key, min_count = counts.pop_min()
+                del errors[evicted_key]
+                counts.add(key, min_count + 1)
+                errors[key] = min_count
+
+    def get_items(self) -> list[tuple[str, int, int]]:
+        """Return the monitored n-grams.
+
+        Returns:
+            list[tuple[str, int, int]]: (n-gram, count, error). The true count
+                is between `count - error` and `count`.
+
+        """
+        return [
+            (key, count, self._errors[key])
+            for key, count in self._counts.values.items()
+        ]
+
+    def format_stats(self) -> str:
+        """Format the error bounds."""
+        max_error: Final = max(self._errors.values(), default=0)
+        return (
+            f"SpaceSaving: {len(self._counts)}/{self.capacity} n-grams of "
+            f"{self.total} are monitored. Counts overestimate by at most "
+            f"{max_error} (guaranteed bound N/capacity = {self.error_bound:.1f})."
+        )
+
+
+class CountMinSketch:
+    """Count-Min sketch with the candidates of the most frequent n-grams."""
+
+    def __init__(self, width: int, depth: int = 4, num_candidates: int = 1000) -> None:
+        """Initialize the sketch.
+
+        Args:
+            width (int): The number of counters of each row.
+            depth (int): The number of rows, i.e. hash functions. Defaults to
+                4.
+            num_candidates (int): The number of the most frequent n-grams to
+                keep with their estimates. Defaults to 1000.
+
+        """
+        if width < 1 or depth < 1 or num_candidates < 1:
+            raise ValueError("width, depth and num_candidates must be positive.")
+
+        self.width: Final = width
+        self.depth: Final = depth
+        self.num_candidates: Final = num_candidates
+        self.total = 0
+        self._table: Final = np.zeros((depth, width), dtype=np.int64)
+        self._rows: Final = np.arange(depth, dtype=np.int64)[:, None]
+        self._candidates: Final = _MinTracker()
+
+    @classmethod
+    def from_memory_budget(
+        cls, memory_budget: int, depth: int = 4, num_candidates: int = 1000
+    ) -> "CountMinSketch":
+        """Return a sketch whose counters and candidates fit in a budget.
+
+        Args:
+            memory_budget (int): The memory budget in bytes.
+            depth (int): The number of rows. Defaults to 4.
+            num_candidates (int): The number of candidates. Defaults to 1000.
+
+        Returns:
+            CountMinSketch: The sketch.
+
+        """
+        counters_budget: Final = memory_budget - num_candidates * BYTES_PER_ENTRY
+        width: Final = counters_budget // (depth * BYTES_PER_COUNTER)
+        if width < 1:
+            raise ValueError(
+                f"{memory_budget} bytes are too few for {num_candidates} candidates."
+            )
+        return cls(width, depth, num_candidates)
+
+    @property
+    def error_bound(self) -> float:
+        """Return the overestimate bound e * N / width of any estimate."""
+        return math.e * self.total / self.width
+
+    @property
+    def confidence(self) -> float:
+        """Return the probability 1 - exp(-depth) that the bound holds."""
+        return 1 - math.exp(-self.depth)
+
+    def update(self, keys: Iterable[str]) -> None:
+        """Count the n-grams, such as those of a document, as a batch.
+
+        Args:
+            keys (Iterable[str]): N-grams, one occurrence each.
+
+        """
+        counts: Final[dict[str, int]] = {}
+        for key in keys:
+            counts[key] = counts.get(key, 0) + 1
+        if not counts:
+            return
+
+        columns: Final = self._get_columns(list(counts))
+        np.add.at(
+            self._table,
+            (np.broadcast_to(self._rows, columns.shape), columns),
+            np.fromiter(counts.values(), dtype=np.int64, count=len(counts)),
+        )
+        self.total += sum(counts.values())
+
+        estimates: Final = self._table[self._rows, columns].min(axis=0).tolist()
+        candidates: Final = self._candidates
+        for key, estimate in zip(counts, estimates, strict=True):
+            if key in candidates.values:
+                candidates.values[key] = estimate
+            elif len(candidates) < self.num_candidates:
+                candidates.add(key, estimate)
+            elif estimate > candidates.peek_min():
+                candidates.pop_min()
+                candidates.add(key, estimate)
+
+    def estimate(self, key: str) -> int:
+        """Return the estimated count of an n-gram, never below the true one."""
+        columns: Final = self._get_columns([key])
+        return int(self._table[self._rows, columns].min())
+
+    def get_items(self) -> list[tuple[str, int, int]]:
+        """Return the candidates.
+
+        Returns:
+            list[tuple[str, int, int]]: (n-gram, estimate, error bound). The
+                true count is between `estimate - error bound` and `estimate`
+                with the probability of `confidence`.
+
+        """
+        error_bound: Final = math.ceil(self.error_bound)
+        return [
+            (key, estimate, min(estimate, error_bound))
+            for key, estimate in self._candidates.values.items()
+        ]
+
+    def format_stats(self) -> str:
+        """Format the error bounds."""
+        return (
+            f"Count-Min sketch: {self.depth}x{self.width} counters over "
+            f"{self.total} n-grams. Estimates overestimate by at most "
+            f"{self.error_bound:.1f} with probability {self.confidence:.1%}."
+        )
+
+    def _get_columns(self, keys: list[str]) -> np.ndarray:
+        # Derive the hash functions from two halves of a 64-bit hash.
+        hashes: Final = np.fromiter(
+            map(hash_key, keys), dtype=np.uint64, count=len(keys)
+        )
+        low: Final = (hashes & np.uint64(0xFFFFFFFF)).astype(np.int64)
+        high: Final = (hashes >> np.uint64(32)).astype(np.int64) | 1
+        columns: Final[np.ndarray] = (low + self._rows * high) % self.width
+        return columns
+
+
+HeavyHitterCounter = SpaceSaving | CountMinSketch
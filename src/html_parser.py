@@ -0,0 +1,122 @@
+"""Selectable HTML parser backends for the scrapers.
+
+Supported backends:
+
+    - `html.parser`: The pure-Python parser of the standard library (default).
+    - `lxml`: BeautifulSoup with the lxml builder. Requires `lxml`.
+    - `selectolax`: A fast path for listing pages which only extracts links
+      with CSS selectors. Full pages are parsed with `lxml` when it is
+      installed, otherwise with `html.parser`. Requires `selectolax`.
+
+"""
+
+import importlib.util
+from typing import Final
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+HTML_PARSER_BACKENDS: Final = ("html.parser", "lxml", "selectolax")
+
+_backend: str = "html.parser"
+
+
+def is_available(backend: str) -> bool:
+    """Return whether the packages required by the backend are installed.
+
+    Args:
+        backend (str): One of `HTML_PARSER_BACKENDS`.
+
+    Returns:
+        bool: True if the backend can be used.
+
+    """
+    if backend == "html.parser":
+        return True
+    elif backend in ["lxml", "selectolax"]:
+        return importlib.util.find_spec(backend) is not None
+    else:
+        raise ValueError(f"Unsupported HTML parser backend: {backend}")
+
+
+def set_backend(backend: str) -> None:
+    """Set the backend used by `make_soup` and `select_hrefs`.
+
+    Args:
+        backend (str): One of `HTML_PARSER_BACKENDS`.
+
+    """
+    global _backend
+
+    if not is_available(backend):
+        raise ValueError(f"HTML parser backend {backend} is not installed.")
+    _backend = backend
+
+
+def get_backend() -> str:
+    """Return the current backend."""
+    return _backend
+
+
+def make_soup(
+    html: str,
+    parse_only: SoupStrainer | None = None,
+    backend: str | None = None,
+) -> BeautifulSoup:
+    """Parse the HTML with the BeautifulSoup builder of the backend.
+
+    Args:
+        html (str): The HTML to parse.
+        parse_only (SoupStrainer | None): If given, only the matching elements
+            and their descendants are built. Defaults to None.
+        backend (str | None): The backend to use. Defaults to the current one.
+
+    Returns:
+        BeautifulSoup: The parsed document.
+
+    """
+    backend = backend or _backend
+    if backend == "selectolax":
+        # selectolax has no BeautifulSoup builder.
+        backend = "lxml" if is_available("lxml") else "html.parser"
+
+    return BeautifulSoup(html, backend, parse_only=parse_only)
+
+
+def select_hrefs(
+    html: str,
+    selector: str,
+    restrict_to_class: str | None = None,
+    backend: str | None = None,
+) -> list[str]:
+    """Return the `href` of the elements which match the CSS selector.
+
+    This is meant for listing pages with thousands of links, where building
+    the full document dominates the scraping time.
+
+    Args:
+        html (str): The HTML to parse.
+        selector (str): The CSS selector like `.ptitle > a`.
+        restrict_to_class (str | None): If given, only the elements with this
+            class and their descendants are built, so the selector must only
+            refer to them. Ignored by the selectolax backend, which is fast
+            enough to parse the full document. Defaults to None.
+        backend (str | None): The backend to use. Defaults to the current one.
+
+    Returns:
+        list[str]: The `href` of the matched elements which have one.
+
+    """
+    backend = backend or _backend
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+
+        hrefs = [
+            node.attributes.get("href") for node in LexborHTMLParser(html).css(selector)
+        ]
+        return [href for href in hrefs if href]
+
+    parse_only: Final = (
+        SoupStrainer(class_=restrict_to_class) if restrict_to_class else None
+    )
+    bs: Final = make_soup(html, parse_only=parse_only, backend=backend)
+    return [str(tag.get("href")) for tag in bs.select(selector) if tag.get("href")]
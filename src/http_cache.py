@@ -0,0 +1,183 @@
+"""Persistent on-disk cache for fetched pages.
+
+Bodies are stored gzip-compressed under the SHA-256 of their content, so the
+same page served under several URLs is stored once. Each URL has a small
+metadata entry which points to its body and keeps the validators
+(`ETag` / `Last-Modified`) used for conditional revalidation.
+
+"""
+
+import dataclasses
+import gzip
+import hashlib
+import json
+import pathlib
+import threading
+import time
+from typing import Callable, Final
+from urllib.parse import urlparse
+
+import requests
+
+from src.utils import write_atomic
+
+DEFAULT_CACHE_DIR: Final = pathlib.Path("./.cache/http")
+
+_DAY: Final = 24 * 60 * 60
+# Time in seconds during which a cached page is reused without asking the
+# host. After that the page is revalidated with a conditional request.
+DEFAULT_TTL: Final[float] = 1 * _DAY
+DEFAULT_TTL_PER_HOST: Final[dict[str, float]] = {
+    # Proceedings pages do not change once published.
+    "openaccess.thecvf.com": 30 * _DAY,
+    "papers.nips.cc": 30 * _DAY,
+    "www.ecva.net": 7 * _DAY,
+    # Accepted papers lists are updated until the proceedings are out.
+    "cvpr.thecvf.com": 0.5 * _DAY,
+}
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """Statistics of cache usage in a run."""
+
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+
+    def __str__(self) -> str:
+        """Return a one-line summary of the statistics."""
+        return (
+            f"{self.hits} hits, {self.revalidated} revalidated (304), "
+            f"{self.misses} misses, {self.bytes_saved / 1024 / 1024:.1f} MiB saved"
+        )
+
+
+class ResponseCache:
+    """Content-addressed cache of response bodies keyed by URL."""
+
+    def __init__(
+        self,
+        cache_dir: pathlib.Path = DEFAULT_CACHE_DIR,
+        ttl_per_host: dict[str, float] = DEFAULT_TTL_PER_HOST,
+        default_ttl: float = DEFAULT_TTL,
+    ) -> None:
+        """Initialize the cache. Nothing is written until the first store.
+
+        Args:
+            cache_dir (pathlib.Path): Directory to store the cache.
+            ttl_per_host (dict[str, float]): Freshness lifetime in seconds
+                for each host.
+            default_ttl (float): Freshness lifetime in seconds for hosts
+                not listed in `ttl_per_host`.
+
+        """
+        self.cache_dir: Final = cache_dir
+        self.ttl_per_host: Final = ttl_per_host
+        self.default_ttl: Final = default_ttl
+        self.stats: Final = CacheStats()
+        self._stats_lock: Final = threading.Lock()
+
+    def get_text(
+        self,
+        send: Callable[[str, dict[str, str], float], requests.Response],
+        url: str,
+        timeout: float,
+    ) -> str:
+        """Return the body of the URL, using the cache when possible.
+
+        Args:
+            send (Callable[[str, dict[str, str], float], requests.Response]):
+                The function which sends a GET request with the URL, headers
+                and timeout. Used on a cache miss or for revalidation.
+            url (str): The URL to request.
+            timeout (float): The timeout for the request.
+
+        Returns:
+            str: The decoded response body.
+
+        """
+        entry = self._load_entry(url)
+        body = self._load_body(entry) if entry is not None else None
+
+        if entry is not None and body is not None:
+            age = time.time() - entry["fetched_at"]
+            if age < self._ttl(url):
+                self._count(hits=1, bytes_saved=len(body))
+                return body.decode(entry["encoding"], errors="replace")
+
+        # Revalidate stale entry with its validators.
+        headers: dict[str, str] = {}
+        if entry is not None and body is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = send(url, headers, timeout)
+        if response.status_code == 304 and entry is not None and body is not None:
+            entry["fetched_at"] = time.time()
+            self._write_entry(url, entry)
+            self._count(revalidated=1, bytes_saved=len(body))
+            return body.decode(entry["encoding"], errors="replace")
+
+        response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes.
+        self._store(url, response)
+        self._count(misses=1)
+        return response.text
+
+    def _ttl(self, url: str) -> float:
+        return self.ttl_per_host.get(urlparse(url).netloc, self.default_ttl)
+
+    def _count(
+        self, hits: int = 0, revalidated: int = 0, misses: int = 0, bytes_saved: int = 0
+    ) -> None:
+        with self._stats_lock:
+            self.stats.hits += hits
+            self.stats.revalidated += revalidated
+            self.stats.misses += misses
+            self.stats.bytes_saved += bytes_saved
+
+    def _entry_path(self, url: str) -> pathlib.Path:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.cache_dir / "entries" / key[:2] / f"{key}.json"
+
+    def _blob_path(self, content_hash: str) -> pathlib.Path:
+        return self.cache_dir / "blobs" / content_hash[:2] / f"{content_hash}.gz"
+
+    def _load_entry(self, url: str) -> dict | None:
+        path = self._entry_path(url)
+        try:
+            with path.open("r") as f:
+                entry: dict = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def _load_body(self, entry: dict) -> bytes | None:
+        try:
+            return gzip.decompress(self._blob_path(entry["content_hash"]).read_bytes())
+        except (FileNotFoundError, OSError, EOFError):
+            return None
+
+    def _store(self, url: str, response: requests.Response) -> None:
+        content: Final = response.content
+        content_hash: Final = hashlib.sha256(content).hexdigest()
+
+        blob_path: Final = self._blob_path(content_hash)
+        if not blob_path.exists():
+            write_atomic(blob_path, gzip.compress(content))
+
+        entry: Final = {
+            "url": url,
+            "content_hash": content_hash,
+            "encoding": response.encoding or response.apparent_encoding or "utf-8",
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        self._write_entry(url, entry)
+
+    def _write_entry(self, url: str, entry: dict) -> None:
+        write_atomic(self._entry_path(url), json.dumps(entry).encode())
@@ -0,0 +1,183 @@
+"""Shared HTTP client used by all conference scrapers and the arXiv client.
+
+A single `requests.Session` is shared in the process, so connections are
+kept alive and reused for each host instead of paying TCP and TLS handshakes
+for every paper page.
+
+"""
+
+import pathlib
+import threading
+import time
+from typing import Final
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+from src.http_cache import DEFAULT_CACHE_DIR, CacheStats, ResponseCache
+from src.rate_limit import THROTTLE_STATUS_CODES, HostRateLimiter
+
+DEFAULT_TIMEOUT: Final = 10
+DEFAULT_MAX_PER_HOST: Final = 10
+# The number of host connection pools kept alive at once.
+DEFAULT_MAX_HOSTS: Final = 10
+# How many times a request answered with 429/503 is sent again.
+MAX_THROTTLE_RETRIES: Final = 5
+# gzip and deflate are always available. br (and zstd) are negotiated only
+# when the optional decoder packages are installed, otherwise the server
+# would send a body urllib3 cannot decode.
+ACCEPT_ENCODING: Final[str] = make_headers(accept_encoding=True)["accept-encoding"]
+
+_session: requests.Session | None = None
+_session_lock: Final = threading.Lock()
+# Pages fetched by `get_text` are cached on disk by default.
+_cache: ResponseCache | None = ResponseCache(DEFAULT_CACHE_DIR)
+# Every request waits for a token of its host.
+_rate_limiter: Final = HostRateLimiter()
+
+
+def create_session(
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    max_hosts: int = DEFAULT_MAX_HOSTS,
+) -> requests.Session:
+    """Create a session with keep-alive connection pools and retries.
+
+    Args:
+        max_per_host (int): The maximum number of connections kept alive for
+            a single host. Defaults to 10.
+        max_hosts (int): The number of host connection pools to keep.
+            Defaults to 10.
+
+    Returns:
+        requests.Session: The configured session.
+
+    """
+    # 429 and 503 are not retried here but in `send`, so that the rate
+    # limiter sees them and honors `Retry-After`.
+    retry_strategy = Retry(
+        total=5,  # How many times to retry.
+        status_forcelist=[500, 502, 504],  # HTTP status codes to retry.
+        allowed_methods=["HEAD", "GET", "OPTIONS"],  # HTTP methods to retry.
+        backoff_factor=1,  # A backoff factor to apply between attempts after the second try.
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=max_hosts,
+        pool_maxsize=max_per_host,
+    )
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def configure(
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    cache_dir: pathlib.Path | None = DEFAULT_CACHE_DIR,
+) -> None:
+    """Replace the shared session with one sized for the given concurrency.
+
+    Args:
+        max_per_host (int): The maximum number of concurrent connections
+            per host. Defaults to 10.
+        cache_dir (pathlib.Path | None): Directory of the page cache used by
+            `get_text`. If None, the cache is disabled.
+
+    """
+    global _session, _cache
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = create_session(max_per_host=max(max_per_host, 1))
+        _cache = ResponseCache(cache_dir) if cache_dir is not None else None
+
+
+def get_session() -> requests.Session:
+    """Return the shared session, creating it on first use."""
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def get(url: str, timeout: float = DEFAULT_TIMEOUT) -> requests.Response:
+    """Send a GET request with the shared session.
+
+    Args:
+        url (str): The URL to request.
+        timeout (float): The timeout for the request. Defaults to 10.
+
+    Returns:
+        requests.Response: The response.
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails or the
+            status code is 4xx or 5xx after retries.
+
+    """
+    response = send(url, timeout=timeout)
+    response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes.
+    return response
+
+
+def send(
+    url: str,
+    headers: dict[str, str] | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> requests.Response:
+    """Send a GET request through the shared rate limiter.
+
+    The request waits for a token of its host, and the response is reported
+    back to the limiter. Responses with 429/503 are retried after the
+    limiter slowed down, up to `MAX_THROTTLE_RETRIES` times.
+
+    Args:
+        url (str): The URL to request.
+        headers (dict[str, str] | None): Additional request headers.
+        timeout (float): The timeout for the request. Defaults to 10.
+
+    Returns:
+        requests.Response: The response. The status code is not checked.
+
+    """
+    for _ in range(MAX_THROTTLE_RETRIES + 1):
+        _rate_limiter.acquire(url)
+        start = time.monotonic()
+        response = get_session().get(url, headers=headers, timeout=timeout)
+        _rate_limiter.observe(
+            url,
+            response.status_code,
+            time.monotonic() - start,
+            response.headers.get("Retry-After"),
+        )
+        if response.status_code not in THROTTLE_STATUS_CODES:
+            break
+
+    return response
+
+
+def get_text(url: str, timeout: float = DEFAULT_TIMEOUT) -> str:
+    """Return the decoded body of the URL. The page cache is used if enabled.
+
+    Args:
+        url (str): The URL to request.
+        timeout (float): The timeout for the request. Defaults to 10.
+
+    Returns:
+        str: The response body.
+
+    """
+    if _cache is not None:
+        return _cache.get_text(send, url, timeout=timeout)
+    return get(url, timeout=timeout).text
+
+
+def get_cache_stats() -> CacheStats | None:
+    """Return the statistics of the page cache, or None if it is disabled."""
+    return _cache.stats if _cache is not None else None
@@ -0,0 +1,134 @@
+"""Append-only journal which makes scraping resumable.
+
+Every parsed paper is appended to the journal as a single JSON line as soon
+as it is available. When a scraper is restarted, the journal is replayed and
+the pages which are already done are skipped.
+
+"""
+
+import json
+import logging
+import pathlib
+import threading
+from types import TracebackType
+from typing import IO, Final
+
+from src.utils import serialize_for_json_dump
+
+logger: Final = logging.getLogger(__name__)
+
+
+def get_journal_path(output_path: pathlib.Path) -> pathlib.Path:
+    """Return the journal path which belongs to the output path.
+
+    Args:
+        output_path (pathlib.Path): The output path of the scraper.
+
+    Returns:
+        pathlib.Path: Path like `cvpr2023_papers.journal.jsonl`.
+
+    """
+    return output_path.with_name(f"{output_path.stem}.journal.jsonl")
+
+
+class ScrapeJournal:
+    """Append-only journal of completed keys (usually URLs) and their papers."""
+
+    def __init__(self, path: pathlib.Path) -> None:
+        """Replay the journal if it exists and open it for appending.
+
+        Args:
+            path (pathlib.Path): Path to the journal file.
+
+        """
+        self.path: Final = path
+        self._completed: dict[str, dict] = {}
+        self._lock: Final = threading.Lock()
+
+        self._replay()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] | None = self.path.open("a")
+
+    def __enter__(self) -> "ScrapeJournal":
+        """Return the journal itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the journal file."""
+        self.close()
+
+    def __contains__(self, key: str) -> bool:
+        """Return whether the key is already completed."""
+        return key in self._completed
+
+    def __len__(self) -> int:
+        """Return the number of completed keys."""
+        return len(self._completed)
+
+    def get(self, key: str) -> dict | None:
+        """Return the paper recorded for the key.
+
+        Args:
+            key (str): The key of the completed work.
+
+        Returns:
+            dict | None: The recorded paper, or None if the key is not found.
+
+        """
+        return self._completed.get(key)
+
+    def record(self, key: str, paper: dict) -> None:
+        """Append the completed key and its paper to the journal.
+
+        Args:
+            key (str): The key of the completed work.
+            paper (dict): The parsed paper.
+
+        """
+        line: Final = json.dumps(
+            {"key": key, "paper": paper}, default=serialize_for_json_dump
+        )
+        with self._lock:
+            if self._file is None:
+                raise ValueError(f"Journal {self.path} is already closed.")
+            # The line is written with a single call and flushed, so a crash
+            # leaves at most one incomplete line at the end of the file.
+            self._file.write(line + "\n")
+            self._file.flush()
+            self._completed[key] = paper
+
+    def close(self) -> None:
+        """Close the journal file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self) -> None:
+        """Close and delete the journal after the final output is written."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def _replay(self) -> None:
+        if not self.path.exists():
+            return
+
+        content: Final = self.path.read_bytes()
+        # Drop an incomplete last line left by a crash during the write.
+        valid_size: Final = content.rfind(b"\n") + 1
+        if valid_size != len(content):
+            with self.path.open("r+b") as f:
+                f.truncate(valid_size)
+
+        for line in content[:valid_size].decode().splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            self._completed[record["key"]] = record["paper"]
+
+        logger.info(f"Replayed {len(self._completed)} records from {self.path}.")
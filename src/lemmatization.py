@@ -0,0 +1,154 @@
+"""Memoized WordNet lemmatization with an optional on-disk cache.
+
+A corpus has millions of tokens but only tens of thousands of distinct
+words, so each distinct word is lemmatized once. The lemmas can be saved to
+a JSON file and shared across runs and conferences. WordNet is loaded only
+when a word is not cached yet.
+
+"""
+
+import fcntl
+import json
+import pathlib
+from typing import Final, Iterable
+
+from nltk.stem import WordNetLemmatizer
+
+from src.utils import write_atomic
+
+DEFAULT_LEMMA_CACHE_PATH: Final = pathlib.Path("./.cache/babel/lemmas.json")
+# The part of speech of `wordnet.NOUN`. The constant is not used to avoid
+# loading WordNet when every word is cached.
+NOUN: Final = "n"
+
+
+class CachedLemmatizer:
+    """WordNet lemmatizer which lemmatizes each distinct word once."""
+
+    def __init__(self, cache_path: pathlib.Path | None = None, pos: str = NOUN) -> None:
+        """Initialize the lemmatizer.
+
+        Args:
+            cache_path (pathlib.Path | None): JSON file to load lemmas from
+                and save them to. Defaults to None, which keeps the lemmas in
+                memory only.
+            pos (str): The part of speech used for lemmatization. Defaults to
+                noun.
+
+        """
+        self.cache_path: Final = cache_path
+        self.pos: Final = pos
+        self.hits = 0
+        self.misses = 0
+
+        self._lemmas: dict[str, str] = {}
+        self._new_lemmas: dict[str, str] = {}
+        self._lemmatizer: WordNetLemmatizer | None = None
+        if cache_path is not None and cache_path.exists():
+            self._lemmas = _load_cache(cache_path).get(pos, {})
+
+    def __reduce__(
+        self,
+    ) -> tuple[type["CachedLemmatizer"], tuple[pathlib.Path | None, str]]:
+        """Pickle only the settings, each process loads the cache by itself."""
+        return (CachedLemmatizer, (self.cache_path, self.pos))
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the ratio of tokens which were already lemmatized."""
+        total: Final = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __call__(self, tokens: Iterable[str]) -> list[str]:
+        """Lemmatize the tokens.
+
+        Args:
+            tokens (Iterable[str]): Tokens to lemmatize.
+
+        Returns:
+            list[str]: The lemmas.
+
+        """
+        return [self.lemmatize(token) for token in tokens]
+
+    def lemmatize(self, token: str) -> str:
+        """Lemmatize a token.
+
+        Args:
+            token (str): A token.
+
+        Returns:
+            str: The lemma.
+
+        """
+        lemma = self._lemmas.get(token)
+        if lemma is not None:
+            self.hits += 1
+            return lemma
+
+        self.misses += 1
+        if self._lemmatizer is None:
+            self._lemmatizer = WordNetLemmatizer()
+        new_lemma: Final[str] = self._lemmatizer.lemmatize(token, pos=self.pos)
+        self._lemmas[token] = self._new_lemmas[token] = new_lemma
+        return new_lemma
+
+    def pop_new_lemmas(self) -> dict[str, str]:
+        """Return the lemmas added since the last call and forget them as new.
+
+        Worker processes return them to the parent with `update`, so that
+        the cache file is saved once instead of by every worker.
+
+        """
+        new_lemmas: Final = self._new_lemmas
+        self._new_lemmas = {}
+        return new_lemmas
+
+    def update(self, lemmas: dict[str, str]) -> None:
+        """Add lemmas found by another process, to be saved by `save`.
+
+        Args:
+            lemmas (dict[str, str]): Lemmas returned by `pop_new_lemmas`.
+
+        """
+        for token, lemma in lemmas.items():
+            if token not in self._lemmas:
+                self._lemmas[token] = self._new_lemmas[token] = lemma
+
+    def save(self) -> None:
+        """Merge the new lemmas into the cache file, if any.
+
+        The file is re-read and written while holding an exclusive lock on
+        a sidecar `.lock` file, so lemmas saved by other processes, even at
+        the same time, are kept.
+
+        """
+        if self.cache_path is None or not self._new_lemmas:
+            return
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path: Final = self.cache_path.with_name(f"{self.cache_path.name}.lock")
+        with lock_path.open("a") as lock_file:
+            # Released when the file is closed.
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            cache: Final = (
+                _load_cache(self.cache_path) if self.cache_path.exists() else {}
+            )
+            cache.setdefault(self.pos, {}).update(self._new_lemmas)
+            write_atomic(
+                self.cache_path, json.dumps(cache, ensure_ascii=False).encode()
+            )
+        self._new_lemmas = {}
+
+    def format_stats(self) -> str:
+        """Format the hit ratio of the memo."""
+        return (
+            f"Lemma cache: {self.hit_ratio:.1%} hits "
+            f"({self.hits} hits, {self.misses} misses, {len(self._lemmas)} lemmas)."
+        )
+
+
+def _load_cache(cache_path: pathlib.Path) -> dict[str, dict[str, str]]:
+    with cache_path.open("r") as f:
+        cache: Final[dict[str, dict[str, str]]] = json.load(f)
+    return cache
@@ -0,0 +1,125 @@
+"""Content-hash manifests to skip outputs whose inputs have not changed.
+
+A manifest records the fingerprint of each output: the hash of the contents
+of its input files and of its parameters. An output is up to date when it
+exists and its fingerprint is unchanged, so touching a file without changing
+it does not cause a rebuild. File hashes are cached in the manifest by size
+and modification time, so unchanged files are not read again.
+
+"""
+
+import hashlib
+import json
+import pathlib
+from typing import Any, Final, Iterable
+
+from src.utils import write_atomic
+
+DEFAULT_MANIFEST_DIR: Final = pathlib.Path("./.cache/babel/manifests/")
+
+_VERSION: Final = 1
+
+
+def hash_file(path: pathlib.Path) -> str:
+    """Return the SHA-256 hex digest of the contents of a file."""
+    digest: Final = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Fingerprints of outputs and cached hashes of files."""
+
+    def __init__(self, path: pathlib.Path | None = None) -> None:
+        """Load the manifest.
+
+        Args:
+            path (pathlib.Path | None): JSON file to load the manifest from
+                and save it to. Defaults to None, which keeps it in memory
+                only.
+
+        """
+        self.path: Final = path
+        self._files: dict[str, dict[str, Any]] = {}
+        self._outputs: dict[str, str] = {}
+        if path is not None and path.exists():
+            with path.open("r") as f:
+                data = json.load(f)
+            if data.get("version") == _VERSION:
+                self._files = data["files"]
+                self._outputs = data["outputs"]
+
+    def hash_file(self, path: pathlib.Path) -> str:
+        """Return the hash of a file, re-reading it only if its stat changed.
+
+        Args:
+            path (pathlib.Path): Path to an existing file.
+
+        Returns:
+            str: The SHA-256 hex digest of the contents.
+
+        """
+        stat: Final = path.stat()
+        entry: Final = self._files.get(str(path))
+        if (
+            entry is not None
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+        ):
+            return str(entry["sha256"])
+
+        sha256: Final = hash_file(path)
+        self._files[str(path)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+        }
+        return sha256
+
+    def get_fingerprint(
+        self, input_paths: Iterable[pathlib.Path], params: dict[str, Any]
+    ) -> str:
+        """Return the fingerprint of an output.
+
+        Args:
+            input_paths (Iterable[pathlib.Path]): The files the output is made
+                from. Their order matters.
+            params (dict[str, Any]): JSON-serializable parameters which change
+                the output, such as a seed.
+
+        Returns:
+            str: The SHA-256 hex digest of the input hashes and parameters.
+
+        """
+        data: Final = {
+            "inputs": [self.hash_file(path) for path in input_paths],
+            "params": params,
+        }
+        return hashlib.sha256(
+            json.dumps(data, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def is_up_to_date(self, output_path: pathlib.Path, fingerprint: str) -> bool:
+        """Return whether an output exists and was made with the fingerprint."""
+        return (
+            self._outputs.get(str(output_path)) == fingerprint and output_path.exists()
+        )
+
+    def record(self, output_path: pathlib.Path, fingerprint: str) -> None:
+        """Record the fingerprint of an output which was just made."""
+        self._outputs[str(output_path)] = fingerprint
+
+    def save(self) -> None:
+        """Save the manifest atomically, if it has a path."""
+        if self.path is None:
+            return
+
+        data: Final = {
+            "version": _VERSION,
+            "files": self._files,
+            "outputs": self._outputs,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps(data, indent=1).encode())
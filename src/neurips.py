@@ -4,37 +4,83 @@ This code is for NeurIPS.
 """
 
 import logging
-from typing import Final
-
-import requests
-from bs4 import BeautifulSoup
+from typing import Final, Iterator
 
+from src import http_client
+from src.concurrency import iter_paper_pages
+from src.html_parser import make_soup, select_hrefs
+from src.journal import ScrapeJournal
 from src.utils import Paper
 
 logger: Final = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
-def get_papers(conference: str, year: int) -> list[dict]:
+def get_papers(
+    conference: str,
+    year: int,
+    workers: int = 1,
+    max_per_host: int | None = None,
+    journal: ScrapeJournal | None = None,
+) -> list[dict]:
     """Extract paper information from a list of URLs.
 
     Args:
         conference (str): The conference name.
         year (int): The year of the conference.
+        workers (int): The number of pages fetched concurrently. Defaults to 1.
+        max_per_host (int | None): The maximum number of concurrent requests
+            per host. Defaults to the number of workers.
+        journal (ScrapeJournal | None): The journal to resume from and record
+            to. Defaults to None.
 
     Returns:
         list[Paper]: A list of Paper objects.
 
     """
-    urls: Final[list[str]] = get_paper_page_urls(conference=conference, year=year)
+    return list(
+        iter_papers(
+            conference=conference,
+            year=year,
+            workers=workers,
+            max_per_host=max_per_host,
+            journal=journal,
+        )
+    )
+
+
+def iter_papers(
+    conference: str,
+    year: int,
+    workers: int = 1,
+    max_per_host: int | None = None,
+    journal: ScrapeJournal | None = None,
+) -> Iterator[dict]:
+    """Extract paper information from a list of URLs and yield each paper as
+    soon as it is parsed.
+
+    Args:
+        conference (str): The conference name.
+        year (int): The year of the conference.
+        workers (int): The number of pages fetched concurrently. Defaults to 1.
+        max_per_host (int | None): The maximum number of concurrent requests
+            per host. Defaults to the number of workers.
+        journal (ScrapeJournal | None): The journal to resume from and record
+            to. Defaults to None.
 
-    papers: list[dict] = list()
-    for i, url in enumerate(urls):
-        logger.info(f"Processing {i+1}/{len(urls)}: {url}")
-        paper = parse_paper_page(url)
-        papers.append(paper.model_dump())
+    Yields:
+        dict: A paper dict.
 
-    return papers
+    """
+    urls: Final[list[str]] = get_paper_page_urls(conference=conference, year=year)
+
+    yield from iter_paper_pages(
+        urls,
+        parse_paper_page,
+        workers=workers,
+        max_per_host=max_per_host,
+        journal=journal,
+    )
 
 
 def get_paper_page_urls(conference: str, year: int) -> list[str]:
@@ -50,15 +96,14 @@ def get_paper_page_urls(conference: str, year: int) -> list[str]:
     cc_root_url: Final[str] = "https://papers.nips.cc"
     cc_all_paper_url: Final = cc_root_url + f"/paper_files/paper/{year}"
 
-    html: Final = requests.get(cc_all_paper_url).text
-    bs: Final = BeautifulSoup(html, "html.parser")
+    html: Final = http_client.get_text(cc_all_paper_url)
     if year == 2022 or year == 2023:
-        parsed_tags = bs.select(
-            "div.container-fluid div.col ul.paper-list li.conference a"
+        hrefs = select_hrefs(
+            html, "div.container-fluid div.col ul.paper-list li.conference a"
         )
     else:
-        parsed_tags = bs.select("div.container-fluid div.col ul.paper-list li a")
-    return [cc_root_url + parsed_tag.get("href") for parsed_tag in parsed_tags]
+        hrefs = select_hrefs(html, "div.container-fluid div.col ul.paper-list li a")
+    return [cc_root_url + href for href in hrefs]
 
 
 def validate_conference(conference: str, year: int) -> str:
@@ -96,8 +141,8 @@ def parse_paper_page(page_url: str) -> Paper:
     Returns:
         Paper: The Paper object which stores the paper information.
     """
-    html: Final[str] = requests.get(page_url).text
-    bs: Final = BeautifulSoup(html, "html.parser")
+    html: Final[str] = http_client.get_text(page_url)
+    bs: Final = make_soup(html)
 
     title: Final[str] = (
         bs.select_one("div.container-fluid div.col h4").text.strip()
@@ -0,0 +1,255 @@
+"""Read and write paper files in JSON, JSON Lines or columnar format.
+
+The JSON Lines formats write one paper per line as soon as it is parsed, and
+can be compressed with gzip or zstd (zstd requires the optional `zstandard`
+package). The format is chosen from the file suffix:
+
+    - `.json`: A single indented JSON array (default).
+    - `.jsonl`: JSON Lines.
+    - `.jsonl.gz`: gzip-compressed JSON Lines.
+    - `.jsonl.zst`: zstd-compressed JSON Lines.
+    - `.corpus`: A memory-mapped columnar store, see `src.corpus_store`.
+
+"""
+
+import gzip
+import io
+import json
+import logging
+import os
+import pathlib
+import re
+from types import TracebackType
+from typing import IO, Final, Iterator, cast
+
+from pydantic_core import to_json
+
+from src.corpus_store import CorpusStore, write_corpus
+from src.utils import serialize_for_json_dump, write_atomic
+
+logger: Final = logging.getLogger(__name__)
+
+PAPER_FORMATS: Final = ("json", "jsonl", "jsonl.gz", "jsonl.zst", "corpus")
+# Formats from the most preferred when a corpus exists in several formats.
+# Converted and compressed files are derived from JSON, and faster to read.
+_FORMAT_PREFERENCE: Final = ("corpus", "jsonl.zst", "jsonl.gz", "jsonl", "json")
+
+_CORPUS_STEM_PATTERN: Final = re.compile(r"^([a-z]+?)(\d{4})_papers$")
+
+
+def get_paper_format(path: pathlib.Path) -> str:
+    """Return the paper format of the path from its suffixes.
+
+    Args:
+        path (pathlib.Path): Path to a paper file.
+
+    Returns:
+        str: One of `PAPER_FORMATS`.
+
+    """
+    for paper_format in sorted(PAPER_FORMATS, key=len, reverse=True):
+        if path.name.endswith(f".{paper_format}"):
+            return paper_format
+
+    raise ValueError(f"Unsupported paper file: {path}")
+
+
+def get_stem(path: pathlib.Path) -> str:
+    """Return the file name without the paper format suffixes.
+
+    Args:
+        path (pathlib.Path): Path to a paper file like `cvpr2023_papers.jsonl.gz`.
+
+    Returns:
+        str: The stem like `cvpr2023_papers`.
+
+    """
+    return path.name.removesuffix(f".{get_paper_format(path)}")
+
+
+def parse_corpus_stem(stem: str) -> tuple[str, int] | None:
+    """Return the conference and year of a corpus stem.
+
+    Args:
+        stem (str): The stem of a paper file like `cvprw2023_papers`.
+
+    Returns:
+        tuple[str, int] | None: The conference and year like ("cvprw", 2023),
+            or None if the stem does not follow the naming of the corpora.
+
+    """
+    match: Final = _CORPUS_STEM_PATTERN.match(stem)
+    return (match[1], int(match[2])) if match else None
+
+
+def glob_paper_files(directory: pathlib.Path) -> list[pathlib.Path]:
+    """Return the paper files in the directory in any supported format.
+
+    A corpus saved in several formats, e.g. after `convert_corpus.py` or a
+    scrape with another `--format`, is returned once, so that it is neither
+    counted twice nor analyzed by two jobs writing the same CSV. The format
+    which comes first in `corpus`, `jsonl.zst`, `jsonl.gz`, `jsonl`, `json`
+    is used.
+
+    Args:
+        directory (pathlib.Path): Directory to search.
+
+    Returns:
+        list[pathlib.Path]: Sorted paths of paper files with unique stems.
+
+    """
+    paths_by_stem: Final[dict[str, pathlib.Path]] = {}
+    for paper_format in _FORMAT_PREFERENCE:
+        for path in sorted(directory.glob(f"*.{paper_format}")):
+            stem = get_stem(path)
+            if stem in paths_by_stem:
+                logger.warning(f"{path} is ignored for {paths_by_stem[stem]}.")
+            else:
+                paths_by_stem[stem] = path
+    return sorted(paths_by_stem.values())
+
+
+def iter_papers(path: pathlib.Path) -> Iterator[dict]:
+    """Yield paper dicts from a paper file in any supported format.
+
+    Args:
+        path (pathlib.Path): Path to a paper file.
+
+    Yields:
+        dict: A paper dict.
+
+    """
+    paper_format: Final = get_paper_format(path)
+    if paper_format == "json":
+        with path.open("r") as f:
+            yield from json.load(f)
+        return
+    elif paper_format == "corpus":
+        with CorpusStore(path) as store:
+            yield from store.iter_papers()
+        return
+
+    with _open_binary(path, paper_format, "rb") as f:
+        for line in io.TextIOWrapper(f, encoding="utf-8"):
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_papers(path: pathlib.Path) -> list[dict]:
+    """Load paper dicts from a paper file in any supported format.
+
+    Args:
+        path (pathlib.Path): Path to a paper file.
+
+    Returns:
+        list[dict]: A list of paper dicts.
+
+    """
+    return list(iter_papers(path))
+
+
+class PaperWriter:
+    """Write papers to a file in the format given by the file suffix.
+
+    JSON Lines outputs are streamed to a temporary file next to the output
+    path as each paper is written. JSON and corpus outputs are written at
+    once when the writer is closed. In all cases the output path appears only
+    after all papers are written, by an atomic rename.
+
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        """Open the writer.
+
+        Args:
+            path (pathlib.Path): The output path.
+
+        """
+        self.path: Final = path
+        self.paper_format: Final = get_paper_format(path)
+        self.count = 0
+
+        self._papers: list[dict] = []
+        self._tmp_path: Final = path.with_name(f".{path.name}.partial")
+        self._file: IO[bytes] | None = None
+        if self.paper_format not in ["json", "corpus"]:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = _open_binary(self._tmp_path, self.paper_format, "wb")
+
+    def __enter__(self) -> "PaperWriter":
+        """Return the writer itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Commit the output on success, otherwise discard it."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, paper: dict) -> None:
+        """Write a paper.
+
+        Args:
+            paper (dict): A paper dict. Pydantic URL objects are serialized
+                by pydantic-core without a Python callback.
+
+        """
+        if self._file is not None:
+            self._file.write(to_json(paper) + b"\n")
+        else:
+            self._papers.append(paper)
+        self.count += 1
+
+    def close(self) -> None:
+        """Finish writing and move the output to the final path."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.replace(self._tmp_path, self.path)
+        elif self.paper_format == "json":
+            write_atomic(
+                self.path,
+                json.dumps(
+                    self._papers, indent=4, default=serialize_for_json_dump
+                ).encode(),
+            )
+        elif self.paper_format == "corpus":
+            write_corpus(self.path, self._papers)
+
+    def abort(self) -> None:
+        """Discard the partially written output."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def _open_binary(path: pathlib.Path, paper_format: str, mode: str) -> IO[bytes]:
+    if paper_format == "jsonl":
+        return path.open(mode)
+    elif paper_format == "jsonl.gz":
+        return gzip.open(path, mode)  # type: ignore[return-value]
+    elif paper_format == "jsonl.zst":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ValueError(
+                "zstd-compressed paper files require the `zstandard` package."
+            ) from e
+
+        f = path.open(mode)
+        if mode == "rb":
+            return cast(
+                IO[bytes], zstandard.ZstdDecompressor().stream_reader(f, closefd=True)
+            )
+        return cast(
+            IO[bytes], zstandard.ZstdCompressor().stream_writer(f, closefd=True)
+        )
+    else:
+        raise ValueError(f"{paper_format} is not a binary paper format.")
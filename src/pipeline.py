@@ -0,0 +1,478 @@
+"""Incremental pipeline from paper files to word clouds.
+
+The stages scrape -> analyze -> adjust -> wordcloud are modeled as a DAG of
+nodes. Each node is a function call which reads input files and writes
+output files, and an edge joins the node writing a file to the nodes reading
+it. A node runs only if the fingerprint of its inputs and parameters in the
+manifest (see `src.manifest`) has changed, and independent nodes run in
+parallel on a process pool.
+
+Fingerprints use the contents of the files, so a node whose outputs come out
+the same as before does not make its dependents run. For example, editing
+`exact_match_stopwords.txt` re-runs every adjust node, but only the word
+clouds whose adjusted CSV actually changed.
+
+"""
+
+import dataclasses
+import graphlib
+import logging
+import pathlib
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Final, Iterable
+
+from wordcloud import __version__ as wordcloud_version
+
+from src.analysis import (
+    ADJUSTED_FREQUENCY_DIR,
+    EXACT_MATCH_STOPWORDS_PATH,
+    PARTIAL_MATCH_STOPWORDS_PATH,
+    RAW_FREQUENCY_DIR,
+    adjust_frequency_analysis_result,
+    analyze_word_frequency,
+    get_adjusted_frequency_path,
+    get_raw_frequency_path,
+)
+from src.batch import BatchJob, BatchResult, run_job
+from src.frequencies import Normalizer, get_default_normalizer
+from src.frequency_state import get_normalizer_fingerprint
+from src.lemmatization import DEFAULT_LEMMA_CACHE_PATH, CachedLemmatizer
+from src.manifest import DEFAULT_MANIFEST_DIR, Manifest
+from src.paper_io import get_stem, glob_paper_files
+from src.wordclouds import (
+    DEFAULT_WORDCLOUD_DIR,
+    WORDCLOUD_PARAMS,
+    generate_wordcloud_from_csv,
+    get_wordcloud_path,
+)
+
+logger: Final = logging.getLogger(__name__)
+
+DEFAULT_PIPELINE_MANIFEST_PATH: Final = DEFAULT_MANIFEST_DIR / "pipeline.json"
+
+
+@dataclasses.dataclass(frozen=True)
+class PipelineNode:
+    """A function call which makes output files from input files.
+
+    The function and its arguments must be picklable to run on a process
+    pool, so the function must be defined at the top level of a module.
+
+    """
+
+    name: str
+    func: Callable[..., Any]
+    kwargs: dict[str, Any]
+    inputs: tuple[pathlib.Path, ...]
+    outputs: tuple[pathlib.Path, ...]
+    # JSON-serializable parameters which change the outputs, in addition to
+    # the contents of the inputs.
+    params: dict[str, Any] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass(frozen=True)
+class NodeResult:
+    """The outcome of a node.
+
+    The status is one of "done", "up-to-date", "failed", "blocked" when a
+    dependency failed, or "outdated" in a dry run.
+
+    """
+
+    name: str
+    status: str
+    elapsed: float = 0.0
+    error: str | None = None
+
+
+def _scrape(**kwargs: Any) -> None:
+    # Imported only when scraping, since it loads the HTTP and HTML stacks.
+    from src.scripts.scrape_conference_page import scrape_conference_page
+
+    scrape_conference_page(**kwargs)
+
+
+def _analyze(lemma_cache_path: pathlib.Path | None, **kwargs: Any) -> dict[str, str]:
+    # The lemmas are returned instead of saved, so that the scheduler saves
+    # them once instead of every node rewriting the cache file.
+    lemmatizer: Final = CachedLemmatizer(lemma_cache_path)
+    analyze_word_frequency(**kwargs, lemmatizer=lemmatizer, save_lemmas=False)
+    return lemmatizer.pop_new_lemmas()
+
+
+def build_scrape_nodes(
+    conferences: Iterable[tuple[str, int]],
+    paper_dir: pathlib.Path = pathlib.Path("./data/json"),
+    workers: int = 1,
+) -> list[PipelineNode]:
+    """Build the nodes to scrape conferences.
+
+    A scrape node has no input file, so it runs only if its paper file does
+    not exist yet or was not scraped by the pipeline with the same conference
+    and year.
+
+    Args:
+        conferences (Iterable[tuple[str, int]]): Conferences and years like
+            [("cvpr", 2024)].
+        paper_dir (pathlib.Path): Directory to save the paper files.
+        workers (int): The number of pages fetched concurrently per node.
+
+    Returns:
+        list[PipelineNode]: The nodes.
+
+    """
+    return [
+        PipelineNode(
+            name=f"scrape {conference}{year}",
+            func=_scrape,
+            kwargs={
+                "output_dir": paper_dir,
+                "conference": conference,
+                "year": year,
+                "workers": workers,
+            },
+            inputs=(),
+            outputs=(paper_dir / f"{conference}{year}_papers.json",),
+            params={"conference": conference, "year": year},
+        )
+        for conference, year in conferences
+    ]
+
+
+def build_wordcloud_nodes(
+    paper_paths: Iterable[pathlib.Path],
+    until_ngram: int = 3,
+    seeds: Iterable[int] = (42,),
+    normalizer: Normalizer | None = None,
+    exact_match_stopwords_path: pathlib.Path = EXACT_MATCH_STOPWORDS_PATH,
+    partial_match_stopwords_path: pathlib.Path = PARTIAL_MATCH_STOPWORDS_PATH,
+    minimum_count: int = 6,
+    raw_frequency_dir: pathlib.Path = RAW_FREQUENCY_DIR,
+    adjusted_frequency_dir: pathlib.Path = ADJUSTED_FREQUENCY_DIR,
+    wordcloud_dir: pathlib.Path = DEFAULT_WORDCLOUD_DIR,
+    lemma_cache_path: pathlib.Path | None = DEFAULT_LEMMA_CACHE_PATH,
+) -> list[PipelineNode]:
+    """Build the analyze, adjust and wordcloud nodes of paper files.
+
+    Each paper file is analyzed with titles only, and with abstracts in
+    addition to titles, like the `run_all_*` scripts.
+
+    Args:
+        paper_paths (Iterable[pathlib.Path]): Paths to paper files. They may
+            be outputs of scrape nodes.
+        until_ngram (int): The maximum n of the n-grams.
+        seeds (Iterable[int]): Random seeds of the word clouds.
+        normalizer (Normalizer | None): The normalizer of the analysis. Its
+            stopwords are part of the fingerprint. Defaults to
+            `get_default_normalizer()`.
+        exact_match_stopwords_path (pathlib.Path): A txt file which includes
+            exact match stopwords.
+        partial_match_stopwords_path (pathlib.Path): A txt file which includes
+            partial match stopwords.
+        minimum_count (int): Minimum count of n-gram in the adjusted result.
+        raw_frequency_dir (pathlib.Path): Root directory of the raw
+            frequencies.
+        adjusted_frequency_dir (pathlib.Path): Root directory of the adjusted
+            frequencies.
+        wordcloud_dir (pathlib.Path): Directory of the word cloud images.
+        lemma_cache_path (pathlib.Path | None): JSON file to cache lemmas
+            across nodes. The new lemmas of the nodes are saved once by
+            `run_pipeline`. The lemmas do not change the outputs.
+
+    Returns:
+        list[PipelineNode]: The nodes.
+
+    """
+    normalizer = normalizer or get_default_normalizer()
+    normalizer_fingerprint: Final = get_normalizer_fingerprint(normalizer)
+    nodes: Final = []
+    for paper_path in paper_paths:
+        for use_abstract in [False, True]:
+            raw_path = get_raw_frequency_path(
+                paper_path, use_abstract, until_ngram, raw_frequency_dir
+            )
+            nodes.append(
+                PipelineNode(
+                    name=f"analyze {raw_path.name}",
+                    func=_analyze,
+                    kwargs={
+                        "input_path": paper_path,
+                        "use_abstract": use_abstract,
+                        "until_ngram": until_ngram,
+                        "output_root_dir": raw_frequency_dir,
+                        "normalizer": normalizer,
+                        "lemma_cache_path": lemma_cache_path,
+                    },
+                    inputs=(paper_path,),
+                    outputs=(raw_path,),
+                    params={
+                        "use_abstract": use_abstract,
+                        "until_ngram": until_ngram,
+                        "normalizer": normalizer_fingerprint,
+                    },
+                )
+            )
+
+            adjusted_path = get_adjusted_frequency_path(
+                raw_path, adjusted_frequency_dir
+            )
+            nodes.append(
+                PipelineNode(
+                    name=f"adjust {adjusted_path.name}",
+                    func=adjust_frequency_analysis_result,
+                    kwargs={
+                        "input_path": raw_path,
+                        "output_dir": adjusted_frequency_dir,
+                        "exact_match_stopwords_path": exact_match_stopwords_path,
+                        "partial_match_stopwords_path": partial_match_stopwords_path,
+                        "minimum_count": minimum_count,
+                    },
+                    inputs=(
+                        raw_path,
+                        exact_match_stopwords_path,
+                        partial_match_stopwords_path,
+                    ),
+                    outputs=(adjusted_path,),
+                    params={"minimum_count": minimum_count},
+                )
+            )
+
+            for seed in seeds:
+                image_path = get_wordcloud_path(adjusted_path, seed, wordcloud_dir)
+                nodes.append(
+                    PipelineNode(
+                        name=f"wordcloud {image_path.name}",
+                        func=generate_wordcloud_from_csv,
+                        kwargs={
+                            "csv_path": adjusted_path,
+                            "image_save_path": image_path,
+                            "seed": seed,
+                        },
+                        inputs=(adjusted_path,),
+                        outputs=(image_path,),
+                        params={
+                            **WORDCLOUD_PARAMS,
+                            "seed": seed,
+                            "wordcloud": wordcloud_version,
+                        },
+                    )
+                )
+    return nodes
+
+
+def build_pipeline(
+    paper_dir: pathlib.Path = pathlib.Path("./data/json"),
+    scrape: Iterable[tuple[str, int]] = (),
+    **kwargs: Any,
+) -> list[PipelineNode]:
+    """Build the nodes of all paper files of a directory.
+
+    Args:
+        paper_dir (pathlib.Path): Directory of the paper files.
+        scrape (Iterable[tuple[str, int]]): Conferences and years to scrape
+            into `paper_dir` first. Defaults to none.
+        **kwargs: Keyword arguments of `build_wordcloud_nodes`.
+
+    Returns:
+        list[PipelineNode]: The nodes.
+
+    """
+    scrape_nodes: Final = build_scrape_nodes(scrape, paper_dir)
+    # A scraped file replaces an existing corpus of the same stem in another
+    # format, so that each corpus is analyzed once.
+    paper_paths_by_stem: Final = {
+        get_stem(path): path for path in glob_paper_files(paper_dir)
+    }
+    for node in scrape_nodes:
+        paper_paths_by_stem[get_stem(node.outputs[0])] = node.outputs[0]
+    paper_paths: Final = sorted(paper_paths_by_stem.values())
+    return scrape_nodes + build_wordcloud_nodes(paper_paths, **kwargs)
+
+
+def _get_dependencies(nodes: list[PipelineNode]) -> dict[str, set[str]]:
+    producers: Final[dict[pathlib.Path, str]] = {}
+    for node in nodes:
+        for output in node.outputs:
+            if output in producers:
+                raise ValueError(
+                    f"{output} is made by both {producers[output]} and {node.name}."
+                )
+            producers[output] = node.name
+    return {
+        node.name: {producers[path] for path in node.inputs if path in producers}
+        for node in nodes
+    }
+
+
+def run_pipeline(
+    nodes: list[PipelineNode],
+    num_jobs: int = 1,
+    manifest_path: pathlib.Path | None = DEFAULT_PIPELINE_MANIFEST_PATH,
+    force: bool = False,
+    dry_run: bool = False,
+) -> list[NodeResult]:
+    """Run the outdated nodes in the order of their dependencies.
+
+    The new lemmas returned by the analyze nodes are merged in this process
+    and saved to the lemma cache once, after the nodes finish.
+
+    Args:
+        nodes (list[PipelineNode]): The nodes. Their names must be unique.
+        num_jobs (int): The number of worker processes. 1 runs the nodes one
+            after another in the current process. Defaults to 1.
+        manifest_path (pathlib.Path | None): Manifest of the fingerprints.
+            Defaults to the one in the cache directory. None runs every node.
+        force (bool): Whether to run every node. Defaults to False.
+        dry_run (bool): Whether to only report the nodes which would run.
+            The dependents of such a node are reported as outdated too.
+
+    Returns:
+        list[NodeResult]: The results in the order of the nodes.
+
+    """
+    if num_jobs < 1:
+        raise ValueError(f"num_jobs must be positive, got {num_jobs}.")
+
+    nodes_by_name: Final = {node.name: node for node in nodes}
+    if len(nodes_by_name) != len(nodes):
+        raise ValueError("Node names must be unique.")
+    dependencies: Final = _get_dependencies(nodes)
+    sorter: Final = graphlib.TopologicalSorter(dependencies)
+    sorter.prepare()
+
+    manifest: Final = Manifest(manifest_path)
+    results: Final[dict[str, NodeResult]] = {}
+    fingerprints: Final[dict[str, str]] = {}
+    pool: Final = (
+        ProcessPoolExecutor(max_workers=num_jobs)
+        if num_jobs > 1 and not dry_run
+        else None
+    )
+    running: Final[dict[Future[BatchResult], str]] = {}
+    # Lemmatizers which merge the new lemmas of the nodes by cache path.
+    lemmatizers: Final[dict[pathlib.Path, CachedLemmatizer]] = {}
+
+    def collect(name: str, result: BatchResult) -> NodeResult:
+        node = nodes_by_name[name]
+        lemma_cache_path = node.kwargs.get("lemma_cache_path")
+        if node.func is _analyze and result.ok and lemma_cache_path is not None:
+            if lemma_cache_path not in lemmatizers:
+                lemmatizers[lemma_cache_path] = CachedLemmatizer(lemma_cache_path)
+            lemmatizers[lemma_cache_path].update(result.output)
+        return _to_node_result(result)
+
+    def finish(name: str, result: NodeResult) -> None:
+        results[name] = result
+        if result.status == "done":
+            for output in nodes_by_name[name].outputs:
+                manifest.record(output, fingerprints[name])
+            # Save after each node, so an interrupted run keeps its progress.
+            manifest.save()
+        if result.status in ["done", "failed"]:
+            status = result.status if result.status == "done" else "FAILED"
+            logger.info(f"[{len(results)}/{len(nodes)}] {name} {status}")
+        sorter.done(name)
+
+    try:
+        while sorter.is_active():
+            for name in sorter.get_ready():
+                node = nodes_by_name[name]
+                upstream = {
+                    results[dependency].status for dependency in dependencies[name]
+                }
+                if upstream & {"failed", "blocked"}:
+                    finish(name, NodeResult(name, "blocked"))
+                    continue
+                if "outdated" in upstream:
+                    finish(name, NodeResult(name, "outdated"))
+                    continue
+
+                missing = [path for path in node.inputs if not path.exists()]
+                if missing:
+                    finish(
+                        name, NodeResult(name, "failed", error=f"Missing {missing}.")
+                    )
+                    continue
+
+                fingerprints[name] = manifest.get_fingerprint(
+                    node.inputs,
+                    {"func": node.func.__qualname__, "params": node.params},
+                )
+                if not force and all(
+                    manifest.is_up_to_date(output, fingerprints[name])
+                    for output in node.outputs
+                ):
+                    finish(name, NodeResult(name, "up-to-date"))
+                    continue
+                if dry_run:
+                    finish(name, NodeResult(name, "outdated"))
+                    continue
+
+                for output in node.outputs:
+                    output.parent.mkdir(parents=True, exist_ok=True)
+                if pool is None:
+                    finish(name, collect(name, run_job(_to_job(node))))
+                else:
+                    running[pool.submit(run_job, _to_job(node))] = name
+
+            if running:
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    name = running.pop(future)
+                    try:
+                        result = collect(name, future.result())
+                    except Exception:
+                        # The worker died, e.g. killed by the OOM killer.
+                        result = NodeResult(
+                            name, "failed", error=traceback.format_exc()
+                        )
+                    finish(name, result)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        manifest.save()
+        for lemmatizer in lemmatizers.values():
+            lemmatizer.save()
+
+    return [results[node.name] for node in nodes]
+
+
+def _to_job(node: PipelineNode) -> BatchJob:
+    return BatchJob(name=node.name, func=node.func, kwargs=node.kwargs)
+
+
+def _to_node_result(result: BatchResult) -> NodeResult:
+    return NodeResult(
+        name=result.name,
+        status="done" if result.ok else "failed",
+        elapsed=result.elapsed,
+        error=result.error,
+    )
+
+
+def format_pipeline_summary(results: list[NodeResult], elapsed: float) -> str:
+    """Format the counts of each status and the errors of a run.
+
+    Args:
+        results (list[NodeResult]): Results returned by `run_pipeline`.
+        elapsed (float): Wall-clock time of the run in seconds.
+
+    Returns:
+        str: A multi-line summary.
+
+    """
+    counts: Final[dict[str, int]] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    lines: Final = [
+        f"{len(results)} nodes in {elapsed:.1f}s: "
+        + ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+        + "."
+    ]
+    for result in results:
+        if result.status == "outdated":
+            lines.append(f"  outdated: {result.name}")
+        elif result.status == "failed":
+            lines.append(f"Failed: {result.name}\n{result.error}")
+    return "\n".join(lines)
@@ -0,0 +1,179 @@
+"""Adaptive per-host rate limiter shared by all scrapers and the arXiv client.
+
+Each host has a token bucket. Its rate increases additively while the host
+answers quickly, and decreases multiplicatively when the latency rises or
+the host answers 429/503. `Retry-After` pauses the host until that time.
+
+"""
+
+import dataclasses
+import email.utils
+import threading
+import time
+from typing import Callable, Final
+from urllib.parse import urlparse
+
+THROTTLE_STATUS_CODES: Final = (429, 503)
+
+
+@dataclasses.dataclass(frozen=True)
+class HostPolicy:
+    """Rate limits of a host in requests per second."""
+
+    initial_rate: float = 5.0
+    min_rate: float = 0.2
+    max_rate: float = 50.0
+    # The number of requests which can be sent at once after an idle time.
+    burst: float = 5.0
+    # Latency in seconds above which the host is regarded as overloaded.
+    slow_latency: float = 5.0
+
+
+DEFAULT_HOST_POLICY: Final = HostPolicy()
+DEFAULT_HOST_POLICIES: Final[dict[str, HostPolicy]] = {
+    # arXiv asks API users to send no more than one request every 3 seconds.
+    # https://info.arxiv.org/help/api/tou.html
+    "export.arxiv.org": HostPolicy(
+        initial_rate=1 / 3, min_rate=1 / 60, max_rate=1 / 3, burst=1
+    ),
+}
+
+
+@dataclasses.dataclass
+class TokenBucket:
+    """Token bucket of a single host."""
+
+    policy: HostPolicy
+    rate: float
+    tokens: float
+    updated_at: float
+    blocked_until: float = 0.0
+
+
+class HostRateLimiter:
+    """Token bucket rate limiter with one adaptive bucket per host."""
+
+    def __init__(
+        self,
+        policies: dict[str, HostPolicy] = DEFAULT_HOST_POLICIES,
+        default_policy: HostPolicy = DEFAULT_HOST_POLICY,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            policies (dict[str, HostPolicy]): Policies for specific hosts.
+            default_policy (HostPolicy): Policy for the other hosts.
+            clock (Callable[[], float]): Monotonic clock in seconds.
+            sleep (Callable[[float], None]): Function to sleep for seconds.
+
+        """
+        self.policies: Final = policies
+        self.default_policy: Final = default_policy
+        self._clock: Final = clock
+        self._sleep: Final = sleep
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock: Final = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to the host of the URL is allowed.
+
+        Args:
+            url (str): The URL to be requested.
+
+        Returns:
+            float: The time waited in seconds.
+
+        """
+        with self._lock:
+            now = self._clock()
+            bucket = self._get_bucket(urlparse(url).netloc, now)
+            self._refill(bucket, now)
+            # Reserve a token. A negative balance is the queue of waiting
+            # requests, so concurrent callers are spaced by the rate after
+            # the host is unblocked.
+            bucket.tokens -= 1
+            wait = (
+                max(bucket.blocked_until - now, 0.0)
+                + max(-bucket.tokens, 0.0) / bucket.rate
+            )
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def observe(
+        self,
+        url: str,
+        status_code: int,
+        latency: float,
+        retry_after: str | None = None,
+    ) -> None:
+        """Adjust the rate of the host from a response.
+
+        Args:
+            url (str): The requested URL.
+            status_code (int): The status code of the response.
+            latency (float): The time in seconds until the response arrived.
+            retry_after (str | None): The `Retry-After` header, if any.
+
+        """
+        with self._lock:
+            now = self._clock()
+            bucket = self._get_bucket(urlparse(url).netloc, now)
+            policy = bucket.policy
+
+            if status_code in THROTTLE_STATUS_CODES:
+                bucket.rate = max(policy.min_rate, bucket.rate / 2)
+                bucket.tokens = min(bucket.tokens, 0.0)
+                delay = parse_retry_after(retry_after) if retry_after else None
+                if delay is not None:
+                    bucket.blocked_until = max(bucket.blocked_until, now + delay)
+            elif latency > policy.slow_latency:
+                bucket.rate = max(policy.min_rate, bucket.rate * 0.8)
+            elif status_code < 400:
+                step = (policy.max_rate - policy.min_rate) / 100
+                bucket.rate = min(policy.max_rate, bucket.rate + step)
+
+    def get_rate(self, url: str) -> float:
+        """Return the current rate of the host of the URL in requests per second."""
+        with self._lock:
+            return self._get_bucket(urlparse(url).netloc, self._clock()).rate
+
+    def _get_bucket(self, host: str, now: float) -> TokenBucket:
+        if host not in self._buckets:
+            policy = self.policies.get(host, self.default_policy)
+            self._buckets[host] = TokenBucket(
+                policy=policy,
+                rate=policy.initial_rate,
+                tokens=policy.burst,
+                updated_at=now,
+            )
+        return self._buckets[host]
+
+    def _refill(self, bucket: TokenBucket, now: float) -> None:
+        # No tokens are added while the host is blocked.
+        elapsed = max(now - max(bucket.updated_at, bucket.blocked_until), 0.0)
+        bucket.tokens = min(bucket.policy.burst, bucket.tokens + elapsed * bucket.rate)
+        bucket.updated_at = now
+
+
+def parse_retry_after(retry_after: str) -> float | None:
+    """Parse the `Retry-After` header in seconds or as an HTTP date.
+
+    Args:
+        retry_after (str): The header value.
+
+    Returns:
+        float | None: Seconds to wait, or None if the value is invalid.
+
+    """
+    if retry_after.strip().isdigit():
+        return float(retry_after)
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
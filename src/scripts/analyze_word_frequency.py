@@ -2,20 +2,25 @@
 
 if __name__ == "__main__":
     import argparse
-    import csv
-    import json
     import pathlib
     from typing import Final
 
-    import nltk
-    from nltk.corpus import wordnet
-    from nltk.stem import WordNetLemmatizer
-
-    from src.frequencies import get_ngrams, remove_stopwords, sort_frequency_dict
-    from src.utils import PartialPaper
+    from src.analysis import (
+        EXACT_MATCH_STOPWORDS_PATH,
+        PARTIAL_MATCH_STOPWORDS_PATH,
+        analyze_word_frequency,
+        download_nltk_data,
+        load_ngram_filter,
+    )
+    from src.frequencies import build_normalizer
+    from src.frequency_state import (
+        DEFAULT_STATE_DIR,
+        analyze_word_frequency_incremental,
+    )
+    from src.heavy_hitters import CountMinSketch, SpaceSaving
+    from src.lemmatization import DEFAULT_LEMMA_CACHE_PATH, CachedLemmatizer
 
-    nltk.download("wordnet")
-    nltk.download("punkt")
+    download_nltk_data()
 
     # Parse command line arguments.
     parser: Final = argparse.ArgumentParser()
@@ -23,7 +28,7 @@ if __name__ == "__main__":
         "--input-path",
         "-i",
         type=pathlib.Path,
-        help="An input JSON file path.",
+        help="An input JSON/JSONL file path.",
     )
     parser.add_argument(
         "--use-abstract",
@@ -37,67 +42,136 @@ if __name__ == "__main__":
         default=3,
         help="Calculate word frequency up to n-gram. Default is 2-gram.",
     )
+    parser.add_argument(
+        "--stopwords-path",
+        type=pathlib.Path,
+        action="append",
+        help="A txt file which includes additional stopwords. Can be repeated. "
+        "Default is ./data/stopwords.txt.",
+    )
+    parser.add_argument(
+        "--lemma-cache-path",
+        type=pathlib.Path,
+        default=DEFAULT_LEMMA_CACHE_PATH,
+        help="A JSON file to cache lemmas across runs.",
+    )
+    parser.add_argument(
+        "--no-lemma-cache",
+        action="store_true",
+        help="Do not load or save the lemma cache.",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=1,
+        help="The number of worker processes to count shards of papers.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Update the result from the saved state with only the added and "
+        "removed papers. `--workers` is ignored.",
+    )
+    parser.add_argument(
+        "--state-dir",
+        type=pathlib.Path,
+        default=DEFAULT_STATE_DIR,
+        help="Directory to save the states of incremental analysis.",
+    )
+    parser.add_argument(
+        "--adjust",
+        action="store_true",
+        help="Apply the minimum count and the exact and partial match stopwords "
+        "while counting, and save the adjusted frequency instead of the raw one.",
+    )
+    parser.add_argument(
+        "--exact-match-stopwords-path",
+        type=pathlib.Path,
+        default=EXACT_MATCH_STOPWORDS_PATH,
+        help="A txt file which includes exact match stopwords. Used with --adjust.",
+    )
+    parser.add_argument(
+        "--partial-match-stopwords-path",
+        type=pathlib.Path,
+        default=PARTIAL_MATCH_STOPWORDS_PATH,
+        help="A txt file which includes partial match stopwords. Used with "
+        "--adjust.",
+    )
+    parser.add_argument(
+        "--minimum-count",
+        "-m",
+        type=int,
+        default=6,
+        help="Minimum count of n-gram to be included in the result. Used with "
+        "--adjust.",
+    )
+    parser.add_argument(
+        "--top-k",
+        "-k",
+        type=int,
+        help="Save only the k most frequent n-grams, selected with a heap.",
+    )
+    parser.add_argument(
+        "--counting",
+        choices=["exact", "space-saving", "count-min"],
+        default="exact",
+        help="Count exactly, or approximately in fixed memory with SpaceSaving or "
+        "a Count-Min sketch. Approximate counts are upper bounds and their error "
+        "bounds are printed. Default is exact.",
+    )
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=float,
+        default=64,
+        help="Memory budget of approximate counting in MiB. Default is 64.",
+    )
     args = parser.parse_args()
+    if args.incremental and (args.counting != "exact" or args.top_k is not None):
+        parser.error("--incremental keeps exact counts of all n-grams.")
 
-    # Check if input file exists.
-    if not args.input_path.exists():
-        raise FileNotFoundError(f"{args.input_path} does not exist.")
-
-    # Specify output path.
-    output_root_dir: Final = pathlib.Path("./outputs/raw_frequency/")
-    if args.use_abstract:
-        output_path: pathlib.Path = (
-            output_root_dir
-            / "title_and_abstract"
-            / f"{args.input_path.stem}_title_and_abstract_{args.until_ngram}gram.csv"
+    normalizer: Final = build_normalizer(args.stopwords_path)
+    lemmatizer: Final = CachedLemmatizer(
+        None if args.no_lemma_cache else args.lemma_cache_path
+    )
+    ngram_filter: Final = (
+        load_ngram_filter(
+            args.exact_match_stopwords_path,
+            args.partial_match_stopwords_path,
+            args.minimum_count,
         )
-    else:
-        output_path: pathlib.Path = (  # type: ignore[no-redef]
-            output_root_dir
-            / "title_only"
-            / f"{args.input_path.stem}_title_only_{args.until_ngram}gram.csv"
+        if args.adjust
+        else None
+    )
+    memory_budget: Final = int(args.memory_budget_mb * 2**20)
+    heavy_hitter_counter: Final = (
+        SpaceSaving.from_memory_budget(memory_budget)
+        if args.counting == "space-saving"
+        else CountMinSketch.from_memory_budget(
+            memory_budget, num_candidates=args.top_k or 1000
         )
-
-    # Create output directory if not exists.
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Load papers from JSON file.
-    with args.input_path.open("r") as f:
-        papers: list[PartialPaper] = [
-            PartialPaper.model_validate(p) for p in json.load(f)
-        ]
-
-    # Concat all titles and abstructs.
-    all_title = " ".join([paper.title for paper in papers])
-    all_abstract = " ".join(
-        [paper.abstract if paper.abstract else "" for paper in papers]
+        if args.counting == "count-min"
+        else None
     )
-    source_text = all_title + " " + all_abstract if args.use_abstract else all_title
-
-    # Tokenize source text. Lowercase all tokens for lemmatization.
-    tokens: Final = [token.lower() for token in nltk.word_tokenize(source_text)]
-
-    # Lemmatize tokens. Only nouns are considered.
-    lemmatizer: Final = WordNetLemmatizer()
-    lemmatized_tokens: Final = [
-        lemmatizer.lemmatize(token, pos=wordnet.NOUN) for token in tokens
-    ]
-
-    # Remove stopwords.
-    filtered_tokens = remove_stopwords(lemmatized_tokens)
-
-    # Calculate word frequency.
-    frequency_dict: dict[str, int] = {}
-    for n in range(1, args.until_ngram + 1):
-        frequency_dict.update(get_ngrams(filtered_tokens, n))
-
-    frequency_dict = sort_frequency_dict(frequency_dict)
-
-    # Save word frequency as CSV file.
-    with output_path.open("w", newline="") as f:
-        writer: Final = csv.writer(f)
-        writer.writerow(["word", "count"])
-        for key, value in frequency_dict.items():
-            writer.writerow([key, value])
-
-    print(f"Word frequency is saved as {output_path}.")
+    if args.incremental:
+        analyze_word_frequency_incremental(
+            args.input_path,
+            args.use_abstract,
+            args.until_ngram,
+            state_dir=args.state_dir,
+            normalizer=normalizer,
+            lemmatizer=lemmatizer,
+            ngram_filter=ngram_filter,
+        )
+    else:
+        analyze_word_frequency(
+            args.input_path,
+            args.use_abstract,
+            args.until_ngram,
+            normalizer=normalizer,
+            lemmatizer=lemmatizer,
+            workers=args.workers,
+            ngram_filter=ngram_filter,
+            top_k=args.top_k,
+            heavy_hitter_counter=heavy_hitter_counter,
+        )
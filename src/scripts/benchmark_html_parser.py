@@ -0,0 +1,107 @@
+"""Benchmark the listing page parse time for each HTML parser backend."""
+
+import argparse
+import pathlib
+import statistics
+import time
+from typing import Final
+
+from src import http_client
+from src.html_parser import HTML_PARSER_BACKENDS, is_available, select_hrefs
+
+
+def benchmark_listing_parse(
+    html: str,
+    selector: str,
+    restrict_to_class: str,
+    repeat: int = 5,
+) -> list[tuple[str, str, int, float]]:
+    """Measure the time to extract paper links from a listing page.
+
+    Args:
+        html (str): The HTML of the listing page.
+        selector (str): The CSS selector of paper links.
+        restrict_to_class (str): The class used by the restricted-parse mode.
+        repeat (int): The number of measurements for each setting.
+            Defaults to 5.
+
+    Returns:
+        list[tuple[str, str, int, float]]: Tuples of the backend, the parse
+            mode, the number of extracted links and the median time in
+            seconds.
+
+    """
+    results: list[tuple[str, str, int, float]] = []
+    for backend in HTML_PARSER_BACKENDS:
+        if not is_available(backend):
+            print(f"Skip {backend} because it is not installed.")
+            continue
+
+        # selectolax always parses the full document.
+        modes = ["full"] if backend == "selectolax" else ["full", "restricted"]
+        for mode in modes:
+            elapsed: list[float] = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                hrefs = select_hrefs(
+                    html,
+                    selector,
+                    restrict_to_class=restrict_to_class
+                    if mode == "restricted"
+                    else None,
+                    backend=backend,
+                )
+                elapsed.append(time.perf_counter() - start)
+            results.append((backend, mode, len(hrefs), statistics.median(elapsed)))
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="https://openaccess.thecvf.com/CVPR2023?day=all",
+        help="A listing page URL to benchmark.",
+    )
+    parser.add_argument(
+        "--input-path",
+        "-i",
+        type=pathlib.Path,
+        default=None,
+        help="A saved listing page HTML. If given, it is used instead of the URL.",
+    )
+    parser.add_argument(
+        "--selector",
+        type=str,
+        default=".ptitle > a",
+        help="The CSS selector of paper links. Use `dt.ptitle a` for ECVA.",
+    )
+    parser.add_argument(
+        "--restrict-to-class",
+        type=str,
+        default="ptitle",
+        help="The class of the elements built in the restricted-parse mode.",
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        default=5,
+        help="The number of measurements for each setting.",
+    )
+    args = parser.parse_args()
+
+    html: Final = (
+        args.input_path.read_text()
+        if args.input_path is not None
+        else http_client.get_text(args.url)
+    )
+    print(f"Listing page size: {len(html) / 1024 / 1024:.1f} MiB")
+
+    print(f"{'backend':<12} {'mode':<11} {'links':>6} {'median [ms]':>12}")
+    for backend, mode, count, seconds in benchmark_listing_parse(
+        html, args.selector, args.restrict_to_class, args.repeat
+    ):
+        print(f"{backend:<12} {mode:<11} {count:>6} {seconds * 1000:>12.1f}")
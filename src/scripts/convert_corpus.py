@@ -0,0 +1,53 @@
+"""Convert paper files to memory-mapped columnar corpus stores."""
+
+import pathlib
+from typing import Final
+
+from src.corpus_store import write_corpus
+from src.paper_io import get_stem, glob_paper_files, iter_papers
+
+
+def convert_to_corpus(
+    input_path: pathlib.Path, output_dir: pathlib.Path
+) -> pathlib.Path:
+    """Convert a paper file to a corpus store.
+
+    Args:
+        input_path (pathlib.Path): Path to a paper file in any supported format.
+        output_dir (pathlib.Path): Directory to save the corpus store.
+
+    Returns:
+        pathlib.Path: Path to the corpus store like
+            `<output_dir>/cvpr2023_papers.corpus`.
+
+    """
+    output_path: Final = output_dir / f"{get_stem(input_path)}.corpus"
+    count: Final = write_corpus(output_path, iter_papers(input_path))
+    print(f"{count} papers of {input_path} are saved as {output_path}.")
+    return output_path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--input-dir",
+        "-i",
+        type=pathlib.Path,
+        default="./data/json",
+        help="An input diectory path where JSON/JSONL files are placed.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        "-o",
+        type=pathlib.Path,
+        default="./data/corpus",
+        help="Output directory to save corpus stores.",
+    )
+    args = parser.parse_args()
+
+    for input_path in glob_paper_files(args.input_dir):
+        if input_path.name.endswith(".corpus"):
+            continue
+        convert_to_corpus(input_path, args.output_dir)
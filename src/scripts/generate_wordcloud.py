@@ -1,97 +1,17 @@
 """Generate word cloud image from paper title and abstract."""
 
-import csv
-import json
-import pathlib
-from typing import Final, Set
-
-from wordcloud import WordCloud
-
-from src.utils import Paper
-
-
-def generate_wordcloud_from_json(
-    json_path: pathlib.Path,
-    image_save_path: pathlib.Path,
-    stopwords: Set[str],
-    seed: int,
-    use_abstract: bool = False,
-) -> None:
-    """Generate word cloud. All features like Tokenizer or Lemmatizer
-    are comming from WordCloud library.
-
-    Args:
-        json_path (pathlib.Path): Path to the JSON file which
-            includes paper information.
-        image_save_path (pathlib.Path): Path to save the generated word
-            cloud image.
-        stopwords (Set[str]): Set of stopwords.
-        seed (int): Random seed for reproducibility.
-        use_abstract (bool): Whether to use abstract in addition to
-            title. Defaults to False.
-
-    """
-    # Load papers from JSON file.
-    with json_path.open("r") as f:
-        papers: list[Paper] = [Paper.model_validate(p) for p in json.load(f)]
-
-    # Concat all titles and abstructs.
-    all_title = " ".join([paper.title for paper in papers])
-    all_abstract = " ".join([paper.abstract for paper in papers])
-    source_text = all_title + " " + all_abstract if use_abstract else all_title
-
-    wordcloud: Final = WordCloud(
-        width=1600,
-        height=800,
-        max_font_size=120,
-        min_font_size=12,
-        background_color="black",
-        stopwords=stopwords,
-        random_state=seed,
-    ).generate(source_text)
-    wordcloud.to_file(str(image_save_path))
-
-    print(f"Word cloud image is saved at {image_save_path}.")
-
-
-def generate_wordcloud_from_csv(
-    csv_path: pathlib.Path,
-    image_save_path: pathlib.Path,
-    seed: int,
-) -> None:
-    """Generate word cloud from CSV file.
-
-    Args:
-        csv_path (pathlib.Path): Path to the CSV file which includes
-            text data.
-        image_save_path (pathlib.Path): Path to save the generated word
-            cloud image.
-        seed (int): Random seed for reproducibility.
-
-    """
-    # Load frequency data from CSV file.
-    with csv_path.open("r") as f:
-        reader = csv.reader(f)
-        _ = next(reader)  # Skip header.
-        frequency_dict: dict[str, int] = {row[0]: int(row[1]) for row in reader}
-
-    # Generate word cloud.
-    wordcloud: Final = WordCloud(
-        width=1600,
-        height=800,
-        max_font_size=120,
-        min_font_size=12,
-        background_color="black",
-        random_state=seed,
-    )
-    wordcloud.generate_from_frequencies(frequency_dict)
-    wordcloud.to_file(str(image_save_path))
-
-    print(f"Word cloud image is saved at {image_save_path}.")
-
-
 if __name__ == "__main__":
     import argparse
+    import pathlib
+
+    from src.paper_io import PAPER_FORMATS, get_stem
+    from src.wordclouds import (
+        LAYOUT_SUFFIX,
+        generate_wordcloud_from_csv,
+        generate_wordcloud_from_json,
+        get_layout_path,
+        render_wordcloud_layout,
+    )
 
     parser = argparse.ArgumentParser()
 
@@ -99,7 +19,7 @@ if __name__ == "__main__":
         "--input-path",
         "-i",
         type=pathlib.Path,
-        help="An input JSON/CSV file path.",
+        help="An input JSON/CSV file path, or a layout saved with --save-layout.",
     )
     parser.add_argument(
         "--output-dir",
@@ -126,6 +46,23 @@ if __name__ == "__main__":
         action="store_true",
         help="Use abstracts in addition to titles.",
     )
+    parser.add_argument(
+        "--save-layout",
+        action="store_true",
+        help=f"Save the layout of a CSV word cloud as {LAYOUT_SUFFIX} next to the "
+        "image to render it again without placing the words.",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        action="append",
+        help="Scale to render a layout at. Can be repeated. Default is 1.",
+    )
+    parser.add_argument(
+        "--svg",
+        action="store_true",
+        help="Render a layout as SVG instead of PNG.",
+    )
     args = parser.parse_args()
 
     # Check if input file exists.
@@ -135,14 +72,31 @@ if __name__ == "__main__":
     # Create output directory if not exists.
     args.output_dir.mkdir(parents=True, exist_ok=True)
 
-    if args.input_path.suffix == ".csv":
+    if args.input_path.name.endswith(LAYOUT_SUFFIX):
+        layout_stem = args.input_path.name.removesuffix(LAYOUT_SUFFIX)
+        if args.svg:
+            render_wordcloud_layout(
+                args.input_path, args.output_dir / f"{layout_stem}.svg"
+            )
+        for scale in args.scale or ([] if args.svg else [1.0]):
+            render_wordcloud_layout(
+                args.input_path,
+                args.output_dir / f"{layout_stem}_scale={scale:g}.png",
+                scale,
+            )
+
+    elif args.input_path.suffix == ".csv":
+        image_save_path = (
+            args.output_dir / f"{args.input_path.stem}_seed={args.seed}.png"
+        )
         generate_wordcloud_from_csv(
             args.input_path,
-            args.output_dir / f"{args.input_path.stem}_seed={args.seed}.png",
+            image_save_path,
             args.seed,
+            get_layout_path(image_save_path) if args.save_layout else None,
         )
 
-    elif args.input_path.suffix == ".json":
+    elif any(args.input_path.name.endswith(f".{f}") for f in PAPER_FORMATS):
         # Load stopwords.
         stopwords = set()
         with args.stopwords_path.open("r") as f:
@@ -151,7 +105,7 @@ if __name__ == "__main__":
 
         generate_wordcloud_from_json(
             args.input_path,
-            args.output_dir / f"{args.input_path.stem}_seed={args.seed}.png",
+            args.output_dir / f"{get_stem(args.input_path)}_seed={args.seed}.png",
             stopwords,
             args.seed,
             args.use_abstract,
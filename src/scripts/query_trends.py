@@ -0,0 +1,113 @@
+"""Build the keyword trend matrix and query time series and top movers."""
+
+if __name__ == "__main__":
+    import argparse
+    import pathlib
+    import time
+    from typing import Final
+
+    from src.analysis import RAW_FREQUENCY_DIR
+    from src.trends import (
+        DEFAULT_TREND_MATRIX_DIR,
+        build_trend_matrix,
+        load_trend_matrix,
+        save_trend_matrix,
+    )
+
+    parser: Final = argparse.ArgumentParser()
+    parser.add_argument(
+        "--matrix-path",
+        "-m",
+        type=pathlib.Path,
+        default=DEFAULT_TREND_MATRIX_DIR / "title_only.npz",
+        help="Path to the trend matrix.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Build the trend matrix.")
+    build_parser.add_argument(
+        "--frequency-dir",
+        "-i",
+        type=pathlib.Path,
+        default=RAW_FREQUENCY_DIR / "title_only",
+        help="A directory path where raw frequency CSV files are placed.",
+    )
+    build_parser.add_argument(
+        "--paper-dir",
+        type=pathlib.Path,
+        default="./data/json",
+        help="A directory path where paper files are placed to count papers.",
+    )
+    build_parser.add_argument(
+        "--until-ngram",
+        "-n",
+        type=int,
+        default=3,
+        help="Use the CSV files of word frequency up to n-gram. Default is 3-gram.",
+    )
+    build_parser.add_argument(
+        "--adjusted",
+        action="store_true",
+        help="Use the adjusted CSV files instead of the raw ones.",
+    )
+
+    series_parser = subparsers.add_parser(
+        "series", help="Show rates per 1,000 papers by conference and year."
+    )
+    series_parser.add_argument("terms", nargs="+", help="Lowercased n-grams.")
+
+    movers_parser = subparsers.add_parser(
+        "movers", help="Show the terms whose rate changed the most."
+    )
+    movers_parser.add_argument("year_from", type=int)
+    movers_parser.add_argument("year_to", type=int)
+    movers_parser.add_argument(
+        "--conference",
+        "-c",
+        action="append",
+        help="Conferences to aggregate. Can be repeated. Default is all.",
+    )
+    movers_parser.add_argument("--top-k", "-k", type=int, default=20)
+    movers_parser.add_argument("--min-count", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        matrix = build_trend_matrix(
+            args.frequency_dir, args.paper_dir, args.until_ngram, args.adjusted
+        )
+        save_trend_matrix(args.matrix_path, matrix)
+        print(
+            f"{len(matrix)} terms x {len(matrix.conferences)} corpora are saved "
+            f"as {args.matrix_path}."
+        )
+
+    else:
+        start = time.perf_counter()
+        matrix = load_trend_matrix(args.matrix_path)
+        loaded = time.perf_counter()
+
+        if args.command == "series":
+            for term in args.terms:
+                print(term)
+                for conference, rates in sorted(matrix.get_series(term).items()):
+                    values = ", ".join(
+                        f"{year}: {rate:.2f}" for year, rate in sorted(rates.items())
+                    )
+                    print(f"  {conference:<8} {values}")
+        else:
+            movers = matrix.get_top_movers(
+                args.year_from,
+                args.year_to,
+                args.conference,
+                args.top_k,
+                args.min_count,
+            )
+            for term, rate_from, rate_to in movers:
+                print(
+                    f"{rate_to - rate_from:+9.2f}  {rate_from:8.2f} -> {rate_to:8.2f}  {term}"
+                )
+
+        print(
+            f"Loaded in {(loaded - start) * 1000:.1f} ms, "
+            f"queried in {(time.perf_counter() - loaded) * 1000:.1f} ms."
+        )
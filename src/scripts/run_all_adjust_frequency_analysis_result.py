@@ -1,9 +1,20 @@
 if __name__ == "__main__":
     import argparse
+    import logging
     import pathlib
-    import subprocess
+    import time
     from typing import Final
 
+    from src.analysis import (
+        ADJUSTED_FREQUENCY_DIR,
+        EXACT_MATCH_STOPWORDS_PATH,
+        PARTIAL_MATCH_STOPWORDS_PATH,
+        adjust_frequency_analysis_result,
+    )
+    from src.batch import BatchJob, format_summary, run_batch
+
+    logging.basicConfig(level=logging.INFO)
+
     parser: Final = argparse.ArgumentParser()
     parser.add_argument(
         "--input-dir",
@@ -13,33 +24,56 @@ if __name__ == "__main__":
         help="An input diectory path where CSV files are placed.",
     )
     parser.add_argument(
-        "--script-path",
+        "--output-dir",
+        "-o",
+        type=pathlib.Path,
+        default=ADJUSTED_FREQUENCY_DIR,
+        help="Output directory to save adjusted CSV files.",
+    )
+    parser.add_argument(
+        "--exact-match-stopwords-path",
         type=pathlib.Path,
-        default="./src/scripts/adjust_frequency_analysis_result.py",
-        help="A path to the script to run. Default is `./src/scripts/adjust_frequency_analysis_result.py`.",
+        default=EXACT_MATCH_STOPWORDS_PATH,
+        help="A txt file which includes exact match stopwords.",
+    )
+    parser.add_argument(
+        "--partial-match-stopwords-path",
+        type=pathlib.Path,
+        default=PARTIAL_MATCH_STOPWORDS_PATH,
+        help="A txt file which includes partial match stopwords.",
+    )
+    parser.add_argument(
+        "--minimum-count",
+        "-m",
+        type=int,
+        default=6,
+        help="Minimum count of n-gram to be included in the result.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="The number of worker processes. Default is 1.",
     )
     args = parser.parse_args()
 
-    # Glob JSON files in the input directory.
-    csv_paths = args.input_dir.glob("*/*.csv")
-    for csv_path in csv_paths:
-        print(f"{csv_path} is being processed...")
-
-        try:
-            # Run the script with the specified arguments.
-            result = subprocess.run(
-                ["poetry", "run", "python3", args.script_path, "-i", csv_path],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            print("Standard Output:\n", result.stdout)
-
-        except subprocess.CalledProcessError as e:
-            # Print error message if the script fails.
-            print("An error occurred while running the script.")
-            print("Return Code:", e.returncode)
-            print("Standard Output:\n", e.stdout)
-            print("Standard Error:\n", e.stderr)
+    # Glob CSV files in the input directory.
+    jobs: Final = [
+        BatchJob(
+            name=str(csv_path),
+            func=adjust_frequency_analysis_result,
+            kwargs={
+                "input_path": csv_path,
+                "output_dir": args.output_dir,
+                "exact_match_stopwords_path": args.exact_match_stopwords_path,
+                "partial_match_stopwords_path": args.partial_match_stopwords_path,
+                "minimum_count": args.minimum_count,
+            },
+        )
+        for csv_path in sorted(args.input_dir.glob("*/*.csv"))
+    ]
 
-    print("All CSV files have been processed.")
+    start: Final = time.perf_counter()
+    results: Final = run_batch(jobs, num_jobs=args.jobs)
+    print(format_summary(results, time.perf_counter() - start))
@@ -1,9 +1,22 @@
 if __name__ == "__main__":
     import argparse
+    import logging
     import pathlib
-    import subprocess
+    import time
     from typing import Final
 
+    from src.analysis import (
+        analyze_word_frequency,
+        download_nltk_data,
+        load_ngram_filter,
+    )
+    from src.batch import BatchJob, format_summary, run_batch
+    from src.frequencies import build_normalizer
+    from src.lemmatization import DEFAULT_LEMMA_CACHE_PATH, CachedLemmatizer
+    from src.paper_io import glob_paper_files
+
+    logging.basicConfig(level=logging.INFO)
+
     parser: Final = argparse.ArgumentParser()
     parser.add_argument(
         "--input-dir",
@@ -20,60 +33,65 @@ if __name__ == "__main__":
         help="Calculate word frequency up to n-gram. Default is 2-gram.",
     )
     parser.add_argument(
-        "--script-path",
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="The number of worker processes. Default is 1.",
+    )
+    parser.add_argument(
+        "--stopwords-path",
+        type=pathlib.Path,
+        action="append",
+        help="A txt file which includes additional stopwords. Can be repeated. "
+        "Default is ./data/stopwords.txt.",
+    )
+    parser.add_argument(
+        "--lemma-cache-path",
         type=pathlib.Path,
-        default="./src/scripts/analyze_word_frequency.py",
-        help="A path to the script to run. Default is `./src/scripts/analyze_word_frequency.py`.",
+        default=DEFAULT_LEMMA_CACHE_PATH,
+        help="A JSON file to cache lemmas across runs.",
+    )
+    parser.add_argument(
+        "--no-lemma-cache",
+        action="store_true",
+        help="Do not load or save the lemma cache.",
+    )
+    parser.add_argument(
+        "--adjust",
+        action="store_true",
+        help="Save the adjusted frequencies directly with the default stopwords "
+        "and minimum count, instead of the raw ones.",
     )
     args = parser.parse_args()
 
-    # Glob JSON files in the input directory.
-    json_paths = args.input_dir.glob("*.json")
-    for json_path in json_paths:
-        print(f"{json_path} is being processed...")
-
-        # Use titles only.
-        try:
-            # Run the script with the specified arguments.
-            result = subprocess.run(
-                ["poetry", "run", "python3", args.script_path, "-i", json_path],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            print("Standard Output:\n", result.stdout)
-
-        except subprocess.CalledProcessError as e:
-            # Print error message if the script fails.
-            print("An error occurred while running the script.")
-            print("Return Code:", e.returncode)
-            print("Standard Output:\n", e.stdout)
-            print("Standard Error:\n", e.stderr)
-
-        # Use abstracts in addition to titles.
-        try:
-            # Run the script with the specified arguments.
-            result = subprocess.run(
-                [
-                    "poetry",
-                    "run",
-                    "python3",
-                    args.script_path,
-                    "-i",
-                    json_path,
-                    "--use-abstract",
-                ],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            print("Standard Output:\n", result.stdout)
+    # Download NLTK data once, workers read it from disk.
+    download_nltk_data()
+    # Build the normalizer once, it is pickled to the workers.
+    normalizer: Final = build_normalizer(args.stopwords_path)
+    ngram_filter: Final = load_ngram_filter() if args.adjust else None
 
-        except subprocess.CalledProcessError as e:
-            # Print error message if the script fails.
-            print("An error occurred while running the script.")
-            print("Return Code:", e.returncode)
-            print("Standard Output:\n", e.stdout)
-            print("Standard Error:\n", e.stderr)
+    # Glob JSON/JSONL files in the input directory. Each file is analyzed with
+    # titles only, and with abstracts in addition to titles.
+    jobs: Final = [
+        BatchJob(
+            name=f"{json_path} ({'title_and_abstract' if use_abstract else 'title_only'})",
+            func=analyze_word_frequency,
+            kwargs={
+                "input_path": json_path,
+                "use_abstract": use_abstract,
+                "until_ngram": args.until_ngram,
+                "normalizer": normalizer,
+                "lemmatizer": CachedLemmatizer(
+                    None if args.no_lemma_cache else args.lemma_cache_path
+                ),
+                "ngram_filter": ngram_filter,
+            },
+        )
+        for json_path in glob_paper_files(args.input_dir)
+        for use_abstract in [False, True]
+    ]
 
-    print("All JSON files have been processed.")
+    start: Final = time.perf_counter()
+    results: Final = run_batch(jobs, num_jobs=args.jobs)
+    print(format_summary(results, time.perf_counter() - start))
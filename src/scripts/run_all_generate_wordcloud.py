@@ -1,9 +1,15 @@
 if __name__ == "__main__":
     import argparse
+    import logging
     import pathlib
-    import subprocess
+    import time
     from typing import Final
 
+    from src.batch import format_summary
+    from src.wordclouds import DEFAULT_WORDCLOUD_MANIFEST_PATH, render_wordclouds
+
+    logging.basicConfig(level=logging.INFO)
+
     parser: Final = argparse.ArgumentParser()
     parser.add_argument(
         "--input-dir",
@@ -13,33 +19,47 @@ if __name__ == "__main__":
         help="An input diectory path where CSV files are placed.",
     )
     parser.add_argument(
-        "--script-path",
+        "--output-dir",
+        "-o",
         type=pathlib.Path,
-        default="./src/scripts/generate_wordcloud.py",
-        help="A path to the script to run. Default is `./src/scripts/generate_wordcloud.py`.",
+        default="./outputs/wordcloud",
+        help="Output directory to save generated wordcloud images.",
+    )
+    parser.add_argument(
+        "--seed",
+        "-s",
+        type=int,
+        action="append",
+        help="Random seed for reproducibility. Can be repeated. Default is 42.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="The number of worker processes. Default is 1.",
+    )
+    parser.add_argument(
+        "--manifest-path",
+        type=pathlib.Path,
+        default=DEFAULT_WORDCLOUD_MANIFEST_PATH,
+        help="A JSON file to record rendered images to skip unchanged ones.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Render all images even if their CSVs and parameters are unchanged.",
     )
     args = parser.parse_args()
 
     # Glob CSV files in the input directory.
-    csv_paths = args.input_dir.glob("*/*.csv")
-    for csv_path in csv_paths:
-        print(f"{csv_path} is being processed...")
-
-        try:
-            # Run the script with the specified arguments.
-            result = subprocess.run(
-                ["poetry", "run", "python3", args.script_path, "-i", csv_path],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            print("Standard Output:\n", result.stdout)
-
-        except subprocess.CalledProcessError as e:
-            # Print error message if the script fails.
-            print("An error occurred while running the script.")
-            print("Return Code:", e.returncode)
-            print("Standard Output:\n", e.stdout)
-            print("Standard Error:\n", e.stderr)
-
-    print("All CSV files have been processed.")
+    start: Final = time.perf_counter()
+    results: Final = render_wordclouds(
+        sorted(args.input_dir.glob("*/*.csv")),
+        args.seed or [42],
+        args.output_dir,
+        num_jobs=args.jobs,
+        manifest_path=args.manifest_path,
+        force=args.force,
+    )
+    print(format_summary(results, time.perf_counter() - start))
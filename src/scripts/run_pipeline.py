@@ -0,0 +1,144 @@
+if __name__ == "__main__":
+    import argparse
+    import logging
+    import pathlib
+    import time
+    from typing import Final
+
+    from src.analysis import (
+        EXACT_MATCH_STOPWORDS_PATH,
+        PARTIAL_MATCH_STOPWORDS_PATH,
+        download_nltk_data,
+    )
+    from src.frequencies import build_normalizer
+    from src.lemmatization import DEFAULT_LEMMA_CACHE_PATH
+    from src.pipeline import (
+        DEFAULT_PIPELINE_MANIFEST_PATH,
+        build_pipeline,
+        format_pipeline_summary,
+        run_pipeline,
+    )
+
+    logging.basicConfig(level=logging.INFO)
+
+    def parse_conference(value: str) -> tuple[str, int]:
+        """Parse CONFERENCE:YEAR like cvpr:2024."""
+        conference, _, year = value.partition(":")
+        if not conference or not year.isdigit():
+            raise argparse.ArgumentTypeError(f"Expected CONFERENCE:YEAR, got {value}.")
+        return conference, int(year)
+
+    parser: Final = argparse.ArgumentParser(
+        description="Make word clouds from paper files, re-running only the "
+        "steps whose inputs, stopwords or parameters changed."
+    )
+    parser.add_argument(
+        "--input-dir",
+        "-i",
+        type=pathlib.Path,
+        default="./data/json",
+        help="An input diectory path where JSON files are placed.",
+    )
+    parser.add_argument(
+        "--scrape",
+        type=parse_conference,
+        action="append",
+        default=[],
+        metavar="CONFERENCE:YEAR",
+        help="Scrape a conference into the input directory first, e.g. "
+        "cvpr:2024. Can be repeated.",
+    )
+    parser.add_argument(
+        "--until-ngram",
+        "-n",
+        type=int,
+        default=3,
+        help="Calculate word frequency up to n-gram. Default is 3-gram.",
+    )
+    parser.add_argument(
+        "--seed",
+        "-s",
+        type=int,
+        action="append",
+        help="Random seed of the word clouds. Can be repeated. Default is 42.",
+    )
+    parser.add_argument(
+        "--stopwords-path",
+        type=pathlib.Path,
+        action="append",
+        help="A txt file which includes additional stopwords. Can be repeated. "
+        "Default is ./data/stopwords.txt.",
+    )
+    parser.add_argument(
+        "--exact-match-stopwords-path",
+        type=pathlib.Path,
+        default=EXACT_MATCH_STOPWORDS_PATH,
+        help="A txt file which includes exact match stopwords.",
+    )
+    parser.add_argument(
+        "--partial-match-stopwords-path",
+        type=pathlib.Path,
+        default=PARTIAL_MATCH_STOPWORDS_PATH,
+        help="A txt file which includes partial match stopwords.",
+    )
+    parser.add_argument(
+        "--minimum-count",
+        type=int,
+        default=6,
+        help="Minimum count of n-gram in the adjusted result. Default is 6.",
+    )
+    parser.add_argument(
+        "--lemma-cache-path",
+        type=pathlib.Path,
+        default=DEFAULT_LEMMA_CACHE_PATH,
+        help="A JSON file to cache lemmas across runs.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="The number of worker processes. Default is 1.",
+    )
+    parser.add_argument(
+        "--manifest-path",
+        type=pathlib.Path,
+        default=DEFAULT_PIPELINE_MANIFEST_PATH,
+        help="A JSON file to record the fingerprints of the outputs.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run all steps even if their inputs and parameters are unchanged.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only print the steps which would run.",
+    )
+    args = parser.parse_args()
+
+    if not args.dry_run:
+        # Download NLTK data once, workers read it from disk.
+        download_nltk_data()
+
+    nodes: Final = build_pipeline(
+        args.input_dir,
+        scrape=args.scrape,
+        until_ngram=args.until_ngram,
+        seeds=args.seed or [42],
+        normalizer=build_normalizer(args.stopwords_path),
+        exact_match_stopwords_path=args.exact_match_stopwords_path,
+        partial_match_stopwords_path=args.partial_match_stopwords_path,
+        minimum_count=args.minimum_count,
+        lemma_cache_path=args.lemma_cache_path,
+    )
+    start: Final = time.perf_counter()
+    results: Final = run_pipeline(
+        nodes,
+        num_jobs=args.jobs,
+        manifest_path=args.manifest_path,
+        force=args.force,
+        dry_run=args.dry_run,
+    )
+    print(format_pipeline_summary(results, time.perf_counter() - start))
@@ -3,35 +3,58 @@ the selected conference.
 """
 
 import argparse
-import json
+import functools
 import logging
 import pathlib
-from typing import Final, Iterable
+from typing import Callable, Final, Iterator
 
-from src import cvf, cvf_ws, eccv, neurips
-from src.utils import serialize_for_json_dump
+from src import cvf, cvf_ws, eccv, html_parser, http_client, neurips
+from src.http_cache import DEFAULT_CACHE_DIR
+from src.journal import ScrapeJournal, get_journal_path
+from src.paper_io import PAPER_FORMATS, PaperWriter
 
 logger: Final = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
 def scrape_conference_page(
-    output_dir: pathlib.Path, conference: str, year: int
+    output_dir: pathlib.Path,
+    conference: str,
+    year: int,
+    workers: int = 1,
+    max_per_host: int | None = None,
+    cache_dir: pathlib.Path | None = DEFAULT_CACHE_DIR,
+    paper_format: str = "json",
+    html_parser_backend: str = "html.parser",
 ) -> None:
     """Scrape conference page to extract paper information and save it
-    as JSON file. Output file name is `{conference}{year}_papers.json`.
+    as JSON file. Output file name is `{conference}{year}_papers.{paper_format}`.
 
     Args:
         output_dir (str): Output directory to save the JSON file.
         conference (str): The conference name.
         year (int): The year of the conference.
+        workers (int): The number of pages fetched concurrently. Defaults to 1.
+        max_per_host (int | None): The maximum number of concurrent requests
+            per host. Defaults to the number of workers.
+        cache_dir (pathlib.Path | None): Directory to cache fetched pages.
+            If None, the cache is disabled.
+        paper_format (str): The output format, one of `PAPER_FORMATS`. JSON
+            Lines formats are written paper by paper. Defaults to "json".
+        html_parser_backend (str): The HTML parser backend, one of
+            `HTML_PARSER_BACKENDS`. Defaults to "html.parser".
 
     """
     # Define output path.
-    output_path: Final = output_dir / f"{conference}{year}_papers.json"
+    output_path: Final = output_dir / f"{conference}{year}_papers.{paper_format}"
+
+    # Size the shared connection pool for the requested concurrency.
+    http_client.configure(max_per_host=max_per_host or workers, cache_dir=cache_dir)
+
+    html_parser.set_backend(html_parser_backend)
 
     # Specify conference name and year.
-    papers: Iterable[dict] = list()
+    iter_papers: Callable[..., Iterator[dict]]
 
     # NOTE: Following code is example of how to scrape CVPR specific
     # accepted papers page.
@@ -39,24 +62,43 @@ def scrape_conference_page(
     # This is for CVPR specific accepted papers page like
     # https://cvpr.thecvf.com/Conferences/2024/AcceptedPapers
     # This is used until Open Access repository is available.
-    # papers = cvpr.get_papers(year=year, output_path=output_path)
+    # def iter_papers(journal: ScrapeJournal, **_: Any) -> Iterator[dict]:
+    #     return cvpr.enrich_partial_papers(
+    #         cvpr.get_partial_papers(year), journal=journal
+    #     )
 
     if conference in ["cvpr", "iccv"]:
-        papers = cvf.get_papers(conference=conference, year=year)
+        iter_papers = functools.partial(cvf.iter_papers, conference=conference)
     elif conference == "eccv":
-        papers = eccv.get_papers(year=year)
+        iter_papers = eccv.iter_papers
     elif conference == "neurips":
-        papers = neurips.get_papers(conference=conference, year=year)
+        iter_papers = functools.partial(neurips.iter_papers, conference=conference)
     elif conference == "cvprw":
-        papers = cvf_ws.get_papers(conference=conference, year=year)
+        iter_papers = functools.partial(cvf_ws.iter_papers, conference=conference)
     else:
         raise ValueError(f"Conference {conference} is not supported.")
 
-    output_dir.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w") as f:
-        json.dump(papers, f, indent=4, default=serialize_for_json_dump)
-
-    logger.info(f"Successfully parsed {len(papers)} papers.")
+    # Completed pages are journaled, so an interrupted run resumes from there.
+    # Each paper is written as soon as it is parsed. The output appears with
+    # an atomic rename once all papers are written, then the journal is dropped.
+    with (
+        ScrapeJournal(get_journal_path(output_path)) as journal,
+        PaperWriter(output_path) as writer,
+    ):
+        for paper in iter_papers(
+            year=year,
+            workers=workers,
+            max_per_host=max_per_host,
+            journal=journal,
+        ):
+            writer.write(paper)
+    journal.remove()
+
+    logger.info(f"Successfully parsed {writer.count} papers.")
+
+    cache_stats: Final = http_client.get_cache_stats()
+    if cache_stats is not None:
+        logger.info(f"Page cache: {cache_stats}.")
 
 
 if __name__ == "__main__":
@@ -84,8 +126,52 @@ if __name__ == "__main__":
         required=True,
         help="The year of the conference.",
     )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=1,
+        help="The number of pages fetched concurrently.",
+    )
+    parser.add_argument(
+        "--max-per-host",
+        type=int,
+        default=None,
+        help="The maximum number of concurrent requests per host. Defaults to the number of workers.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=pathlib.Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Directory to cache fetched pages.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the page cache.",
+    )
+    parser.add_argument(
+        "--format",
+        "-f",
+        choices=PAPER_FORMATS,
+        default="json",
+        help="Output format. JSON Lines formats are written paper by paper.",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=html_parser.HTML_PARSER_BACKENDS,
+        default="html.parser",
+        help="HTML parser backend. lxml and selectolax are much faster on listing pages.",
+    )
     args = parser.parse_args()
 
     scrape_conference_page(
-        output_dir=args.output_dir, conference=args.conference, year=args.year
+        output_dir=args.output_dir,
+        conference=args.conference,
+        year=args.year,
+        workers=args.workers,
+        max_per_host=args.max_per_host,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        paper_format=args.format,
+        html_parser_backend=args.parser,
     )
@@ -0,0 +1,117 @@
+"""Index paper files and search them with BM25."""
+
+if __name__ == "__main__":
+    import argparse
+    import pathlib
+    import time
+    from typing import Final
+
+    from src.analysis import download_nltk_data
+    from src.frequencies import build_normalizer
+    from src.lemmatization import DEFAULT_LEMMA_CACHE_PATH, CachedLemmatizer
+    from src.paper_io import glob_paper_files
+    from src.search_index import DEFAULT_SEARCH_INDEX_DIR, SearchIndex, update_index
+
+    download_nltk_data()
+
+    parser: Final = argparse.ArgumentParser()
+    parser.add_argument(
+        "--index-dir",
+        type=pathlib.Path,
+        default=DEFAULT_SEARCH_INDEX_DIR,
+        help="Root directory of the search indices.",
+    )
+    parser.add_argument(
+        "--use-abstract",
+        action="store_true",
+        help="Use the index of abstracts in addition to titles.",
+    )
+    parser.add_argument(
+        "--stopwords-path",
+        type=pathlib.Path,
+        action="append",
+        help="A txt file which includes additional stopwords. Can be repeated. "
+        "Default is ./data/stopwords.txt. Use the same ones to build and to "
+        "search.",
+    )
+    parser.add_argument(
+        "--lemma-cache-path",
+        type=pathlib.Path,
+        default=DEFAULT_LEMMA_CACHE_PATH,
+        help="A JSON file to cache lemmas across runs.",
+    )
+    parser.add_argument(
+        "--no-lemma-cache",
+        action="store_true",
+        help="Do not load or save the lemma cache.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser(
+        "build", help="Index new or changed paper files."
+    )
+    build_parser.add_argument(
+        "--input-dir",
+        "-i",
+        type=pathlib.Path,
+        default="./data/json",
+        help="A directory path where paper files are placed.",
+    )
+
+    search_parser = subparsers.add_parser("search", help="Search papers.")
+    search_parser.add_argument("query", help="Free text query.")
+    search_parser.add_argument(
+        "--conference",
+        "-c",
+        action="append",
+        help="Conferences to search. Can be repeated. Default is all.",
+    )
+    search_parser.add_argument(
+        "--year",
+        "-y",
+        type=int,
+        action="append",
+        help="Years to search. Can be repeated. Default is all.",
+    )
+    search_parser.add_argument("--top-k", "-k", type=int, default=10)
+    args = parser.parse_args()
+
+    normalizer: Final = build_normalizer(args.stopwords_path)
+    lemmatizer: Final = CachedLemmatizer(
+        None if args.no_lemma_cache else args.lemma_cache_path
+    )
+    source: Final = "title_and_abstract" if args.use_abstract else "title_only"
+
+    if args.command == "build":
+        start = time.perf_counter()
+        built_paths = update_index(
+            glob_paper_files(args.input_dir),
+            args.use_abstract,
+            args.index_dir,
+            normalizer,
+            lemmatizer,
+        )
+        for path in built_paths:
+            print(f"Indexed {path}.")
+        print(
+            f"{len(built_paths)} segments are built in "
+            f"{time.perf_counter() - start:.1f} s."
+        )
+
+    else:
+        start = time.perf_counter()
+        index = SearchIndex(args.index_dir / source, normalizer, lemmatizer)
+        loaded = time.perf_counter()
+        results = index.search(args.query, args.conference, args.year, args.top_k)
+        searched = time.perf_counter()
+
+        for result in results:
+            print(
+                f"{result.score:7.2f}  {result.conference:<8} {result.year}  "
+                f"{result.title}"
+            )
+        print(
+            f"Loaded {len(index.segments)} segments in "
+            f"{(loaded - start) * 1000:.1f} ms, "
+            f"searched in {(searched - loaded) * 1000:.1f} ms."
+        )
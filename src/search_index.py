@@ -0,0 +1,460 @@
+"""BM25 inverted index over the titles and abstracts of the corpora.
+
+Papers are tokenized exactly like `analyze_word_frequency`, so a query for
+"neural radiance fields" matches the lemmatized "neural radiance field".
+Each corpus is indexed into its own segment, saved as an uncompressed NumPy
+archive, so a new corpus is added without touching the others and a
+conference/year filter skips whole segments. A segment has:
+
+    - The conference, year and a hash of the source file and settings.
+    - The length in tokens and the title of each paper.
+    - The terms sorted by their 64-bit hash, as UTF-8 offsets and blob, with
+      their document frequencies and the offsets of their postings.
+    - The postings of all terms: pairs of the gap from the previous paper
+      index and the term frequency, encoded as variable-length integers.
+
+BM25 statistics are summed over the selected segments at query time, so the
+scores are the same as those of a single index over the selected corpora.
+
+"""
+
+import dataclasses
+import hashlib
+import heapq
+import io
+import math
+import pathlib
+from typing import Final, Iterable
+
+import numpy as np
+
+from src.analysis import load_paper_documents, tokenize_document
+from src.frequencies import Normalizer, get_default_normalizer
+from src.frequency_state import get_normalizer_fingerprint
+from src.lemmatization import CachedLemmatizer
+from src.paper_io import get_stem, parse_corpus_stem
+from src.utils import hash_key, write_atomic
+
+DEFAULT_SEARCH_INDEX_DIR: Final = pathlib.Path("./outputs/search_index/")
+
+# Standard BM25 parameters.
+BM25_K1: Final = 1.2
+BM25_B: Final = 0.75
+
+
+def encode_varints(values: np.ndarray) -> np.ndarray:
+    """Encode non-negative integers as LEB128 variable-length integers.
+
+    Args:
+        values (np.ndarray): Integers smaller than 2**35.
+
+    Returns:
+        np.ndarray: The encoded bytes as uint8, 7 bits per byte with the high
+            bit set on all bytes but the last one of each integer.
+
+    """
+    values = values.astype(np.uint64)
+    num_bytes = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 5):
+        num_bytes += values >= np.uint64(1 << (7 * k))
+    starts: Final = np.cumsum(num_bytes) - num_bytes
+
+    encoded: Final = np.zeros(int(num_bytes.sum()), dtype=np.uint8)
+    for k in range(5):
+        selected = num_bytes > k
+        chunk = (values[selected] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        continued = (num_bytes[selected] > k + 1).astype(np.uint64) << np.uint64(7)
+        encoded[starts[selected] + k] = chunk | continued
+    return encoded
+
+
+def decode_varints(encoded: np.ndarray) -> np.ndarray:
+    """Decode the bytes encoded by `encode_varints`.
+
+    Args:
+        encoded (np.ndarray): The encoded bytes as uint8.
+
+    Returns:
+        np.ndarray: The integers as int64.
+
+    """
+    if len(encoded) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    ends: Final = np.flatnonzero(encoded < 0x80)
+    starts: Final = np.concatenate([[0], ends[:-1] + 1])
+    value_ids: Final = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    shifts: Final = 7 * (np.arange(len(encoded)) - starts[value_ids])
+    chunks: Final = (encoded & 0x7F).astype(np.int64) << shifts
+    return np.bitwise_or.reduceat(chunks, starts)
+
+
+@dataclasses.dataclass(frozen=True)
+class IndexSegment:
+    """Inverted index of the papers of a corpus."""
+
+    conference: str
+    year: int
+    # Hash of the source file and the settings. The segment is rebuilt when
+    # it changes.
+    fingerprint: str
+    doc_lengths: np.ndarray
+    title_offsets: np.ndarray
+    title_blob: np.ndarray
+    term_hashes: np.ndarray
+    term_offsets: np.ndarray
+    term_blob: np.ndarray
+    doc_freqs: np.ndarray
+    postings_offsets: np.ndarray
+    postings: np.ndarray
+
+    def __len__(self) -> int:
+        """Return the number of papers."""
+        return len(self.doc_lengths)
+
+    def get_title(self, doc_id: int) -> str:
+        """Return the title of a paper."""
+        start, end = self.title_offsets[doc_id], self.title_offsets[doc_id + 1]
+        return self.title_blob[start:end].tobytes().decode()
+
+    def get_term(self, row: int) -> str:
+        """Return the term of a row."""
+        start, end = self.term_offsets[row], self.term_offsets[row + 1]
+        return self.term_blob[start:end].tobytes().decode()
+
+    def find_row(self, term: str) -> int | None:
+        """Return the row of a term, or None if no paper contains it."""
+        row: Final = int(np.searchsorted(self.term_hashes, np.uint64(hash_key(term))))
+        if row < len(self.term_hashes) and self.get_term(row) == term:
+            return row
+        return None
+
+    def get_doc_freq(self, term: str) -> int:
+        """Return the number of papers which contain a term."""
+        row: Final = self.find_row(term)
+        return 0 if row is None else int(self.doc_freqs[row])
+
+    def get_postings(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        """Return the papers which contain a term.
+
+        Args:
+            term (str): A normalized token like "radiance".
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The sorted paper indices and the
+                term frequencies in them.
+
+        """
+        row: Final = self.find_row(term)
+        if row is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        start, end = self.postings_offsets[row], self.postings_offsets[row + 1]
+        values: Final = decode_varints(self.postings[start:end])
+        return np.cumsum(values[0::2]), values[1::2]
+
+
+@dataclasses.dataclass(frozen=True)
+class SearchResult:
+    """A paper matched by a query."""
+
+    conference: str
+    year: int
+    doc_id: int
+    score: float
+    title: str
+
+
+def get_segment_path(
+    input_path: pathlib.Path,
+    use_abstract: bool = False,
+    index_dir: pathlib.Path = DEFAULT_SEARCH_INDEX_DIR,
+) -> pathlib.Path:
+    """Return the path of the segment of a paper file.
+
+    Args:
+        input_path (pathlib.Path): Path to a paper file.
+        use_abstract (bool): Whether abstracts are indexed in addition to
+            titles.
+        index_dir (pathlib.Path): Root directory of the indices.
+
+    Returns:
+        pathlib.Path: The path like `<index_dir>/title_only/cvpr2023_papers.npz`.
+
+    """
+    source: Final = "title_and_abstract" if use_abstract else "title_only"
+    return index_dir / source / f"{get_stem(input_path)}.npz"
+
+
+def get_segment_fingerprint(
+    input_path: pathlib.Path, use_abstract: bool, normalizer: Normalizer
+) -> str:
+    """Return the hash of a paper file and the settings to index it."""
+    digest: Final = hashlib.sha256(input_path.read_bytes())
+    digest.update(f"\0{use_abstract}\0".encode())
+    digest.update(get_normalizer_fingerprint(normalizer).encode())
+    return digest.hexdigest()
+
+
+def build_segment(
+    input_path: pathlib.Path,
+    use_abstract: bool = False,
+    normalizer: Normalizer | None = None,
+    lemmatizer: CachedLemmatizer | None = None,
+) -> IndexSegment:
+    """Build the segment of a paper file.
+
+    Args:
+        input_path (pathlib.Path): Path to a paper file in any supported
+            format, named like `cvpr2023_papers.json`.
+        use_abstract (bool): Whether to index abstracts in addition to titles.
+        normalizer (Normalizer | None): The normalizer to remove stopwords.
+            Defaults to `get_default_normalizer()`.
+        lemmatizer (CachedLemmatizer | None): The lemmatizer of nouns.
+            Defaults to a new one without an on-disk cache.
+
+    Returns:
+        IndexSegment: The segment.
+
+    """
+    corpus: Final = parse_corpus_stem(get_stem(input_path))
+    if corpus is None:
+        raise ValueError(f"{input_path} is not named like `cvpr2023_papers.json`.")
+
+    normalizer = normalizer or get_default_normalizer()
+    lemmatizer = lemmatizer or CachedLemmatizer()
+    paper_documents: Final = load_paper_documents(input_path, use_abstract)
+
+    # Term to the pairs of paper index and term frequency, in paper order.
+    postings_by_term: Final[dict[str, list[int]]] = {}
+    doc_lengths: Final = np.zeros(len(paper_documents), dtype=np.int32)
+    for doc_id, documents in enumerate(paper_documents):
+        term_freqs: dict[str, int] = {}
+        for document in documents:
+            for token in tokenize_document(document, normalizer, lemmatizer):
+                term_freqs[token] = term_freqs.get(token, 0) + 1
+                doc_lengths[doc_id] += 1
+        for term, term_freq in term_freqs.items():
+            postings_by_term.setdefault(term, []).extend((doc_id, term_freq))
+
+    # Order the terms by hash so that they can be found by a binary search.
+    terms: Final = sorted(postings_by_term, key=hash_key)
+    encoded_postings: Final = []
+    for term in terms:
+        values = np.array(postings_by_term[term], dtype=np.int64)
+        values[0::2] = np.diff(values[0::2], prepend=0)
+        encoded_postings.append(encode_varints(values))
+
+    encoded_titles: Final = [documents[0].encode() for documents in paper_documents]
+    encoded_terms: Final = [term.encode() for term in terms]
+    return IndexSegment(
+        conference=corpus[0],
+        year=corpus[1],
+        fingerprint=get_segment_fingerprint(input_path, use_abstract, normalizer),
+        doc_lengths=doc_lengths,
+        title_offsets=_get_offsets(map(len, encoded_titles), len(encoded_titles)),
+        title_blob=np.frombuffer(b"".join(encoded_titles), dtype=np.uint8),
+        term_hashes=np.fromiter(
+            map(hash_key, terms), dtype=np.uint64, count=len(terms)
+        ),
+        term_offsets=_get_offsets(map(len, encoded_terms), len(terms)),
+        term_blob=np.frombuffer(b"".join(encoded_terms), dtype=np.uint8),
+        doc_freqs=np.fromiter(
+            (len(postings_by_term[term]) // 2 for term in terms),
+            dtype=np.int32,
+            count=len(terms),
+        ),
+        postings_offsets=_get_offsets(map(len, encoded_postings), len(terms)),
+        postings=(
+            np.concatenate(encoded_postings)
+            if encoded_postings
+            else np.zeros(0, dtype=np.uint8)
+        ),
+    )
+
+
+def _get_offsets(lengths: Iterable[int], count: int) -> np.ndarray:
+    offsets: Final = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(lengths, dtype=np.int64, count=count), out=offsets[1:])
+    return offsets
+
+
+def save_segment(path: pathlib.Path, segment: IndexSegment) -> None:
+    """Save a segment as an uncompressed NumPy archive.
+
+    Args:
+        path (pathlib.Path): Path to save the segment like `cvpr2023_papers.npz`.
+        segment (IndexSegment): The segment.
+
+    """
+    buffer: Final = io.BytesIO()
+    np.savez(
+        buffer,
+        allow_pickle=False,
+        **{
+            field.name: np.asarray(getattr(segment, field.name))
+            for field in dataclasses.fields(segment)
+        },
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, buffer.getvalue())
+
+
+def load_segment(path: pathlib.Path) -> IndexSegment:
+    """Load a segment saved by `save_segment`.
+
+    Args:
+        path (pathlib.Path): Path to the segment.
+
+    Returns:
+        IndexSegment: The segment.
+
+    """
+    with np.load(path) as archive:
+        arrays: Final = {name: archive[name] for name in archive.files}
+    return IndexSegment(
+        conference=str(arrays.pop("conference")),
+        year=int(arrays.pop("year")),
+        fingerprint=str(arrays.pop("fingerprint")),
+        **arrays,
+    )
+
+
+def update_index(
+    input_paths: Iterable[pathlib.Path],
+    use_abstract: bool = False,
+    index_dir: pathlib.Path = DEFAULT_SEARCH_INDEX_DIR,
+    normalizer: Normalizer | None = None,
+    lemmatizer: CachedLemmatizer | None = None,
+) -> list[pathlib.Path]:
+    """Index the paper files whose segments are missing or outdated.
+
+    Args:
+        input_paths (Iterable[pathlib.Path]): Paths to paper files.
+        use_abstract (bool): Whether to index abstracts in addition to titles.
+        index_dir (pathlib.Path): Root directory of the indices.
+        normalizer (Normalizer | None): The normalizer to remove stopwords.
+            Defaults to `get_default_normalizer()`.
+        lemmatizer (CachedLemmatizer | None): The lemmatizer of nouns.
+            Defaults to a new one without an on-disk cache.
+
+    Returns:
+        list[pathlib.Path]: Paths to the segments which were (re)built.
+
+    """
+    normalizer = normalizer or get_default_normalizer()
+    lemmatizer = lemmatizer or CachedLemmatizer()
+    built_paths: Final = []
+    for input_path in input_paths:
+        segment_path = get_segment_path(input_path, use_abstract, index_dir)
+        if segment_path.exists():
+            fingerprint = get_segment_fingerprint(input_path, use_abstract, normalizer)
+            if load_segment(segment_path).fingerprint == fingerprint:
+                continue
+
+        segment = build_segment(input_path, use_abstract, normalizer, lemmatizer)
+        save_segment(segment_path, segment)
+        built_paths.append(segment_path)
+
+    lemmatizer.save()
+    return built_paths
+
+
+class SearchIndex:
+    """BM25 search over the segments in a directory."""
+
+    def __init__(
+        self,
+        segment_dir: pathlib.Path,
+        normalizer: Normalizer | None = None,
+        lemmatizer: CachedLemmatizer | None = None,
+    ) -> None:
+        """Load all segments of the directory.
+
+        Args:
+            segment_dir (pathlib.Path): Directory of the segments like
+                `outputs/search_index/title_only`.
+            normalizer (Normalizer | None): The normalizer of queries. It
+                should be the one used to build the segments. Defaults to
+                `get_default_normalizer()`.
+            lemmatizer (CachedLemmatizer | None): The lemmatizer of queries.
+                Defaults to a new one without an on-disk cache.
+
+        """
+        self.segments: Final = [
+            load_segment(path) for path in sorted(segment_dir.glob("*.npz"))
+        ]
+        self.normalizer: Final = normalizer or get_default_normalizer()
+        self.lemmatizer: Final = lemmatizer or CachedLemmatizer()
+
+    def search(
+        self,
+        query: str,
+        conferences: list[str] | None = None,
+        years: list[int] | None = None,
+        top_k: int = 10,
+    ) -> list[SearchResult]:
+        """Return the papers which match a query best.
+
+        Args:
+            query (str): Free text, tokenized like the papers.
+            conferences (list[str] | None): Conferences to search like
+                ["cvpr", "iccv"]. Defaults to all of them.
+            years (list[int] | None): Years to search. Defaults to all of them.
+            top_k (int): The number of papers to return. Defaults to 10.
+
+        Returns:
+            list[SearchResult]: The papers sorted by BM25 score.
+
+        """
+        terms: Final = set(tokenize_document(query, self.normalizer, self.lemmatizer))
+        segments: Final = [
+            segment
+            for segment in self.segments
+            if (conferences is None or segment.conference in conferences)
+            and (years is None or segment.year in years)
+        ]
+
+        # Collection statistics of the selected segments.
+        num_docs: Final = sum(len(segment) for segment in segments)
+        if num_docs == 0 or not terms:
+            return []
+        avg_doc_length: Final = (
+            sum(int(segment.doc_lengths.sum()) for segment in segments) / num_docs
+        )
+        idfs: Final = {}
+        for term in terms:
+            doc_freq = sum(segment.get_doc_freq(term) for segment in segments)
+            idfs[term] = math.log(1 + (num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+        candidates: Final[list[tuple[float, int, int]]] = []
+        for i, segment in enumerate(segments):
+            length_norms = BM25_K1 * (
+                1 - BM25_B + BM25_B * segment.doc_lengths / avg_doc_length
+            )
+            scores = np.zeros(len(segment))
+            for term in terms:
+                doc_ids, term_freqs = segment.get_postings(term)
+                scores[doc_ids] += (
+                    idfs[term]
+                    * term_freqs
+                    * (BM25_K1 + 1)
+                    / (term_freqs + length_norms[doc_ids])
+                )
+
+            matched = np.flatnonzero(scores)
+            top = matched[np.argsort(-scores[matched], kind="stable")[:top_k]]
+            candidates.extend((float(scores[j]), i, int(j)) for j in top)
+
+        return [
+            SearchResult(
+                conference=segments[i].conference,
+                year=segments[i].year,
+                doc_id=doc_id,
+                score=score,
+                title=segments[i].get_title(doc_id),
+            )
+            for score, i, doc_id in heapq.nlargest(
+                top_k, candidates, key=lambda candidate: candidate[0]
+            )
+        ]
@@ -0,0 +1,223 @@
+"""Fuzzy matching of paper titles from different sources.
+
+Titles are canonicalized to remove LaTeX markup, hyphenation, accents,
+punctuation and spacing, then compared by the Jaccard similarity of their
+character n-grams. `TitleIndex` finds similar titles in sublinear time with
+MinHash signatures and locality-sensitive hashing (LSH): a title is only
+compared with the indexed titles which share at least one band of the
+signature.
+
+"""
+
+import re
+import zlib
+from typing import Final, Iterable
+
+import numpy as np
+
+from src.arxiv_index import get_first_author_key
+from src.utils import Paper, normalize_title
+
+DEFAULT_THRESHOLD: Final = 0.8
+DEFAULT_NGRAM_SIZE: Final = 3
+DEFAULT_NUM_PERM: Final = 64
+# 16 bands of 4 rows detect pairs above a similarity of about (1/16)^(1/4)=0.5,
+# which leaves a margin for the candidates above the default threshold.
+DEFAULT_NUM_BANDS: Final = 16
+
+_MERSENNE_PRIME: Final = (1 << 61) - 1
+_LATEX_MATH_PATTERN: Final = re.compile(r"\$([^$]*)\$")
+_LATEX_ACCENT_PATTERN: Final = re.compile(r"\\[`'^\"~=.]")
+_LATEX_COMMAND_PATTERN: Final = re.compile(r"\\[a-zA-Z]+\*?")
+# A word broken at the end of a line like "super- vised".
+_HYPHENATION_PATTERN: Final = re.compile(r"(\w)-\s+(\w)")
+
+
+def canonicalize_title(title: str) -> str:
+    """Return the title without LaTeX, hyphenation, accents and spaces.
+
+    Hyphens and spaces are dropped altogether, so "Self-Supervised",
+    "Self Supervised" and "Selfsupervised" have the same canonical form.
+
+    Args:
+        title (str): The title like "$k$-NN: Self-Supervised Learning".
+
+    Returns:
+        str: The canonical title like "knnselfsupervisedlearning".
+
+    """
+    title = _LATEX_MATH_PATTERN.sub(r"\1", title)
+    title = _LATEX_ACCENT_PATTERN.sub("", title)
+    title = _LATEX_COMMAND_PATTERN.sub("", title)
+    title = _HYPHENATION_PATTERN.sub(r"\1\2", title)
+    return normalize_title(title).replace(" ", "")
+
+
+def get_ngrams(
+    canonical_title: str, ngram_size: int = DEFAULT_NGRAM_SIZE
+) -> frozenset[str]:
+    """Return the set of character n-grams of a canonical title.
+
+    Args:
+        canonical_title (str): A title canonicalized by `canonicalize_title`.
+        ngram_size (int): The number of characters of an n-gram.
+
+    Returns:
+        frozenset[str]: The n-grams. A title shorter than `ngram_size` is a
+            single n-gram.
+
+    """
+    if len(canonical_title) <= ngram_size:
+        return frozenset([canonical_title])
+    return frozenset(
+        canonical_title[i : i + ngram_size]
+        for i in range(len(canonical_title) - ngram_size + 1)
+    )
+
+
+def jaccard_similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """Return the Jaccard similarity of two sets of n-grams."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class TitleIndex:
+    """MinHash LSH index of papers for fuzzy title lookups."""
+
+    def __init__(
+        self,
+        papers: Iterable[Paper] = (),
+        threshold: float = DEFAULT_THRESHOLD,
+        ngram_size: int = DEFAULT_NGRAM_SIZE,
+        num_perm: int = DEFAULT_NUM_PERM,
+        num_bands: int = DEFAULT_NUM_BANDS,
+    ) -> None:
+        """Build the index.
+
+        Args:
+            papers (Iterable[Paper]): Papers to index.
+            threshold (float): The minimum Jaccard similarity of the n-grams of
+                matched titles. Defaults to 0.8.
+            ngram_size (int): The number of characters of an n-gram.
+            num_perm (int): The number of hash functions of a MinHash
+                signature.
+            num_bands (int): The number of LSH bands. It must divide
+                `num_perm`.
+
+        """
+        if num_perm % num_bands != 0:
+            raise ValueError("num_perm must be divisible by num_bands.")
+
+        self.threshold: Final = threshold
+        self.ngram_size: Final = ngram_size
+        self.num_bands: Final = num_bands
+        self.papers: Final[list[Paper]] = []
+
+        # Fixed seed so that signatures are comparable across runs.
+        rng: Final = np.random.default_rng(seed=0)
+        self._a: Final = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b: Final = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._ngrams: Final[list[frozenset[str]]] = []
+        self._exact: Final[dict[str, list[int]]] = {}
+        self._bands: Final[list[dict[bytes, list[int]]]] = [
+            {} for _ in range(num_bands)
+        ]
+
+        for paper in papers:
+            self.add(paper)
+
+    def __len__(self) -> int:
+        """Return the number of indexed papers."""
+        return len(self.papers)
+
+    def add(self, paper: Paper) -> None:
+        """Add a paper to the index.
+
+        Args:
+            paper (Paper): The paper to add.
+
+        """
+        i: Final = len(self.papers)
+        canonical_title: Final = canonicalize_title(paper.title)
+        ngrams: Final = get_ngrams(canonical_title, self.ngram_size)
+        self.papers.append(paper)
+        self._ngrams.append(ngrams)
+        self._exact.setdefault(canonical_title, []).append(i)
+        for band, key in enumerate(self._get_band_keys(ngrams)):
+            self._bands[band].setdefault(key, []).append(i)
+
+    def query(self, title: str) -> list[tuple[float, Paper]]:
+        """Return the papers whose titles are similar to the title.
+
+        Args:
+            title (str): The title to look up.
+
+        Returns:
+            list[tuple[float, Paper]]: Pairs of the similarity and the paper
+                above the threshold, the exact matches first, then the most
+                similar first.
+
+        """
+        canonical_title: Final = canonicalize_title(title)
+        exact_ids: Final = self._exact.get(canonical_title, [])
+        return [(1.0, self.papers[i]) for i in exact_ids] + self._query_fuzzy(
+            canonical_title, set(exact_ids)
+        )
+
+    def find(self, title: str, author: str) -> Paper | None:
+        """Return the most similar paper which has the same first author.
+
+        Papers with the same canonical title are checked first. If none of
+        them has the same first author, e.g. because a different paper has
+        the same title, the similar titles of the LSH candidates are checked.
+        First authors are compared by their normalized family names, so
+        middle names, initials and accents do not matter.
+
+        Args:
+            title (str): The title of the paper.
+            author (str): The authors of the paper, the first one is used.
+
+        Returns:
+            Paper | None: The matched paper, or None if not found.
+
+        """
+        first_author: Final = get_first_author_key(author)
+        canonical_title: Final = canonicalize_title(title)
+        exact_ids: Final = self._exact.get(canonical_title, [])
+        for i in exact_ids:
+            if get_first_author_key(self.papers[i].author) == first_author:
+                return self.papers[i]
+
+        for _, paper in self._query_fuzzy(canonical_title, set(exact_ids)):
+            if get_first_author_key(paper.author) == first_author:
+                return paper
+
+        return None
+
+    def _query_fuzzy(
+        self, canonical_title: str, exclude: set[int]
+    ) -> list[tuple[float, Paper]]:
+        ngrams: Final = get_ngrams(canonical_title, self.ngram_size)
+        candidates: Final[set[int]] = set()
+        for band, key in enumerate(self._get_band_keys(ngrams)):
+            candidates.update(self._bands[band].get(key, []))
+
+        matches: Final = []
+        for i in sorted(candidates - exclude):
+            similarity = jaccard_similarity(ngrams, self._ngrams[i])
+            if similarity >= self.threshold:
+                matches.append((similarity, self.papers[i]))
+        return sorted(matches, key=lambda match: match[0], reverse=True)
+
+    def _get_band_keys(self, ngrams: frozenset[str]) -> list[bytes]:
+        hashes: Final = np.fromiter(
+            (zlib.crc32(ngram.encode()) for ngram in ngrams),
+            dtype=np.uint64,
+            count=len(ngrams),
+        )
+        # One universal hash function (a * x + b) mod p per row.
+        signature: Final = (
+            (np.outer(self._a, hashes) + self._b[:, np.newaxis]) % _MERSENNE_PRIME
+        ).min(axis=1)
+        return [band.tobytes() for band in np.split(signature, self.num_bands)]
@@ -0,0 +1,306 @@
+"""Sparse term x (conference, year) count matrix for keyword trends.
+
+The matrix is built once from the raw frequency CSVs of all corpora, so no
+text is tokenized again. It is saved as an uncompressed NumPy archive, which
+loads in tens of milliseconds, with:
+
+    - The columns: conference, year and number of papers of each corpus.
+    - The terms sorted by their 64-bit hash, as UTF-8 offsets and blob, so a
+      term is found by a binary search over the hashes.
+    - The counts in compressed sparse row (CSR) format, one row per term.
+
+Rates are counts per 1,000 papers of the corpus.
+
+"""
+
+import dataclasses
+import io
+import json
+import pathlib
+import re
+from typing import Final
+
+import numpy as np
+
+from src.analysis import RAW_FREQUENCY_DIR, read_frequency_csv
+from src.paper_io import get_stem, glob_paper_files, iter_papers, parse_corpus_stem
+from src.utils import hash_key, write_atomic
+
+DEFAULT_TREND_MATRIX_DIR: Final = pathlib.Path("./outputs/trends/")
+
+_CSV_NAME_PATTERN: Final = re.compile(
+    r"^(.+_papers)_(title_only|title_and_abstract)_(\d+)gram(_adjusted)?$"
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class TrendMatrix:
+    """Counts of terms in each (conference, year) corpus."""
+
+    conferences: list[str]
+    years: np.ndarray
+    paper_counts: np.ndarray
+    term_hashes: np.ndarray
+    term_offsets: np.ndarray
+    term_blob: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+
+    @property
+    def columns(self) -> list[tuple[str, int]]:
+        """Return the (conference, year) of each column."""
+        return list(zip(self.conferences, self.years.tolist(), strict=True))
+
+    def __len__(self) -> int:
+        """Return the number of terms."""
+        return len(self.term_hashes)
+
+    def get_term(self, row: int) -> str:
+        """Return the term of a row."""
+        start, end = self.term_offsets[row], self.term_offsets[row + 1]
+        return self.term_blob[start:end].tobytes().decode()
+
+    def find_row(self, term: str) -> int | None:
+        """Return the row of a term, or None if it never appears."""
+        row: Final = int(np.searchsorted(self.term_hashes, np.uint64(hash_key(term))))
+        if row < len(self) and self.get_term(row) == term:
+            return row
+        return None
+
+    def get_counts(self, term: str) -> np.ndarray:
+        """Return the counts of a term in each column.
+
+        Args:
+            term (str): A lowercased n-gram like "neural radiance field".
+
+        Returns:
+            np.ndarray: The counts, zero where the term does not appear.
+
+        """
+        counts: Final = np.zeros(len(self.conferences), dtype=np.int64)
+        row: Final = self.find_row(term)
+        if row is not None:
+            start, end = self.indptr[row], self.indptr[row + 1]
+            counts[self.indices[start:end]] = self.data[start:end]
+        return counts
+
+    def get_series(self, term: str) -> dict[str, dict[int, float]]:
+        """Return the rate of a term per 1,000 papers by conference and year.
+
+        Args:
+            term (str): A lowercased n-gram like "neural radiance field".
+
+        Returns:
+            dict[str, dict[int, float]]: Conference to year to rate. Corpora
+                whose number of papers is unknown are omitted.
+
+        """
+        counts: Final = self.get_counts(term)
+        series: Final[dict[str, dict[int, float]]] = {}
+        for i, (conference, year) in enumerate(self.columns):
+            if self.paper_counts[i] > 0:
+                rate = 1000 * counts[i] / self.paper_counts[i]
+                series.setdefault(conference, {})[year] = float(rate)
+        return series
+
+    def get_top_movers(
+        self,
+        year_from: int,
+        year_to: int,
+        conferences: list[str] | None = None,
+        top_k: int = 20,
+        min_count: int = 10,
+    ) -> list[tuple[str, float, float]]:
+        """Return the terms whose rate changed the most between two years.
+
+        Args:
+            year_from (int): The year to compare from.
+            year_to (int): The year to compare to.
+            conferences (list[str] | None): Conferences to aggregate. Defaults
+                to all of them.
+            top_k (int): The number of terms to return. Defaults to 20.
+            min_count (int): Minimum total count in the two years to skip
+                rare terms. Defaults to 10.
+
+        Returns:
+            list[tuple[str, float, float]]: (term, rate in `year_from`, rate in
+                `year_to`) sorted by the absolute change of the rate.
+
+        """
+        rows: Final = np.repeat(
+            np.arange(len(self), dtype=np.int64), np.diff(self.indptr)
+        )
+        rates: Final = []
+        totals: Final = []
+        for year in [year_from, year_to]:
+            selected = (self.years == year) & (self.paper_counts > 0)
+            if conferences is not None:
+                selected &= np.isin(self.conferences, conferences)
+            if not selected.any():
+                raise ValueError(f"No corpus of {year} with known paper counts.")
+
+            mask = selected[self.indices]
+            counts = np.bincount(
+                rows[mask], weights=self.data[mask], minlength=len(self)
+            )
+            totals.append(counts)
+            rates.append(1000 * counts / self.paper_counts[selected].sum())
+
+        deltas: Final = np.where(
+            totals[0] + totals[1] >= min_count, rates[1] - rates[0], 0
+        )
+        top_rows: Final = np.argsort(-np.abs(deltas), kind="stable")[:top_k]
+        return [
+            (self.get_term(row), float(rates[0][row]), float(rates[1][row]))
+            for row in top_rows
+            if deltas[row] != 0
+        ]
+
+
+def build_trend_matrix(
+    frequency_dir: pathlib.Path = RAW_FREQUENCY_DIR / "title_only",
+    paper_dir: pathlib.Path | None = pathlib.Path("./data/json"),
+    until_ngram: int = 3,
+    adjusted: bool = False,
+) -> TrendMatrix:
+    """Build the matrix from the raw frequency CSVs in a directory.
+
+    One CSV is used for each corpus, so that the counts of a corpus are not
+    added up over CSVs of other n-gram orders.
+
+    Args:
+        frequency_dir (pathlib.Path): Directory of the raw or adjusted
+            frequency CSVs like `cvpr2023_papers_title_only_3gram.csv`.
+        paper_dir (pathlib.Path | None): Directory of the paper files to count
+            the papers of each corpus. Corpora without a paper file get zero.
+        until_ngram (int): The maximum n of the n-grams of the CSVs to use.
+            Defaults to 3.
+        adjusted (bool): Whether to use the adjusted CSVs instead of the raw
+            ones. Defaults to False.
+
+    Returns:
+        TrendMatrix: The matrix.
+
+    Raises:
+        ValueError: If a corpus has more than one CSV, such as both title only
+            and title and abstract ones.
+
+    """
+    paper_counts_by_stem: Final[dict[str, int]] = {}
+    if paper_dir is not None:
+        for path in glob_paper_files(paper_dir):
+            paper_counts_by_stem[get_stem(path)] = sum(1 for _ in iter_papers(path))
+
+    csv_paths_by_stem: Final[dict[str, pathlib.Path]] = {}
+    for csv_path in sorted(frequency_dir.glob("*.csv")):
+        csv_match = _CSV_NAME_PATTERN.match(csv_path.stem)
+        if (
+            csv_match is None
+            or parse_corpus_stem(csv_match[1]) is None
+            or int(csv_match[3]) != until_ngram
+            or bool(csv_match[4]) != adjusted
+        ):
+            continue
+        if csv_match[1] in csv_paths_by_stem:
+            raise ValueError(
+                f"{csv_paths_by_stem[csv_match[1]]} and {csv_path} are CSVs of "
+                "the same corpus."
+            )
+        csv_paths_by_stem[csv_match[1]] = csv_path
+
+    conferences: Final[list[str]] = []
+    years: Final[list[int]] = []
+    paper_counts: Final[list[int]] = []
+    term_ids: Final[dict[str, int]] = {}
+    rows: Final[list[np.ndarray]] = []
+    cols: Final[list[np.ndarray]] = []
+    values: Final[list[np.ndarray]] = []
+    for stem, csv_path in csv_paths_by_stem.items():
+        corpus = parse_corpus_stem(stem)
+        if corpus is None:
+            continue
+
+        col = len(conferences)
+        conferences.append(corpus[0])
+        years.append(corpus[1])
+        paper_counts.append(paper_counts_by_stem.get(stem, 0))
+
+        frequency_dict = read_frequency_csv(csv_path)
+        rows.append(
+            np.fromiter(
+                (term_ids.setdefault(term, len(term_ids)) for term in frequency_dict),
+                dtype=np.int64,
+                count=len(frequency_dict),
+            )
+        )
+        cols.append(np.full(len(frequency_dict), col, dtype=np.uint16))
+        values.append(np.fromiter(frequency_dict.values(), dtype=np.int32))
+
+    # Order the terms by hash so that they can be found by a binary search.
+    terms: Final = list(term_ids)
+    hashes: Final = np.fromiter(map(hash_key, terms), dtype=np.uint64, count=len(terms))
+    order: Final = np.argsort(hashes, kind="stable")
+    new_rows: Final = np.empty(len(terms), dtype=np.int64)
+    new_rows[order] = np.arange(len(terms))
+
+    encoded_terms: Final = [terms[i].encode() for i in order]
+    term_offsets: Final = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum([len(term) for term in encoded_terms], out=term_offsets[1:])
+
+    all_rows: Final = new_rows[np.concatenate(rows)] if rows else np.zeros(0, np.int64)
+    all_cols: Final = np.concatenate(cols) if cols else np.zeros(0, np.uint16)
+    all_values: Final = np.concatenate(values) if values else np.zeros(0, np.int32)
+    nnz_order: Final = np.lexsort((all_cols, all_rows))
+    indptr: Final = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(all_rows, minlength=len(terms)), out=indptr[1:])
+
+    return TrendMatrix(
+        conferences=conferences,
+        years=np.array(years, dtype=np.int32),
+        paper_counts=np.array(paper_counts, dtype=np.int64),
+        term_hashes=hashes[order],
+        term_offsets=term_offsets,
+        term_blob=np.frombuffer(b"".join(encoded_terms), dtype=np.uint8),
+        indptr=indptr,
+        indices=all_cols[nnz_order],
+        data=all_values[nnz_order],
+    )
+
+
+def save_trend_matrix(path: pathlib.Path, matrix: TrendMatrix) -> None:
+    """Save the matrix as an uncompressed NumPy archive.
+
+    Args:
+        path (pathlib.Path): Path to save the matrix like `trends.npz`.
+        matrix (TrendMatrix): The matrix.
+
+    """
+    buffer: Final = io.BytesIO()
+    np.savez(
+        buffer,
+        conferences=np.frombuffer(json.dumps(matrix.conferences).encode(), np.uint8),
+        **{
+            field.name: getattr(matrix, field.name)
+            for field in dataclasses.fields(matrix)
+            if field.name != "conferences"
+        },
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, buffer.getvalue())
+
+
+def load_trend_matrix(path: pathlib.Path) -> TrendMatrix:
+    """Load the matrix saved by `save_trend_matrix`.
+
+    Args:
+        path (pathlib.Path): Path to the matrix.
+
+    Returns:
+        TrendMatrix: The matrix.
+
+    """
+    with np.load(path) as archive:
+        arrays: Final = {name: archive[name] for name in archive.files}
+    conferences: Final = json.loads(arrays.pop("conferences").tobytes())
+    return TrendMatrix(conferences=conferences, **arrays)
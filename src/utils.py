@@ -1,4 +1,11 @@
-from typing import Any
+import functools
+import hashlib
+import os
+import pathlib
+import re
+import tempfile
+import unicodedata
+from typing import Any, Final
 
 from pydantic import BaseModel, HttpUrl
 from pydantic_core import Url
@@ -38,3 +45,75 @@ def serialize_for_json_dump(object: Any) -> str:
     raise TypeError(
         f"Object of type {object.__class__.__name__} is not JSON serializable"
     )
+
+
+_NON_ALNUM_PATTERN: Final = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_title(title: str) -> str:
+    """Normalize a paper title to compare titles from different sources.
+
+    Accents are removed, the title is lowercased and every run of
+    non-alphanumeric characters is replaced with a single space.
+
+    Args:
+        title (str): The title to normalize.
+
+    Returns:
+        str: The normalized title.
+
+    """
+    decomposed: Final = unicodedata.normalize("NFKD", title)
+    ascii_title: Final = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM_PATTERN.sub(" ", ascii_title.lower()).strip()
+
+
+def hash_key(key: str) -> int:
+    """Return a stable 64-bit hash of the key.
+
+    Args:
+        key (str): A normalized title, first author key or n-gram.
+
+    Returns:
+        int: The hash.
+
+    """
+    return int.from_bytes(
+        hashlib.blake2b(key.encode(), digest_size=8).digest(), "little"
+    )
+
+
+@functools.cache
+def _get_umask() -> int:
+    # The umask can only be read by setting it, so read it once rather than
+    # racing with threads which create files.
+    umask: Final = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+def write_atomic(path: pathlib.Path, data: bytes) -> None:
+    """Write data to the path so that readers never see a partial file.
+
+    The data is written to a temporary file in the same directory, which is
+    renamed to the path after it is flushed to disk. The file gets the mode
+    of a file created by `open`, not the owner-only mode of the temporary
+    file.
+
+    Args:
+        path (pathlib.Path): Path to write.
+        data (bytes): Data to write.
+
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fchmod(f.fileno(), 0o666 & ~_get_umask())
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        pathlib.Path(tmp_path).unlink(missing_ok=True)
+        raise
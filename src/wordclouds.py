@@ -0,0 +1,346 @@
+"""Generate word cloud images from papers or frequency CSVs.
+
+These functions are the importable core of `generate_wordcloud.py` and
+`run_all_generate_wordcloud.py`. Batch rendering runs on a process pool
+where each worker loads every font size once, and skips the images whose
+CSV and parameters have not changed since the last run.
+
+"""
+
+import contextlib
+import csv
+import functools
+import json
+import pathlib
+from typing import Any, Final, Iterable, Iterator, Sequence, Set
+
+import wordcloud.wordcloud as wordcloud_module
+from PIL import ImageFont
+from wordcloud import WordCloud
+from wordcloud import __version__ as wordcloud_version
+
+from src.batch import BatchJob, BatchResult, run_batch
+from src.manifest import DEFAULT_MANIFEST_DIR, Manifest
+from src.paper_io import load_papers
+from src.utils import Paper, write_atomic
+
+DEFAULT_WORDCLOUD_DIR: Final = pathlib.Path("./outputs/wordcloud/")
+DEFAULT_WORDCLOUD_MANIFEST_PATH: Final = DEFAULT_MANIFEST_DIR / "wordcloud.json"
+
+LAYOUT_SUFFIX: Final = ".layout.json"
+_LAYOUT_VERSION: Final = 1
+
+# Parameters of `WordCloud` other than the seed.
+WORDCLOUD_PARAMS: Final[dict[str, Any]] = {
+    "width": 1600,
+    "height": 800,
+    "max_font_size": 120,
+    "min_font_size": 12,
+    "background_color": "black",
+}
+
+
+def generate_wordcloud_from_json(
+    json_path: pathlib.Path,
+    image_save_path: pathlib.Path,
+    stopwords: Set[str],
+    seed: int,
+    use_abstract: bool = False,
+) -> None:
+    """Generate word cloud. All features like Tokenizer or Lemmatizer
+    are comming from WordCloud library.
+
+    Args:
+        json_path (pathlib.Path): Path to the JSON/JSONL file which
+            includes paper information.
+        image_save_path (pathlib.Path): Path to save the generated word
+            cloud image.
+        stopwords (Set[str]): Set of stopwords.
+        seed (int): Random seed for reproducibility.
+        use_abstract (bool): Whether to use abstract in addition to
+            title. Defaults to False.
+
+    """
+    # Load papers from JSON/JSONL file.
+    papers: Final = [Paper.model_validate(p) for p in load_papers(json_path)]
+
+    # Concat all titles and abstructs.
+    all_title = " ".join([paper.title for paper in papers])
+    all_abstract = " ".join([paper.abstract for paper in papers])
+    source_text = all_title + " " + all_abstract if use_abstract else all_title
+
+    with cached_fonts():
+        wordcloud: Final = WordCloud(
+            **WORDCLOUD_PARAMS,
+            stopwords=stopwords,
+            random_state=seed,
+        ).generate(source_text)
+        wordcloud.to_file(str(image_save_path))
+
+    print(f"Word cloud image is saved at {image_save_path}.")
+
+
+def generate_wordcloud_from_csv(
+    csv_path: pathlib.Path,
+    image_save_path: pathlib.Path,
+    seed: int,
+    layout_save_path: pathlib.Path | None = None,
+) -> None:
+    """Generate word cloud from CSV file.
+
+    Args:
+        csv_path (pathlib.Path): Path to the CSV file which includes
+            text data.
+        image_save_path (pathlib.Path): Path to save the generated word
+            cloud image.
+        seed (int): Random seed for reproducibility.
+        layout_save_path (pathlib.Path | None): Path to save the layout to
+            render it again with `render_wordcloud_layout`. Defaults to None.
+
+    """
+    # Load frequency data from CSV file.
+    with csv_path.open("r") as f:
+        reader = csv.reader(f)
+        _ = next(reader)  # Skip header.
+        frequency_dict: dict[str, int] = {row[0]: int(row[1]) for row in reader}
+
+    # Generate word cloud.
+    wordcloud: Final = WordCloud(**WORDCLOUD_PARAMS, random_state=seed)
+    with cached_fonts():
+        wordcloud.generate_from_frequencies(frequency_dict)
+        wordcloud.to_file(str(image_save_path))
+    if layout_save_path is not None:
+        save_wordcloud_layout(wordcloud, layout_save_path)
+
+    print(f"Word cloud image is saved at {image_save_path}.")
+
+
+def get_layout_path(image_save_path: pathlib.Path) -> pathlib.Path:
+    """Return the layout path next to an image like `<stem>.layout.json`."""
+    return image_save_path.with_suffix(LAYOUT_SUFFIX)
+
+
+def save_wordcloud_layout(wordcloud: WordCloud, layout_path: pathlib.Path) -> None:
+    """Save the placement of the words of a generated word cloud as JSON.
+
+    Args:
+        wordcloud (WordCloud): A word cloud after `generate_from_frequencies`.
+        layout_path (pathlib.Path): Path to save the layout like
+            `cvpr2023_papers_title_only_3gram_adjusted_seed=42.layout.json`.
+
+    """
+    data: Final = {
+        "version": _LAYOUT_VERSION,
+        "width": wordcloud.width,
+        "height": wordcloud.height,
+        "background_color": wordcloud.background_color,
+        "mode": wordcloud.mode,
+        # The default font is stored as None to load the file of the installed
+        # package.
+        "font_path": (
+            None
+            if wordcloud.font_path == wordcloud_module.FONT_PATH
+            else wordcloud.font_path
+        ),
+        "words": [
+            {
+                "word": word,
+                "frequency": float(frequency),
+                "font_size": int(font_size),
+                "position": [int(position[0]), int(position[1])],
+                "orientation": None if orientation is None else int(orientation),
+                "color": color,
+            }
+            for (word, frequency), font_size, position, orientation, color in (
+                wordcloud.layout_
+            )
+        ],
+    }
+    layout_path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(layout_path, json.dumps(data, ensure_ascii=False).encode())
+
+
+def load_wordcloud_layout(layout_path: pathlib.Path) -> WordCloud:
+    """Load a layout saved by `save_wordcloud_layout` into a word cloud.
+
+    Args:
+        layout_path (pathlib.Path): Path to the layout.
+
+    Returns:
+        WordCloud: A word cloud which can be rendered with `to_image` or
+            `to_svg` without placing the words again.
+
+    """
+    with layout_path.open("r") as f:
+        data: Final = json.load(f)
+    if data.get("version") != _LAYOUT_VERSION:
+        raise ValueError(f"{layout_path} is not a layout of version {_LAYOUT_VERSION}.")
+
+    wordcloud: Final = WordCloud(
+        width=data["width"],
+        height=data["height"],
+        background_color=data["background_color"],
+        mode=data["mode"],
+        font_path=data["font_path"],
+    )
+    wordcloud.layout_ = [
+        (
+            (entry["word"], entry["frequency"]),
+            entry["font_size"],
+            tuple(entry["position"]),
+            entry["orientation"],
+            entry["color"],
+        )
+        for entry in data["words"]
+    ]
+    return wordcloud
+
+
+def render_wordcloud_layout(
+    layout_path: pathlib.Path, image_save_path: pathlib.Path, scale: float = 1.0
+) -> None:
+    """Render a saved layout as PNG at any scale or as SVG.
+
+    Args:
+        layout_path (pathlib.Path): Path to a layout saved by
+            `save_wordcloud_layout`.
+        image_save_path (pathlib.Path): Path to save the image. SVG is used
+            if the suffix is `.svg`, otherwise the format follows the suffix
+            like `to_file` of WordCloud.
+        scale (float): The scale of the image and the fonts, e.g. 0.25 for a
+            thumbnail or 3.0 for print. Defaults to 1.0.
+
+    """
+    wordcloud: Final = load_wordcloud_layout(layout_path)
+    wordcloud.scale = scale
+    image_save_path.parent.mkdir(parents=True, exist_ok=True)
+    if image_save_path.suffix == ".svg":
+        write_atomic(image_save_path, wordcloud.to_svg().encode())
+    else:
+        with cached_fonts():
+            wordcloud.to_file(str(image_save_path))
+
+    print(f"Word cloud image is saved at {image_save_path}.")
+
+
+@functools.cache
+def _load_truetype(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(font_path, size)
+
+
+class _CachedImageFont:
+    """`PIL.ImageFont` whose `truetype` loads each font path and size once."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(ImageFont, name)
+
+    @staticmethod
+    def truetype(font: str, size: int = 10, *args: Any, **kwargs: Any) -> Any:
+        """Return the cached font, unless other options are given."""
+        if args or kwargs:
+            return ImageFont.truetype(font, size, *args, **kwargs)
+        return _load_truetype(font, size)
+
+
+@contextlib.contextmanager
+def cached_fonts() -> Iterator[None]:
+    """Make WordCloud load each font path and size once in this process.
+
+    WordCloud opens the font file again for every word and every size it
+    tries, which is about a quarter of the rendering time. The loaded fonts
+    are immutable, so they are cached by font path and size and shared by
+    all images of the process. WordCloud reads `ImageFont` from its module,
+    which is replaced only within the block.
+
+    """
+    original: Final = wordcloud_module.ImageFont
+    wordcloud_module.ImageFont = _CachedImageFont()
+    try:
+        yield
+    finally:
+        wordcloud_module.ImageFont = original
+
+
+def get_wordcloud_path(
+    csv_path: pathlib.Path,
+    seed: int,
+    output_dir: pathlib.Path = DEFAULT_WORDCLOUD_DIR,
+) -> pathlib.Path:
+    """Return the path of the word cloud image of a frequency CSV.
+
+    Args:
+        csv_path (pathlib.Path): Path to a frequency CSV file.
+        seed (int): Random seed of the word cloud.
+        output_dir (pathlib.Path): Directory of the images.
+
+    Returns:
+        pathlib.Path: The path like
+            `<output_dir>/cvpr2023_papers_title_only_3gram_adjusted_seed=42.png`.
+
+    """
+    return output_dir / f"{csv_path.stem}_seed={seed}.png"
+
+
+def render_wordclouds(
+    csv_paths: Iterable[pathlib.Path],
+    seeds: Sequence[int] = (42,),
+    output_dir: pathlib.Path = DEFAULT_WORDCLOUD_DIR,
+    num_jobs: int = 1,
+    manifest_path: pathlib.Path | None = DEFAULT_WORDCLOUD_MANIFEST_PATH,
+    force: bool = False,
+) -> list[BatchResult]:
+    """Render the word clouds of frequency CSVs with every seed.
+
+    Args:
+        csv_paths (Iterable[pathlib.Path]): Paths to frequency CSV files.
+        seeds (Sequence[int]): Random seeds. One image is rendered per CSV
+            and seed. Defaults to (42,).
+        output_dir (pathlib.Path): Directory to save the images.
+        num_jobs (int): The number of worker processes. Defaults to 1.
+        manifest_path (pathlib.Path | None): Manifest of the rendered images.
+            Defaults to the one in the cache directory. None renders every
+            image.
+        force (bool): Whether to render the images even if they are up to
+            date. Defaults to False.
+
+    Returns:
+        list[BatchResult]: The results of the rendered images. Skipped
+            images have no result.
+
+    """
+    manifest: Final = Manifest(manifest_path)
+    params: Final = {**WORDCLOUD_PARAMS, "wordcloud": wordcloud_version}
+    jobs: Final = []
+    fingerprints: Final = []
+    skipped = 0
+    for csv_path in csv_paths:
+        for seed in seeds:
+            image_save_path = get_wordcloud_path(csv_path, seed, output_dir)
+            fingerprint = manifest.get_fingerprint([csv_path], {**params, "seed": seed})
+            if not force and manifest.is_up_to_date(image_save_path, fingerprint):
+                skipped += 1
+                continue
+
+            jobs.append(
+                BatchJob(
+                    name=str(image_save_path),
+                    func=generate_wordcloud_from_csv,
+                    kwargs={
+                        "csv_path": csv_path,
+                        "image_save_path": image_save_path,
+                        "seed": seed,
+                    },
+                )
+            )
+            fingerprints.append((image_save_path, fingerprint))
+    print(f"{skipped} word clouds are up to date, {len(jobs)} are rendered.")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results: Final = run_batch(jobs, num_jobs=num_jobs)
+    for result, (image_save_path, fingerprint) in zip(
+        results, fingerprints, strict=True
+    ):
+        if result.ok:
+            manifest.record(image_save_path, fingerprint)
+    manifest.save()
+    return results
@@ -0,0 +1,16 @@
+import types
+
+import pytest
+
+from src import analysis, lemmatization
+
+
+@pytest.fixture()
+def _no_nltk_data(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tokenize by spaces and keep words as lemmas without NLTK data."""
+    monkeypatch.setattr(analysis.nltk, "word_tokenize", str.split)
+    monkeypatch.setattr(
+        lemmatization,
+        "WordNetLemmatizer",
+        lambda: types.SimpleNamespace(lemmatize=lambda token, pos: token),
+    )
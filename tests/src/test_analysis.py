@@ -0,0 +1,44 @@
+import json
+import pathlib
+
+import pytest
+
+from src.analysis import count_document_frequency
+from src.frequencies import CUSTOM_STOPWORDS, NgramFilter, Normalizer
+from src.lemmatization import CachedLemmatizer
+
+
+class TestAnalysis:
+    """The test class for the analysis module."""
+
+    @pytest.mark.usefixtures("_no_nltk_data")
+    def test_count_document_frequency_workers(self, tmp_path: pathlib.Path):
+        """Worker processes count the same n-grams and save lemmas once."""
+        documents = [
+            "neural radiance field",
+            "latent diffusion model",
+            "neural field for diffusion",
+            "radiance field rendering",
+        ] * 5
+        normalizer = Normalizer(CUSTOM_STOPWORDS | {"for"})
+        cache_path = tmp_path / "lemmas.json"
+        cache_path.write_text(json.dumps({"n": {"neural": "neural"}}))
+        lemmatizer = CachedLemmatizer(cache_path)
+
+        for ngram_filter in [None, NgramFilter(frozenset(), frozenset(), 10)]:
+            sequential = count_document_frequency(
+                documents, 3, normalizer, ngram_filter=ngram_filter
+            )
+            parallel = count_document_frequency(
+                documents, 3, normalizer, lemmatizer, 2, ngram_filter
+            )
+            assert parallel == sequential
+            assert list(parallel.items()) == list(sequential.items())
+
+        # The lemmas of the workers are merged into the lemmatizer.
+        assert lemmatizer.hits + lemmatizer.misses == 2 * 65
+        lemmatizer.save()
+        lemmas = json.loads(cache_path.read_text())["n"]
+        assert sorted(lemmas) == sorted(
+            {word for document in documents for word in document.split()}
+        )
@@ -0,0 +1,70 @@
+from typing import Iterator
+
+import pytest
+
+from src import cvpr
+from src.arxiv import build_title_query, get_arxiv_papers_by_titles
+from src.arxiv_stub import ArxivStubServer
+from src.utils import Paper, PartialPaper
+
+
+@pytest.fixture()
+def arxiv_papers() -> list[Paper]:
+    """Papers served by the arXiv stand-in."""
+    return [
+        Paper(
+            title=f"Learning Thing Number {i}: A Study",
+            author=f"Author {i}, Coauthor {i}",
+            abstract=f"Abstract {i}.",
+            page=f"http://arxiv.org/abs/2401.{i:05d}",  # type: ignore
+            pdf=f"http://arxiv.org/pdf/2401.{i:05d}.pdf",  # type: ignore
+        )
+        for i in range(10)
+    ]
+
+
+@pytest.fixture()
+def arxiv_server(arxiv_papers: list[Paper]) -> Iterator[ArxivStubServer]:
+    """Local stand-in of the arXiv API."""
+    with ArxivStubServer(arxiv_papers) as server:
+        yield server
+
+
+class TestArxiv:
+    """The test class for the arxiv module."""
+
+    def test_build_title_query(self):
+        """Titles are normalized and OR'd as title phrase clauses."""
+        query = build_title_query(["B: Second", "A & First"])
+        assert query == 'ti:"a first" OR ti:"b second"'
+
+    def test_get_arxiv_papers_by_titles(self, arxiv_server, arxiv_papers):
+        """All titles of a batch are resolved with a single request."""
+        titles = [paper.title for paper in arxiv_papers[:5]]
+        papers = get_arxiv_papers_by_titles(titles, base_url=arxiv_server.base_url)
+
+        assert arxiv_server.request_count == 1
+        assert {paper.title for paper in papers} == set(titles)
+        assert str(papers[0].pdf).startswith("http://arxiv.org/pdf/2401.")
+
+    def test_enrich_partial_papers_batched(self, arxiv_server, arxiv_papers):
+        """Batched enrichment matches entries back in the original order."""
+        partial_papers = [
+            PartialPaper(title=paper.title.upper(), author=paper.author)
+            for paper in arxiv_papers
+        ] + [PartialPaper(title="Not On arXiv", author="Nobody")]
+
+        papers = cvpr.enrich_partial_papers(
+            partial_papers,
+            time_sleep=0,
+            batch_size=4,
+            arxiv_base_url=arxiv_server.base_url,
+        )
+
+        assert arxiv_server.request_count == 3
+        assert [paper["title"] for paper in papers] == [
+            paper.title for paper in partial_papers
+        ]
+        assert [paper["abstract"] for paper in papers] == [
+            paper.abstract for paper in arxiv_papers
+        ] + [None]
@@ -0,0 +1,62 @@
+import json
+import pathlib
+
+import pytest
+
+from src import cvpr
+from src.arxiv_index import ArxivIndex, build_index
+from src.utils import PartialPaper
+
+
+@pytest.fixture()
+def arxiv_index(tmp_path: pathlib.Path):
+    """Index built from a tiny arXiv metadata snapshot."""
+    snapshot_path = tmp_path / "snapshot.jsonl"
+    with snapshot_path.open("w") as f:
+        for i in range(20):
+            metadata = {
+                "id": f"2401.{i:05d}",
+                "title": f"Learning Thing\n  Number {i}: A Study",
+                "authors": f"Author {i}, Coauthor {i} and Another {i}",
+                "abstract": f"  Abstract\n{i}.",
+            }
+            f.write(json.dumps(metadata) + "\n")
+
+    index_path = tmp_path / "arxiv_index.bin"
+    assert build_index(snapshot_path, index_path) == 20
+    with ArxivIndex(index_path) as index:
+        yield index
+
+
+class TestArxivIndex:
+    """The test class for the arxiv_index module."""
+
+    def test_lookup(self, arxiv_index):
+        """Titles are matched after normalization and verified by first author."""
+        paper = arxiv_index.lookup("LEARNING THING NUMBER 7 - A STUDY", "Author 7")
+
+        assert paper is not None
+        assert paper.title == "Learning Thing Number 7: A Study"
+        assert paper.abstract == "Abstract 7."
+        assert str(paper.pdf) == "http://arxiv.org/pdf/2401.00007.pdf"
+        assert arxiv_index.lookup("Learning Thing Number 7: A Study", "Other") is None
+        assert arxiv_index.lookup("Unknown Title", "Author 7") is None
+
+    def test_enrich_partial_papers_offline(self, arxiv_index):
+        """Papers in the index are enriched without the arXiv API."""
+        partial_papers = [
+            PartialPaper(
+                title=f"Learning Thing Number {i}: A Study", author=f"Author {i}"
+            )
+            for i in range(3)
+        ]
+
+        papers = cvpr.enrich_partial_papers(
+            partial_papers,
+            arxiv_base_url="http://127.0.0.1:9/",
+            arxiv_index=arxiv_index,
+        )
+
+        assert [paper["abstract"] for paper in papers] == [
+            f"Abstract {i}." for i in range(3)
+        ]
@@ -0,0 +1,25 @@
+from src.batch import BatchJob, format_summary, run_batch
+
+
+def _square(x: int) -> int:
+    if x < 0:
+        raise ValueError("negative")
+    return x * x
+
+
+class TestBatch:
+    """The test class for the batch module."""
+
+    def test_run_batch(self):
+        """Results keep the job order and a failure does not stop the batch."""
+        jobs = [
+            BatchJob(name=str(x), func=_square, kwargs={"x": x}) for x in [3, -1, 4]
+        ]
+
+        for num_jobs in [1, 2]:
+            results = run_batch(jobs, num_jobs=num_jobs)
+
+            assert [result.output for result in results] == [9, None, 16]
+            assert [result.ok for result in results] == [True, False, True]
+            assert "ValueError: negative" in str(results[1].error)
+            assert "2 / 3 jobs succeeded" in format_summary(results, 1.0)
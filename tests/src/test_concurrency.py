@@ -0,0 +1,46 @@
+import threading
+import time
+from collections import Counter
+
+from src.concurrency import map_urls
+
+
+class TestConcurrency:
+    """The test class for the concurrency module."""
+
+    def test_map_urls_keeps_order(self):
+        """Results are yielded in the input order even if later URLs finish first."""
+        urls = [f"https://example.com/{i}" for i in range(8)]
+
+        def fetch(url: str) -> str:
+            # Earlier URLs take longer.
+            time.sleep(0.01 * (8 - int(url.rsplit("/", 1)[1])))
+            return url.upper()
+
+        assert list(map_urls(fetch, urls, workers=4)) == [url.upper() for url in urls]
+        assert list(map_urls(fetch, urls)) == [url.upper() for url in urls]
+
+    def test_map_urls_caps_requests_per_host(self):
+        """No host gets more than max_per_host requests at once."""
+        urls = [f"https://host{i % 3}.example.com/{i}" for i in range(12)]
+        lock = threading.Lock()
+        in_flight: Counter[str] = Counter()
+        max_in_flight: Counter[str] = Counter()
+        max_total = 0
+
+        def fetch(url: str) -> str:
+            nonlocal max_total
+            host = url.split("/")[2]
+            with lock:
+                in_flight[host] += 1
+                max_in_flight[host] = max(max_in_flight[host], in_flight[host])
+                max_total = max(max_total, sum(in_flight.values()))
+            time.sleep(0.05)
+            with lock:
+                in_flight[host] -= 1
+            return url
+
+        assert list(map_urls(fetch, urls, workers=6, max_per_host=2)) == urls
+        assert max(max_in_flight.values()) == 2
+        # Different hosts are still fetched concurrently.
+        assert max_total > 2
@@ -0,0 +1,44 @@
+import pathlib
+
+import pytest
+
+from src.corpus_store import CorpusStore, write_corpus
+from src.paper_io import PaperWriter, load_papers
+
+
+class TestCorpusStore:
+    """The test class for the corpus_store module."""
+
+    def test_round_trip(self, tmp_path: pathlib.Path):
+        """Papers are stored column by column, including nulls and non-ASCII."""
+        papers = [
+            {"title": "Café Networks", "author": "A", "abstract": None, "page": None},
+            {
+                "title": "",
+                "author": "B, C",
+                "abstract": "Abstract.",
+                "page": "http://x/",
+            },
+        ]
+        path = tmp_path / "cvpr2024_papers.corpus"
+        with PaperWriter(path) as writer:
+            for paper in papers:
+                writer.write(paper)
+
+        with CorpusStore(path) as store:
+            assert len(store) == 2
+            assert list(store.column("abstract")) == [None, "Abstract."]
+            assert bytes(store.column("title").get_bytes(0)) == "Café Networks".encode()
+        assert load_papers(path) == [{**paper, "pdf": None} for paper in papers]
+
+    def test_long_column_name(self, tmp_path: pathlib.Path):
+        """Column names which do not fit the directory are rejected."""
+        path = tmp_path / "cvpr2024_papers.corpus"
+        papers = [{"title": "T", "title_translated_ja": "T"}]
+
+        write_corpus(path, papers, columns=("title", "a" * 16))
+        with pytest.raises(ValueError, match="longer than 16 bytes"):
+            write_corpus(path, papers, columns=("title", "title_translated_ja"))
+        # A non-ASCII name is measured in UTF-8 bytes.
+        with pytest.raises(ValueError, match="longer than 16 bytes"):
+            write_corpus(path, papers, columns=("タイトルの翻訳",))
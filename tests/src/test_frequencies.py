@@ -0,0 +1,114 @@
+import pathlib
+import pickle
+import types
+
+import pytest
+
+from src import frequencies
+from src.frequencies import (
+    CUSTOM_STOPWORDS,
+    STOPWORDS_PATH,
+    NgramFilter,
+    Normalizer,
+    build_normalizer,
+    count_ngrams,
+    count_ngrams_packed,
+    get_ngrams,
+)
+
+
+class TestFrequencies:
+    """The test class for the frequencies module."""
+
+    def test_count_ngrams(self):
+        """All orders are counted at once without crossing documents."""
+        documents = [["neural", "radiance", "field"], ["neural", "field"], []]
+
+        counter = count_ngrams(documents, until_ngram=3)
+
+        assert counter["neural"] == 2
+        assert counter["neural field"] == 1
+        assert counter["neural radiance field"] == 1
+        assert "field neural" not in counter
+        assert dict(counter) == {
+            **get_ngrams(documents[0], 1),
+            **get_ngrams(documents[0], 2),
+            **get_ngrams(documents[0], 3),
+            "neural": 2,
+            "field": 2,
+            "neural field": 1,
+        }
+
+    def test_count_ngrams_packed(self):
+        """Integer keys count the same n-grams as strings."""
+        documents = [["neural", "radiance", "field"], ["neural", "field"], []]
+        documents += [["a", "b"] * 3, ["b"]]
+
+        assert count_ngrams_packed(documents, until_ngram=3) == count_ngrams(
+            documents, until_ngram=3
+        )
+        assert count_ngrams_packed(documents, 3, minimum_count=3) == {
+            "a": 3,
+            "b": 4,
+            "a b": 3,
+        }
+        assert count_ngrams_packed([], until_ngram=3) == {}
+
+    def test_normalizer(self):
+        """Numbers, URLs, punctuation and stopwords are removed."""
+        normalizer = Normalizer(CUSTOM_STOPWORDS | {"the", "of"})
+        tokens = ["The", "power", "of", "2024", "(", "GAN", "https://github.com/x"]
+        tokens += ["\\geq2", "code", "available", "atgithub.com"]
+
+        assert normalizer(tokens) == ["power", "GAN", "code", "available", "at"]
+        assert pickle.loads(pickle.dumps(normalizer))(tokens) == normalizer(tokens)
+
+    def test_build_normalizer(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+    ):
+        """The stopwords of the repository are loaded unless others are given."""
+        monkeypatch.setattr(frequencies.nltk, "download", lambda _: True)
+        monkeypatch.setattr(
+            frequencies, "stopwords", types.SimpleNamespace(words=lambda _: ["the"])
+        )
+        stopwords_path = tmp_path / "stopwords.txt"
+        stopwords_path.write_text("gan\n\n")
+
+        repository_stopwords = set(STOPWORDS_PATH.read_text().split())
+        assert build_normalizer().stopwords == (
+            {"the"} | CUSTOM_STOPWORDS | repository_stopwords
+        )
+        assert build_normalizer([stopwords_path]).stopwords == (
+            {"the", "gan"} | CUSTOM_STOPWORDS
+        )
+
+    def test_ngram_filter(self):
+        """Filtering while counting is the same as filtering the raw counts."""
+        documents = [
+            ["vision", "based", "neural", "field", "based"],
+            ["neural", "field", "approach"],
+            ["based"],
+        ] * 2
+        ngram_filter = NgramFilter({"approach", "Neural Field"}, {"Based"}, 2)
+
+        raw_counter = count_ngrams(documents, until_ngram=3)
+        fused_counter = count_ngrams(
+            (
+                part
+                for tokens in documents
+                for part in ngram_filter.split_tokens(tokens)
+            ),
+            until_ngram=3,
+        )
+
+        assert ngram_filter(fused_counter) == ngram_filter(raw_counter)
+        assert ngram_filter(raw_counter) == {
+            "vision": 2,
+            "neural": 4,
+            "field": 4,
+            "field approach": 2,
+            "neural field approach": 2,
+        }
+        assert pickle.loads(pickle.dumps(ngram_filter))(raw_counter) == (
+            ngram_filter(raw_counter)
+        )
@@ -0,0 +1,56 @@
+import json
+import pathlib
+
+import pytest
+
+from src import analysis
+from src.frequencies import CUSTOM_STOPWORDS, Normalizer
+from src.frequency_state import (
+    analyze_word_frequency_incremental,
+    get_state_path,
+    load_state,
+)
+
+
+class TestFrequencyState:
+    """The test class for the frequency_state module."""
+
+    @pytest.mark.usefixtures("_no_nltk_data")
+    def test_incremental_update(self, tmp_path: pathlib.Path):
+        """Updates with added, changed and removed papers match a full count."""
+        normalizer = Normalizer(CUSTOM_STOPWORDS | {"for", "of"})
+        input_path = tmp_path / "cvpr2024_papers.json"
+
+        def analyze(titles: list[str]) -> dict[str, int]:
+            input_path.write_text(
+                json.dumps([{"title": t, "author": "A"} for t in titles])
+            )
+            output_path = analyze_word_frequency_incremental(
+                input_path,
+                output_root_dir=tmp_path / "raw",
+                state_dir=tmp_path / "state",
+                normalizer=normalizer,
+            )
+            assert analysis.read_frequency_csv(output_path) == (
+                analysis.count_document_frequency(titles, normalizer=normalizer)
+            )
+            return analysis.read_frequency_csv(output_path)
+
+        analyze(["Neural Fields", "Neural Fields", "Diffusion Models for Video"])
+        frequency_dict = analyze(["Neural Fields", "Diffusion Models of Audio"])
+
+        assert frequency_dict["neural fields"] == 1
+        assert "video" not in frequency_dict
+
+        # Most papers of the first segment are removed, so it is compacted.
+        analyze(["Neural Video", "Sparse Voxels", "Point Clouds", "Mesh Priors"])
+        analyze(["Neural Video", "Gaussian Splatting"])
+        state_path = get_state_path(input_path, state_dir=tmp_path / "state")
+        state = load_state(state_path)
+        assert state is not None
+        assert list(state.segments.values()) == [2]
+        assert sorted(path.name for path in state_path.iterdir()) == sorted(
+            ["state.json", f"counts-{state.generation}.json", *state.segments]
+        )
+        # The documents are not kept in the index.
+        assert "Splatting" not in (state_path / "state.json").read_text()
@@ -0,0 +1,45 @@
+from collections import Counter
+
+from src.frequencies import sort_frequency_dict, top_k_frequency_dict
+from src.heavy_hitters import CountMinSketch, SpaceSaving
+
+
+class TestHeavyHitters:
+    """The test class for the heavy_hitters module."""
+
+    # A skewed stream: "w0" 200 times, "w1" 100 times, ... and rare n-grams.
+    keys = [f"w{i}" for i in range(8) for _ in range(200 // (i + 1))]
+    keys += [f"rare{i}" for i in range(500)]
+
+    def test_top_k_frequency_dict(self):
+        """The heap selects the first items of the sorted dict."""
+        frequency_dict = dict(Counter(self.keys))
+
+        assert top_k_frequency_dict(frequency_dict, 5) == dict(
+            list(sort_frequency_dict(frequency_dict).items())[:5]
+        )
+
+    def test_space_saving(self):
+        """Heavy hitters are kept and counts are within the error bounds."""
+        true_counts = Counter(self.keys)
+        counter = SpaceSaving(capacity=50)
+        counter.update(self.keys)
+
+        items = {key: (count, error) for key, count, error in counter.get_items()}
+        assert len(items) == 50
+        for key in [f"w{i}" for i in range(8)]:
+            count, error = items[key]
+            assert count - error <= true_counts[key] <= count
+            assert error <= counter.error_bound
+
+    def test_count_min_sketch(self):
+        """Estimates never underestimate and the top candidates are found."""
+        true_counts = Counter(self.keys)
+        sketch = CountMinSketch(width=256, depth=4, num_candidates=8)
+        for i in range(0, len(self.keys), 100):
+            sketch.update(self.keys[i : i + 100])
+
+        assert sketch.total == len(self.keys)
+        assert all(sketch.estimate(key) >= true_counts[key] for key in true_counts)
+        candidates = {key for key, _, _ in sketch.get_items()}
+        assert {"w0", "w1", "w2", "w3"} <= candidates
@@ -0,0 +1,35 @@
+import pytest
+
+from src.html_parser import HTML_PARSER_BACKENDS, is_available, select_hrefs
+
+LISTING_HTML = """
+<html><body>
+<div id="header"><a href="/home">Home</a></div>
+<dl>
+  <dt class="ptitle"><br><a href="/content/A_paper.html">A</a></dt>
+  <dd><a href="/content/A_paper.pdf">pdf</a></dd>
+  <dt class="ptitle"><a href="/content/B_paper.html">B</a></dt>
+  <dt class="ptitle"><a>No link</a></dt>
+  <dd><a href="/content/B_paper.pdf">pdf</a></dd>
+</dl>
+</body></html>
+"""
+
+
+class TestHtmlParser:
+    """The test class for the html_parser module."""
+
+    @pytest.mark.parametrize("backend", HTML_PARSER_BACKENDS)
+    def test_select_hrefs(self, backend: str):
+        """The restricted parse finds the same links as the full parse."""
+        if not is_available(backend):
+            pytest.skip(f"{backend} is not installed.")
+
+        expected = ["/content/A_paper.html", "/content/B_paper.html"]
+        assert select_hrefs(LISTING_HTML, ".ptitle > a", backend=backend) == expected
+        assert (
+            select_hrefs(
+                LISTING_HTML, ".ptitle > a", restrict_to_class="ptitle", backend=backend
+            )
+            == expected
+        )
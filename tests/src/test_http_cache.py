@@ -0,0 +1,71 @@
+import pathlib
+
+import requests
+
+from src.http_cache import ResponseCache
+
+
+def _make_response(status_code: int, content: bytes = b"", etag: str | None = None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.encoding = "utf-8"
+    if etag is not None:
+        response.headers["ETag"] = etag
+    return response
+
+
+class FakeServer:
+    """Answer requests from a list of responses and record the headers."""
+
+    def __init__(self, responses: list[requests.Response]) -> None:
+        """Store the responses to return in order."""
+        self.responses = responses
+        self.requests: list[dict[str, str]] = []
+
+    def send(self, url: str, headers: dict[str, str], timeout: float):
+        """Return the next response."""
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+
+class TestResponseCache:
+    """The test class for the http_cache module."""
+
+    def test_hit_and_miss(self, tmp_path: pathlib.Path):
+        """A fresh page is served from the cache, another URL is fetched."""
+        cache = ResponseCache(tmp_path, default_ttl=60)
+        server = FakeServer([_make_response(200, b"a"), _make_response(200, b"b")])
+
+        assert cache.get_text(server.send, "https://example.com/a", 10) == "a"
+        assert cache.get_text(server.send, "https://example.com/a", 10) == "a"
+        assert cache.get_text(server.send, "https://example.com/b", 10) == "b"
+
+        assert server.requests == [{}, {}]
+        assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+        # A new cache in the same directory reads the stored page.
+        other_cache = ResponseCache(tmp_path, default_ttl=60)
+        assert other_cache.get_text(server.send, "https://example.com/a", 10) == "a"
+
+    def test_revalidation(self, tmp_path: pathlib.Path):
+        """A stale page is revalidated with its ETag and kept on 304."""
+        cache = ResponseCache(tmp_path, default_ttl=0)
+        server = FakeServer(
+            [
+                _make_response(200, b"old", etag='"v1"'),
+                _make_response(304),
+                _make_response(200, b"new", etag='"v2"'),
+            ]
+        )
+        url = "https://example.com/a"
+
+        assert cache.get_text(server.send, url, 10) == "old"
+        assert cache.get_text(server.send, url, 10) == "old"
+        assert cache.get_text(server.send, url, 10) == "new"
+
+        assert server.requests == [
+            {},
+            {"If-None-Match": '"v1"'},
+            {"If-None-Match": '"v1"'},
+        ]
+        assert (cache.stats.revalidated, cache.stats.misses) == (1, 2)
@@ -0,0 +1,52 @@
+import types
+
+import pytest
+import requests
+
+from src import http_client
+from src.rate_limit import HostPolicy, HostRateLimiter
+
+
+def _make_response(status_code: int, headers: dict[str, str] | None = None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = b"body"
+    return response
+
+
+class TestHttpClient:
+    """The test class for the http_client module."""
+
+    def test_send_retries_throttled_responses(self, monkeypatch: pytest.MonkeyPatch):
+        """429 is retried after the Retry-After pause of the shared limiter."""
+        now = [0.0]
+
+        def sleep(seconds: float) -> None:
+            now[0] += seconds
+
+        limiter = HostRateLimiter(
+            default_policy=HostPolicy(initial_rate=10.0, burst=10.0),
+            clock=lambda: now[0],
+            sleep=sleep,
+        )
+        responses = [_make_response(429, {"Retry-After": "3"}), _make_response(200)]
+        requested_urls = []
+
+        def get(url: str, headers: dict | None, timeout: float) -> requests.Response:
+            requested_urls.append(url)
+            return responses.pop(0)
+
+        monkeypatch.setattr(http_client, "_rate_limiter", limiter)
+        monkeypatch.setattr(http_client, "_session", types.SimpleNamespace(get=get))
+
+        response = http_client.send("https://example.com/a")
+
+        assert response.status_code == 200
+        assert requested_urls == ["https://example.com/a"] * 2
+        # Retry-After, then a token at the halved rate of 5 per second.
+        assert now[0] == pytest.approx(3.2)
+        # Halved by the 429, then increased by a step for the 200.
+        assert limiter.get_rate("https://example.com/a") == pytest.approx(
+            5.0 + (50.0 - 0.2) / 100
+        )
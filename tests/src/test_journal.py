@@ -0,0 +1,32 @@
+import pathlib
+
+from src.journal import ScrapeJournal, get_journal_path
+
+
+class TestScrapeJournal:
+    """The test class for the journal module."""
+
+    def test_replay_drops_truncated_last_line(self, tmp_path: pathlib.Path):
+        """Complete records are replayed and a torn last line is discarded."""
+        path = get_journal_path(tmp_path / "cvpr2023_papers.json")
+        with ScrapeJournal(path) as journal:
+            journal.record("a", {"title": "A"})
+            journal.record("b", {"title": "B"})
+        # Simulate a crash in the middle of writing a record.
+        with path.open("a") as f:
+            f.write('{"key": "c", "paper": {"tit')
+
+        with ScrapeJournal(path) as journal:
+            assert len(journal) == 2
+            assert journal.get("b") == {"title": "B"}
+            assert "c" not in journal
+            journal.record("c", {"title": "C"})
+
+        with ScrapeJournal(path) as journal:
+            assert [journal.get(key) for key in "abc"] == [
+                {"title": "A"},
+                {"title": "B"},
+                {"title": "C"},
+            ]
+            journal.remove()
+        assert not path.exists()
@@ -0,0 +1,45 @@
+import json
+import pathlib
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from src.lemmatization import CachedLemmatizer
+
+
+def _save_lemmas(cache_path: pathlib.Path, worker: int) -> None:
+    for i in range(20):
+        lemmatizer = CachedLemmatizer(cache_path)
+        lemmatizer.update({f"word{worker}_{i}": f"lemma{worker}_{i}"})
+        lemmatizer.save()
+
+
+class TestLemmatization:
+    """The test class for the lemmatization module."""
+
+    def test_cached_lemmatizer(self, tmp_path: pathlib.Path):
+        """Cached words are lemmatized without WordNet and hits are counted."""
+        cache_path = tmp_path / "lemmas.json"
+        cache_path.write_text(
+            json.dumps({"n": {"networks": "network", "data": "data"}})
+        )
+        lemmatizer = pickle.loads(pickle.dumps(CachedLemmatizer(cache_path)))
+
+        assert lemmatizer(["networks", "data", "networks"]) == [
+            "network",
+            "data",
+            "network",
+        ]
+        assert (lemmatizer.hits, lemmatizer.misses) == (3, 0)
+        assert lemmatizer.hit_ratio == 1.0
+        assert lemmatizer._lemmatizer is None
+
+    def test_concurrent_saves(self, tmp_path: pathlib.Path):
+        """Lemmas saved by processes at the same time are all kept."""
+        cache_path = tmp_path / "lemmas.json"
+
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(_save_lemmas, [cache_path] * 4, range(4)))
+
+        lemmas = json.loads(cache_path.read_text())["n"]
+        assert len(lemmas) == 4 * 20
+        assert lemmas["word3_19"] == "lemma3_19"
@@ -0,0 +1,69 @@
+import pathlib
+
+import pytest
+
+from src.paper_io import PaperWriter, glob_paper_files, load_papers
+from src.utils import Paper
+
+PAPERS = [
+    Paper(
+        title="Segment Anything",
+        author="Alexander Kirillov",
+        abstract="We introduce the Segment Anything project.",
+        page="https://arxiv.org/abs/2304.02643",  # type: ignore
+        pdf="https://arxiv.org/pdf/2304.02643",  # type: ignore
+    ).model_dump(),
+    {"title": "Ünïcode", "author": "A", "abstract": None, "page": None, "pdf": None},
+]
+
+
+class TestPaperIo:
+    """The test class for the paper_io module."""
+
+    def test_glob_paper_files(self, tmp_path: pathlib.Path):
+        """A corpus in several formats is returned once in the preferred one."""
+        for name in [
+            "cvpr2023_papers.json",
+            "cvpr2023_papers.jsonl.gz",
+            "cvpr2024_papers.json",
+            "iccv2023_papers.jsonl",
+            "iccv2023_papers.json",
+            "notes.txt",
+        ]:
+            (tmp_path / name).touch()
+
+        assert glob_paper_files(tmp_path) == [
+            tmp_path / "cvpr2023_papers.jsonl.gz",
+            tmp_path / "cvpr2024_papers.json",
+            tmp_path / "iccv2023_papers.jsonl",
+        ]
+
+    @pytest.mark.parametrize("suffix", [".json", ".jsonl", ".jsonl.gz"])
+    def test_paper_writer_round_trip(self, tmp_path: pathlib.Path, suffix: str):
+        """Written papers are read back with URLs as strings."""
+        path = tmp_path / f"cvpr2023_papers{suffix}"
+        with PaperWriter(path) as writer:
+            for paper in PAPERS:
+                writer.write(paper)
+
+        assert writer.count == 2
+        assert load_papers(path) == [
+            {**PAPERS[0], "page": str(PAPERS[0]["page"]), "pdf": str(PAPERS[0]["pdf"])},
+            PAPERS[1],
+        ]
+        assert [p.name for p in tmp_path.iterdir()] == [path.name]
+
+    @pytest.mark.parametrize("suffix", [".json", ".jsonl", ".jsonl.gz"])
+    def test_paper_writer_aborts_on_error(self, tmp_path: pathlib.Path, suffix: str):
+        """An error while writing leaves neither the output nor a partial file."""
+        path = tmp_path / f"cvpr2023_papers{suffix}"
+
+        def write_until_failure() -> None:
+            with PaperWriter(path) as writer:
+                writer.write(PAPERS[0])
+                raise RuntimeError("Scraping failed.")
+
+        with pytest.raises(RuntimeError):
+            write_until_failure()
+
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,113 @@
+import json
+import os
+import pathlib
+
+import pytest
+
+from src.frequencies import CUSTOM_STOPWORDS, Normalizer
+from src.lemmatization import CachedLemmatizer
+from src.pipeline import build_wordcloud_nodes, run_pipeline
+
+
+class TestPipeline:
+    """The test class for the pipeline module."""
+
+    @pytest.mark.usefixtures("_no_nltk_data")
+    def test_run_pipeline(self, tmp_path: pathlib.Path):
+        """Editing the exact match stopwords re-runs only the affected steps."""
+        paper_paths = []
+        for stem, title in [
+            ("cvpr2023_papers", "neural radiance field"),
+            ("cvpr2024_papers", "latent diffusion model"),
+        ]:
+            paper_path = tmp_path / "json" / f"{stem}.json"
+            paper_path.parent.mkdir(exist_ok=True)
+            papers = [{"title": title, "abstract": "", "author": "A"}] * 3
+            paper_path.write_text(json.dumps(papers))
+            paper_paths.append(paper_path)
+        exact_path = tmp_path / "exact_match_stopwords.txt"
+        exact_path.write_text("")
+        partial_path = tmp_path / "partial_match_stopwords.txt"
+        partial_path.write_text("")
+
+        nodes = build_wordcloud_nodes(
+            paper_paths,
+            normalizer=Normalizer(CUSTOM_STOPWORDS),
+            exact_match_stopwords_path=exact_path,
+            partial_match_stopwords_path=partial_path,
+            minimum_count=1,
+            raw_frequency_dir=tmp_path / "raw",
+            adjusted_frequency_dir=tmp_path / "adjusted",
+            wordcloud_dir=tmp_path / "wordcloud",
+            lemma_cache_path=None,
+        )
+
+        def run() -> dict[str, list[str]]:
+            results = run_pipeline(nodes, manifest_path=tmp_path / "manifest.json")
+            ran: dict[str, list[str]] = {}
+            for result in results:
+                assert result.status in ["done", "up-to-date"], result.error
+                if result.status == "done":
+                    step, name = result.name.split(" ", 1)
+                    ran.setdefault(step, []).append(name.split("_")[0])
+            return ran
+
+        assert run() == {
+            "analyze": ["cvpr2023"] * 2 + ["cvpr2024"] * 2,
+            "adjust": ["cvpr2023"] * 2 + ["cvpr2024"] * 2,
+            "wordcloud": ["cvpr2023"] * 2 + ["cvpr2024"] * 2,
+        }
+        assert run() == {}
+
+        # Every adjusted CSV is made again, but only those of CVPR 2023 change.
+        exact_path.write_text("radiance field\n")
+        assert run() == {
+            "adjust": ["cvpr2023"] * 2 + ["cvpr2024"] * 2,
+            "wordcloud": ["cvpr2023"] * 2,
+        }
+        assert run() == {}
+
+    @pytest.mark.usefixtures("_no_nltk_data")
+    def test_run_pipeline_saves_lemmas_once(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+    ):
+        """The new lemmas of parallel analyze nodes are all saved by the scheduler."""
+        save_pids_path = tmp_path / "save_pids.txt"
+        save = CachedLemmatizer.save
+
+        def record_save(lemmatizer: CachedLemmatizer) -> None:
+            with save_pids_path.open("a") as f:
+                f.write(f"{os.getpid()}\n")
+            save(lemmatizer)
+
+        monkeypatch.setattr(CachedLemmatizer, "save", record_save)
+        paper_paths = []
+        for stem, title in [
+            ("cvpr2023_papers", "neural radiance field"),
+            ("cvpr2024_papers", "latent diffusion model"),
+        ]:
+            paper_path = tmp_path / "json" / f"{stem}.json"
+            paper_path.parent.mkdir(exist_ok=True)
+            paper_path.write_text(json.dumps([{"title": title, "author": "A"}]))
+            paper_paths.append(paper_path)
+        lemma_cache_path = tmp_path / "lemmas.json"
+
+        nodes = build_wordcloud_nodes(
+            paper_paths,
+            normalizer=Normalizer(CUSTOM_STOPWORDS),
+            raw_frequency_dir=tmp_path / "raw",
+            lemma_cache_path=lemma_cache_path,
+        )
+        analyze_nodes = [node for node in nodes if node.name.startswith("analyze")]
+        results = run_pipeline(analyze_nodes, num_jobs=2, manifest_path=None)
+
+        assert [result.status for result in results] == ["done"] * 4
+        assert save_pids_path.read_text() == f"{os.getpid()}\n"
+        assert sorted(json.loads(lemma_cache_path.read_text())["n"]) == [
+            "diffusion",
+            "field",
+            "latent",
+            "model",
+            "neural",
+            "radiance",
+        ]
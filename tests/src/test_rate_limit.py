@@ -0,0 +1,113 @@
+from src.rate_limit import HostPolicy, HostRateLimiter, parse_retry_after
+
+
+class FakeClock:
+    """Clock which advances only when sleeping."""
+
+    def __init__(self) -> None:
+        """Start at time zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the time."""
+        self.now += seconds
+
+
+class TestHostRateLimiter:
+    """The test class for the rate_limit module."""
+
+    def test_acquire_spaces_requests_by_rate(self):
+        """After the burst is used, requests are spaced by the rate."""
+        clock = FakeClock()
+        limiter = HostRateLimiter(
+            default_policy=HostPolicy(initial_rate=2.0, burst=2.0),
+            clock=clock,
+            sleep=clock.sleep,
+        )
+
+        waits = [limiter.acquire("https://example.com/a") for _ in range(4)]
+
+        assert waits == [0.0, 0.0, 0.5, 0.5]
+        # Other hosts have their own bucket.
+        assert limiter.acquire("https://example.org/a") == 0.0
+
+    def test_observe_throttle_and_retry_after(self):
+        """429 halves the rate and Retry-After blocks the host."""
+        clock = FakeClock()
+        limiter = HostRateLimiter(
+            default_policy=HostPolicy(initial_rate=4.0, burst=1.0),
+            clock=clock,
+            sleep=clock.sleep,
+        )
+        url = "https://example.com/a"
+
+        limiter.observe(url, 429, latency=0.1, retry_after="10")
+
+        assert limiter.get_rate(url) == 2.0
+        # The bucket is empty after a 429, so a token is awaited after the block.
+        assert limiter.acquire(url) == 10.5
+
+    def test_observe_success_increases_rate(self):
+        """Fast successful responses increase the rate up to the maximum."""
+        limiter = HostRateLimiter(
+            default_policy=HostPolicy(initial_rate=1.0, min_rate=1.0, max_rate=2.0)
+        )
+        url = "https://example.com/a"
+
+        for _ in range(200):
+            limiter.observe(url, 200, latency=0.1)
+
+        assert limiter.get_rate(url) == 2.0
+
+    def test_parse_retry_after(self):
+        """Retry-After is parsed in seconds or as an HTTP date."""
+        assert parse_retry_after("120") == 120.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+
+    def test_acquire_refills_tokens_up_to_burst(self):
+        """Idle time refills the bucket at the rate, but not beyond the burst."""
+        clock = FakeClock()
+        limiter = HostRateLimiter(
+            default_policy=HostPolicy(initial_rate=2.0, burst=3.0),
+            clock=clock,
+            sleep=clock.sleep,
+        )
+        url = "https://example.com/a"
+
+        assert [limiter.acquire(url) for _ in range(3)] == [0.0, 0.0, 0.0]
+        # One second at 2 requests per second refills two tokens.
+        clock.sleep(1.0)
+        assert [limiter.acquire(url) for _ in range(3)] == [0.0, 0.0, 0.5]
+
+        # A long idle time refills only up to the burst.
+        clock.sleep(100.0)
+        assert [limiter.acquire(url) for _ in range(4)] == [0.0, 0.0, 0.0, 0.5]
+
+    def test_queued_acquires_after_retry_after(self):
+        """Requests queued during a block are spaced by the rate after it."""
+        clock = FakeClock()
+        limiter = HostRateLimiter(
+            default_policy=HostPolicy(initial_rate=4.0, burst=5.0),
+            clock=clock,
+            sleep=lambda _: None,
+        )
+        url = "https://example.com/a"
+
+        limiter.observe(url, 429, latency=0.1, retry_after="10")
+        assert [limiter.acquire(url) for _ in range(5)] == [
+            10.5,
+            11.0,
+            11.5,
+            12.0,
+            12.5,
+        ]
+
+        # No tokens were added during the block, so the next requests queue up
+        # behind the ones above.
+        clock.now = 10.0
+        assert [limiter.acquire(url) for _ in range(2)] == [3.0, 3.5]
@@ -0,0 +1,64 @@
+import json
+import pathlib
+
+import numpy as np
+import pytest
+
+from src.frequencies import CUSTOM_STOPWORDS, Normalizer
+from src.search_index import (
+    SearchIndex,
+    decode_varints,
+    encode_varints,
+    get_segment_path,
+    update_index,
+)
+
+
+class TestSearchIndex:
+    """The test class for the search_index module."""
+
+    def test_varints(self):
+        """Encoded integers of any width are decoded to the same ones."""
+        values = np.array([0, 1, 127, 128, 300, 16383, 16384, 2**31 - 1])
+        encoded = encode_varints(values)
+
+        assert len(encoded) == 1 + 1 + 1 + 2 + 2 + 2 + 3 + 5
+        assert decode_varints(encoded).tolist() == values.tolist()
+
+    @pytest.mark.usefixtures("_no_nltk_data")
+    def test_search(self, tmp_path: pathlib.Path):
+        """Papers are ranked by BM25, filtered and indexed incrementally."""
+        normalizer = Normalizer(CUSTOM_STOPWORDS | {"for", "of", "with"})
+        titles_by_stem = {
+            "cvpr2022_papers": ["Neural Radiance Fields", "Video Transformers"],
+            "cvpr2023_papers": [
+                "Neural Radiance Fields for Neural Rendering",
+                "Diffusion Models",
+            ],
+        }
+        input_paths = []
+        for stem, titles in titles_by_stem.items():
+            input_paths.append(tmp_path / f"{stem}.json")
+            input_paths[-1].write_text(
+                json.dumps([{"title": t, "author": "A"} for t in titles])
+            )
+
+        index_dir = tmp_path / "index"
+        assert update_index(input_paths[:1], index_dir=index_dir, normalizer=normalizer)
+        built_paths = update_index(
+            input_paths, index_dir=index_dir, normalizer=normalizer
+        )
+        assert built_paths == [get_segment_path(input_paths[1], index_dir=index_dir)]
+
+        index = SearchIndex(index_dir / "title_only", normalizer)
+        results = index.search("neural fields")
+        assert [(r.conference, r.year, r.doc_id) for r in results] == [
+            ("cvpr", 2022, 0),
+            ("cvpr", 2023, 0),
+        ]
+        assert results[0].title == "Neural Radiance Fields"
+        assert results[0].score > results[1].score > 0
+
+        assert [r.year for r in index.search("neural", years=[2023])] == [2023]
+        assert index.search("neural", conferences=["iccv"]) == []
+        assert index.search("of") == []
@@ -0,0 +1,59 @@
+from src.title_matching import TitleIndex, canonicalize_title
+from src.utils import Paper
+
+
+def _make_paper(title: str, author: str) -> Paper:
+    return Paper(
+        title=title,
+        author=author,
+        abstract="Abstract.",
+        page="http://arxiv.org/abs/2401.00001",  # type: ignore
+        pdf="http://arxiv.org/pdf/2401.00001.pdf",  # type: ignore
+    )
+
+
+class TestTitleMatching:
+    """The test class for the title_matching module."""
+
+    def test_canonicalize_title(self):
+        """LaTeX, hyphenation, accents and spacing are removed."""
+        assert canonicalize_title(r"$\mathcal{X}$-Net: Self-Super- vised") == (
+            "xnetselfsupervised"
+        )
+        assert canonicalize_title(r"Schr\"odinger Bridges") == canonicalize_title(
+            "Schrödinger  bridges"
+        )
+
+    def test_find(self):
+        """Similar titles are matched only when the first author is the same."""
+        papers = [
+            _make_paper("Segment Anything in High Quality", "Lei Ke, Mingqiao Ye"),
+            _make_paper("Segment Anything", "Alexander Kirillov, Eric Mintun"),
+        ]
+        title_index = TitleIndex(papers)
+
+        assert (
+            title_index.find("Segment-Anything in High-Quality.", "Lei Ke")
+            == (papers[0])
+        )
+        assert (
+            title_index.find("Segment Anything in Higher Quality", "L. Ke")
+            == (papers[0])
+        )
+        assert title_index.find("Segment Anything in High Quality", "Nobody") is None
+        assert title_index.find("Tracking Anything", "Alexander Kirillov") is None
+
+    def test_find_falls_back_to_fuzzy_match(self):
+        """An exact title of another author does not hide a similar title."""
+        papers = [
+            _make_paper("Neural Radiance Fields", "Someone Else"),
+            _make_paper("Neural Radiance Field", "Ben Mildenhall, Pratul Srinivasan"),
+        ]
+        title_index = TitleIndex(papers)
+
+        assert (
+            title_index.find("Neural Radiance Fields", "Ben Mildenhall") == (papers[1])
+        )
+        assert [paper for _, paper in title_index.query("Neural Radiance Fields")] == (
+            papers
+        )
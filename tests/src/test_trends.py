@@ -0,0 +1,63 @@
+import json
+import pathlib
+
+import pytest
+
+from src.analysis import write_frequency_csv
+from src.trends import build_trend_matrix, load_trend_matrix, save_trend_matrix
+
+
+class TestTrends:
+    """The test class for the trends module."""
+
+    def test_trend_matrix(self, tmp_path: pathlib.Path):
+        """Rates per 1,000 papers and top movers are queried from the matrix."""
+        counts = {2022: {"transformer": 10, "cnn": 30}, 2023: {"transformer": 40}}
+        for year, frequency_dict in counts.items():
+            write_frequency_csv(
+                tmp_path / "raw" / f"cvpr{year}_papers_title_only_3gram.csv",
+                frequency_dict,
+            )
+            (tmp_path / "json").mkdir(exist_ok=True)
+            (tmp_path / "json" / f"cvpr{year}_papers.json").write_text(
+                json.dumps([{"title": "T", "author": "A"}] * 100)
+            )
+
+        save_trend_matrix(
+            tmp_path / "trends.npz",
+            build_trend_matrix(tmp_path / "raw", tmp_path / "json"),
+        )
+        matrix = load_trend_matrix(tmp_path / "trends.npz")
+
+        assert matrix.get_series("transformer") == {"cvpr": {2022: 100.0, 2023: 400.0}}
+        assert matrix.get_series("unknown") == {"cvpr": {2022: 0.0, 2023: 0.0}}
+        assert sorted(matrix.get_top_movers(2022, 2023)) == [
+            ("cnn", 300.0, 0.0),
+            ("transformer", 100.0, 400.0),
+        ]
+
+    def test_one_csv_per_corpus(self, tmp_path: pathlib.Path):
+        """Only the CSV of the given n-gram order is used for each corpus."""
+        for until_ngram, count in [(2, 10), (3, 20)]:
+            write_frequency_csv(
+                tmp_path / f"cvpr2023_papers_title_only_{until_ngram}gram.csv",
+                {"transformer": count},
+            )
+        write_frequency_csv(
+            tmp_path / "cvpr2023_papers_title_only_3gram_adjusted.csv",
+            {"transformer": 30},
+        )
+
+        for until_ngram, adjusted, count in [(2, False, 10), (3, False, 20)]:
+            matrix = build_trend_matrix(tmp_path, None, until_ngram, adjusted)
+            assert matrix.columns == [("cvpr", 2023)]
+            assert matrix.get_counts("transformer").tolist() == [count]
+        matrix = build_trend_matrix(tmp_path, None, adjusted=True)
+        assert matrix.get_counts("transformer").tolist() == [30]
+
+        write_frequency_csv(
+            tmp_path / "cvpr2023_papers_title_and_abstract_3gram.csv",
+            {"transformer": 40},
+        )
+        with pytest.raises(ValueError, match="the same corpus"):
+            build_trend_matrix(tmp_path, None)
@@ -0,0 +1,22 @@
+import os
+import pathlib
+import stat
+
+from src.utils import write_atomic
+
+
+class TestUtils:
+    """The test class for the utils module."""
+
+    def test_write_atomic(self, tmp_path: pathlib.Path):
+        """The file has the mode of `open` under the umask, not 0600."""
+        path = tmp_path / "nested" / "data.json"
+        write_atomic(path, b"{}")
+        with (tmp_path / "opened.json").open("wb") as f:
+            f.write(b"{}")
+
+        assert path.read_bytes() == b"{}"
+        assert stat.S_IMODE(path.stat().st_mode) == stat.S_IMODE(
+            (tmp_path / "opened.json").stat().st_mode
+        )
+        assert os.listdir(path.parent) == ["data.json"]
@@ -0,0 +1,81 @@
+import os
+import pathlib
+
+import wordcloud.wordcloud as wordcloud_module
+from PIL import Image, ImageChops, ImageFont
+from wordcloud import WordCloud
+
+from src.wordclouds import (
+    WORDCLOUD_PARAMS,
+    cached_fonts,
+    generate_wordcloud_from_csv,
+    get_layout_path,
+    get_wordcloud_path,
+    render_wordcloud_layout,
+    render_wordclouds,
+)
+
+
+class TestWordclouds:
+    """The test class for the wordclouds module."""
+
+    def test_cached_fonts(self):
+        """Cached fonts render the same image and are used only in the block."""
+        frequencies = {"neural field": 10, "diffusion": 8, "nerf": 3}
+
+        def render() -> Image.Image:
+            wordcloud = WordCloud(**WORDCLOUD_PARAMS, random_state=0)
+            return wordcloud.generate_from_frequencies(frequencies).to_image()
+
+        with cached_fonts():
+            assert wordcloud_module.ImageFont is not ImageFont
+            cached_image = render()
+        assert wordcloud_module.ImageFont is ImageFont
+
+        assert ImageChops.difference(cached_image, render()).getbbox() is None
+
+    def test_render_wordclouds(self, tmp_path: pathlib.Path):
+        """Only images whose CSV or seed changed are rendered again."""
+        csv_path = tmp_path / "cvpr2023_papers_title_only_3gram_adjusted.csv"
+        csv_path.write_text("word,count\nneural field,10\ndiffusion,8\n")
+        output_dir = tmp_path / "wordcloud"
+        manifest_path = tmp_path / "manifest.json"
+
+        def render(seeds: list[int]) -> list[str]:
+            results = render_wordclouds(
+                [csv_path], seeds, output_dir, manifest_path=manifest_path
+            )
+            assert all(result.ok for result in results)
+            return [result.name for result in results]
+
+        assert render([1, 2]) == [
+            str(get_wordcloud_path(csv_path, seed, output_dir)) for seed in [1, 2]
+        ]
+        assert get_wordcloud_path(csv_path, 1, output_dir).exists()
+
+        # Touching the CSV without changing it does not render again.
+        os.utime(csv_path, ns=(0, 0))
+        assert render([1, 2]) == []
+        assert render([1, 3]) == [str(get_wordcloud_path(csv_path, 3, output_dir))]
+
+        csv_path.write_text("word,count\nneural field,10\ntransformer,9\n")
+        assert len(render([1, 2, 3])) == 3
+
+    def test_render_wordcloud_layout(self, tmp_path: pathlib.Path):
+        """A saved layout renders the same image, other scales and SVG."""
+        csv_path = tmp_path / "cvpr2023_papers_title_only_3gram_adjusted.csv"
+        csv_path.write_text("word,count\nneural field,10\ndiffusion,8\nnerf,3\n")
+        image_path = tmp_path / "wordcloud.png"
+        generate_wordcloud_from_csv(
+            csv_path, image_path, seed=0, layout_save_path=get_layout_path(image_path)
+        )
+
+        render_wordcloud_layout(get_layout_path(image_path), tmp_path / "same.png")
+        render_wordcloud_layout(get_layout_path(image_path), tmp_path / "half.png", 0.5)
+        render_wordcloud_layout(get_layout_path(image_path), tmp_path / "vector.svg")
+
+        with Image.open(image_path) as image, Image.open(tmp_path / "same.png") as same:
+            assert ImageChops.difference(image, same).getbbox() is None
+        with Image.open(tmp_path / "half.png") as half:
+            assert half.size == (800, 400)
+        assert ">neural field</text>" in (tmp_path / "vector.svg").read_text()